@@ -4,14 +4,24 @@ FastAPI Server for N8N Workflow Documentation
 High-performance API with sub-100ms response times.
 """
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    BackgroundTasks,
+    Request,
+    Response,
+)
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
+import mimetypes
 import os
 import re
 import urllib.parse
@@ -19,11 +29,43 @@ from pathlib import Path
 import uvicorn
 import time
 from collections import defaultdict
-
-from workflow_db import WorkflowDatabase
+from functools import lru_cache, partial
+
+from http_cache import (
+    INDEX_CACHE_CONTROL,
+    WORKFLOW_CACHE_CONTROL,
+    cache_headers,
+    etag,
+    not_modified,
+    timestamp_seconds,
+)
+from io_executor import IOExecutor
+from precompressed import (
+    ENCODING_SUFFIXES,
+    CompressedStore,
+    PrecompressedPayload,
+    choose_encoding,
+    compressed_store_path,
+    precompress_directory,
+    stored_encodings,
+)
+from suggest_index import MAX_SUGGESTIONS, SuggestIndex
+from workflow_catalog import LiveCatalog, WorkflowCatalog
+from workflow_db import (
+    SearchResultCache,
+    WorkflowDatabase,
+    decode_cursor,
+    encode_cursor,
+    total_estimate_cap,
+)
 
 from src.ai_analyzer import app as ai_app
 
+try:
+    import orjson
+except ImportError:  # Optional: faster response encoding
+    orjson = None
+
 # Initialize FastAPI app
 app = FastAPI(
     title="N8N Workflow Documentation API",
@@ -63,6 +105,28 @@ app.add_middleware(
 # Initialize database
 db = WorkflowDatabase()
 
+# Search results are cached until the next index change (see cached_search)
+search_cache = SearchResultCache(
+    max_entries=int(os.environ.get("SEARCH_CACHE_ENTRIES", "1024")),
+    max_rows=int(os.environ.get("SEARCH_CACHE_ROWS", "50000")),
+)
+SEARCH_CACHE_BYPASS_HEADER = "X-Cache-Bypass"
+
+# Columnar copy of the index for filter-only searches, hot-swapped on reindex
+live_catalog = LiveCatalog(db)
+
+# Typeahead index, rebuilt from the database when the index generation changes
+suggest_index: Optional[SuggestIndex] = None
+
+# Blocking database and file work of request handlers runs here, off the loop
+io_executor = IOExecutor()
+
+# Compressed variants of workflow files, written by the indexer
+compressed_store = CompressedStore(compressed_store_path(db.db_path))
+
+# Category mappings body and its compressed variants, keyed by ETag
+category_mappings_payload: Optional[Tuple[str, PrecompressedPayload]] = None
+
 
 # Security: Helper function for rate limiting
 def check_rate_limit(client_ip: str) -> bool:
@@ -151,10 +215,42 @@ async def startup_event():
             print("⚠️  Warning: No workflows found in database. Run indexing first.")
         else:
             print(f"✅ Database connected: {stats['total']} workflows indexed")
+        print(f"✅ Suggestion index built: {len(current_suggest_index())} terms")
+        print(f"✅ Typo index built: {len(db.get_trigram_index())} terms")
+        vectors = db.get_vector_index()
+        if vectors is not None:
+            print(f"✅ Embeddings mapped: {len(vectors)} workflows")
+        catalog = live_catalog.refresh()
+        print(
+            f"✅ Catalog loaded: {catalog.size} workflows, "
+            f"{catalog.memory_bytes() / (1024 * 1024):.1f} MB"
+        )
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise
 
+    try:
+        written = precompress_directory("static")
+        print(f"✅ Static assets precompressed: {written} variants written")
+    except OSError as e:
+        # Read-only deployments serve whatever variants the image was built with
+        print(f"⚠️  Warning: Could not precompress static assets: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the I/O threads."""
+    io_executor.shutdown()
+
+
+def current_suggest_index() -> SuggestIndex:
+    """The suggestion index for the current index generation, rebuilt if stale."""
+    global suggest_index
+    generation = db.get_index_generation()
+    if suggest_index is None or suggest_index.generation != generation:
+        suggest_index = SuggestIndex(db.get_suggestion_terms(), generation)
+    return suggest_index
+
 
 # Response models
 class WorkflowSummary(BaseModel):
@@ -186,6 +282,13 @@ class WorkflowSummary(BaseModel):
 class SearchResponse(BaseModel):
     workflows: List[WorkflowSummary]
     total: int
+    # False when exact_total=false stopped counting; total is then a lower bound
+    total_exact: bool = True
+    # Pass back as `cursor` for the next page; None once the results run out
+    next_cursor: Optional[str] = None
+    # Match counts per trigger_type, complexity, integration and category,
+    # when requested with facets=true
+    facets: Optional[Dict[str, Dict[str, int]]] = None
     page: int
     per_page: int
     pages: int
@@ -193,6 +296,26 @@ class SearchResponse(BaseModel):
     filters: Dict[str, Any]
 
 
+class SimilarWorkflow(WorkflowSummary):
+    similarity: float  # Cosine similarity of the workflows' embeddings
+
+
+class SimilarResponse(BaseModel):
+    filename: str
+    workflows: List[SimilarWorkflow]
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: str  # workflow, integration, tag or node_type
+    count: int
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[Suggestion]
+
+
 class StatsResponse(BaseModel):
     total: int
     active: int
@@ -205,7 +328,7 @@ class StatsResponse(BaseModel):
 
 
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the main documentation page."""
     static_dir = Path("static")
     index_file = static_dir / "index.html"
@@ -221,88 +344,371 @@ async def root():
         </body></html>
         """
         )
-    return FileResponse(str(index_file))
+    return await io_executor.run(
+        precompressed_file_response,
+        request,
+        str(index_file),
+        str(index_file),
+        "text/html",
+    )
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "message": "N8N Workflow API is running"}
+    """Health check endpoint, including database connection pool metrics."""
+    return {
+        "status": "healthy",
+        "message": "N8N Workflow API is running",
+        "database_pool": db.pool_metrics(),
+        "io_executor": io_executor.metrics(),
+        "search_cache": search_cache.metrics(),
+        "catalog": live_catalog.metrics(),
+    }
+
+
+def index_cache_headers(*files: Path) -> Dict[str, str]:
+    """Cache headers for a response that changes only with the index (and files)."""
+    instance, generation, modified = db.get_index_version()
+    parts = [instance, generation]
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            parts.append(0)
+            continue
+        parts.append(f"{stat.st_mtime_ns:x}.{stat.st_size:x}")
+        modified = max(modified or 0, stat.st_mtime)
+    return cache_headers(etag(*parts), modified, INDEX_CACHE_CONTROL)
+
+
+def precompressed_file_response(
+    request: Request,
+    path: str,
+    variants_base: str,
+    media_type: Optional[str] = None,
+    **kwargs,
+) -> FileResponse:
+    """FileResponse for path, or for its variant at variants_base + suffix that
+    best matches Accept-Encoding.
+
+    Responses with a Content-Encoding pass through GZipMiddleware untouched.
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    available = stored_encodings(variants_base)
+    encoding = choose_encoding(request.headers.get("accept-encoding"), available)
+    if available:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        path = variants_base + ENCODING_SUFFIXES[encoding]
+    return FileResponse(path, media_type=media_type, headers=headers, **kwargs)
+
+
+def unchanged_response(
+    request: Request, headers: Dict[str, str]
+) -> Optional[Response]:
+    """A 304 Not Modified if the client's copy matches headers, else None."""
+    if not_modified(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+        headers,
+    ):
+        return Response(status_code=304, headers=headers)
+    return None
 
 
 @app.get("/api/stats", response_model=StatsResponse)
-async def get_stats():
+async def get_stats(request: Request, response: Response):
     """Get workflow database statistics."""
     try:
-        stats = db.get_stats()
+        headers = await io_executor.run(index_cache_headers)
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+
+        stats = await io_executor.run(db.get_stats)
         return StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
 
+def cached_search(request: Request, response: Response, key: tuple, search) -> tuple:
+    """Run a (workflows, total, ...) search through search_cache.
+
+    Send X-Cache-Bypass: 1 to skip the cache; X-Cache on the response says
+    whether the result was a HIT, MISS or BYPASS.
+    """
+    bypass = request.headers.get(SEARCH_CACHE_BYPASS_HEADER, "").lower()
+    if bypass in ("1", "true", "yes"):
+        response.headers["X-Cache"] = "BYPASS"
+        return search()
+
+    generation = db.get_index_generation()
+    result = search_cache.get(key, generation)
+    if result is not None:
+        response.headers["X-Cache"] = "HIT"
+        return result
+
+    result = search()
+    search_cache.put(key, generation, result, rows=len(result[0]))
+    response.headers["X-Cache"] = "MISS"
+    return result
+
+
+def validate_cursor(cursor: Optional[str], ranked: bool):
+    """Reject a malformed pagination cursor with a 400."""
+    if cursor is None:
+        return
+    try:
+        decode_cursor(cursor, ranked)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_page_cursor(
+    workflows: List[Dict], per_page: int, ranked: bool
+) -> Optional[str]:
+    """Cursor for the page after `workflows`, or None after a short page."""
+    if len(workflows) < per_page:
+        return None
+    return encode_cursor(workflows[-1], ranked)
+
+
+def workflow_summary(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """A search row as the JSON of a WorkflowSummary, without building one.
+
+    Applies the model's defaults and its int-to-bool conversion of active;
+    test_workflow_db checks that responses still validate as the model.
+    """
+    return {
+        "id": workflow.get("id"),
+        "filename": workflow.get("filename") or "",
+        "name": workflow.get("name") or "",
+        "active": bool(workflow.get("active")),
+        "description": workflow.get("description") or "",
+        "trigger_type": workflow.get("trigger_type") or "Manual",
+        "complexity": workflow.get("complexity") or "low",
+        "node_count": workflow.get("node_count") or 0,
+        "integrations": workflow.get("integrations") or [],
+        "tags": workflow.get("tags") or [],
+        "created_at": workflow.get("created_at"),
+        "updated_at": workflow.get("updated_at"),
+    }
+
+
+def json_response(content: Dict[str, Any], response: Response) -> Response:
+    """content encoded as JSONResponse would, keeping response's headers.
+
+    For endpoints that return plain dicts and lists, which need no model
+    validation: returning a Response skips FastAPI's response_model pass.
+    """
+    if orjson is not None:
+        body = orjson.dumps(content)
+    else:
+        text = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+        body = text.encode("utf-8")
+    return Response(body, media_type="application/json", headers=response.headers)
+
+
+@app.get("/api/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query("", description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Max suggestions"),
+):
+    """Typeahead suggestions from workflow names, integrations, tags and node types."""
+    # Checking the index generation is a query, and a rebuild reads every term
+    index = await io_executor.run(current_suggest_index)
+    suggestions = index.suggest(q, limit)
+    return SuggestResponse(query=q, suggestions=suggestions)
+
+
+def search_facets(
+    catalog: Optional[WorkflowCatalog],
+    query: str,
+    filters: Dict[str, Any],
+    semantic: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """Facet counts for a search, from catalog bitmaps when a catalog is loaded.
+
+    Without a catalog, semantic searches are counted by their keyword matches.
+    """
+    if catalog is None:
+        return db.search_facets(query, **filters)
+    if semantic:
+        rows = catalog.rows_for_ids(db.semantic_search_ids(query, **filters))
+    elif query:
+        rows = catalog.rows_for_ids(db.search_ids(query, **filters))
+    else:
+        rows = catalog.matching_rows(**filters)
+    return catalog.facets(rows)
+
+
 @app.get("/api/workflows", response_model=SearchResponse)
 async def search_workflows(
-    q: str = Query("", description="Search query"),
+    request: Request,
+    response: Response,
+    q: str = Query(
+        "",
+        description='Search terms: words, "quoted phrases" or column:term; '
+        "the last term also matches as a prefix",
+    ),
     trigger: str = Query("all", description="Filter by trigger type"),
     complexity: str = Query("all", description="Filter by complexity"),
     active_only: bool = Query(False, description="Show only active workflows"),
+    integration: str = Query("all", description="Filter by integration name"),
+    node_type: str = Query(
+        "all", description="Filter by node type, e.g. n8n-nodes-base.slack"
+    ),
+    min_nodes: Optional[int] = Query(None, ge=0, description="Minimum node count"),
+    max_nodes: Optional[int] = Query(None, ge=0, description="Maximum node count"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    exact_total: bool = Query(
+        True, description="Count every match; false returns a bounded estimate"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page; replaces page"
+    ),
+    facets: bool = Query(
+        False, description="Also count all matches by trigger, complexity, etc."
+    ),
+    mode: str = Query(
+        "keyword",
+        pattern="^(keyword|semantic)$",
+        description="semantic also ranks workflows by meaning, not only shared words",
+    ),
 ):
     """Search and filter workflows with pagination."""
-    try:
-        offset = (page - 1) * per_page
-
-        workflows, total = db.search_workflows(
-            query=q,
-            trigger_filter=trigger,
-            complexity_filter=complexity,
-            active_only=active_only,
-            limit=per_page,
-            offset=offset,
+    # Matching ignores case, so case and whitespace variants share cache entries
+    normalized_query = " ".join(q.lower().split())
+    ranked = bool(normalized_query)
+    semantic = mode == "semantic" and ranked
+    if semantic and cursor:
+        raise HTTPException(
+            status_code=400, detail="Semantic search pages with page, not cursor"
         )
+    validate_cursor(cursor, ranked)
+
+    headers = await io_executor.run(index_cache_headers)
+    unchanged = unchanged_response(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
 
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                # Remove extra fields that aren't in the model
-                clean_workflow = {
-                    "id": workflow.get("id"),
-                    "filename": workflow.get("filename", ""),
-                    "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
-                    "description": workflow.get("description", ""),
-                    "trigger_type": workflow.get("trigger_type", "Manual"),
-                    "complexity": workflow.get("complexity", "low"),
-                    "node_count": workflow.get("node_count", 0),
-                    "integrations": workflow.get("integrations", []),
-                    "tags": workflow.get("tags", []),
-                    "created_at": workflow.get("created_at"),
-                    "updated_at": workflow.get("updated_at"),
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
+    try:
+        offset = 0 if cursor else (page - 1) * per_page
+        filters = {
+            "trigger_filter": trigger,
+            "complexity_filter": complexity,
+            "active_only": active_only,
+            "integration_filter": integration.strip(),
+            "node_type_filter": node_type.strip(),
+            "min_nodes": min_nodes,
+            "max_nodes": max_nodes,
+        }
+
+        # Runs on io_executor: even checking that the catalog is current
+        # queries the index generation
+        def search_with_facets():
+            # Filter-only searches are answered from the in-memory catalog
+            catalog = live_catalog.current()
+            if semantic:
+                search = partial(
+                    db.semantic_search,
+                    normalized_query,
+                    limit=per_page,
+                    offset=offset,
+                    **filters,
+                )
+            elif catalog is not None and not normalized_query:
+                search = partial(
+                    catalog.search,
+                    limit=per_page,
+                    offset=offset,
+                    cursor=cursor,
+                    **filters,
+                )
+            else:
+                search = partial(
+                    db.search_workflows,
+                    query=normalized_query,
+                    limit=per_page,
+                    offset=offset,
+                    exact_total=exact_total,
+                    cursor=cursor,
+                    **filters,
                 )
-                # Continue with other workflows instead of failing completely
-                continue
+
+            workflows, total = search()
+            # Only SQL searches estimate; the catalog and semantic ranking
+            # always count every match
+            total_exact = (
+                exact_total
+                or semantic
+                or catalog is not None and not normalized_query
+                or total < total_estimate_cap(offset + per_page)
+            )
+            if not facets:
+                return workflows, total, total_exact, None
+            return (
+                workflows,
+                total,
+                total_exact,
+                search_facets(catalog, normalized_query, filters, semantic),
+            )
+
+        workflows, total, total_exact, facet_counts = await io_executor.run(
+            cached_search,
+            request,
+            response,
+            (
+                "search",
+                normalized_query,
+                trigger,
+                complexity,
+                active_only,
+                integration.strip().lower(),
+                node_type.strip(),
+                min_nodes,
+                max_nodes,
+                page,
+                per_page,
+                exact_total,
+                cursor,
+                facets,
+                semantic,
+            ),
+            search_with_facets,
+        )
 
         pages = (total + per_page - 1) // per_page  # Ceiling division
 
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=q,
-            filters={
-                "trigger": trigger,
-                "complexity": complexity,
-                "active_only": active_only,
+        # Rows are encoded directly, in SearchResponse's field order
+        return json_response(
+            {
+                "workflows": [workflow_summary(workflow) for workflow in workflows],
+                "total": total,
+                "total_exact": total_exact,
+                "next_cursor": (
+                    None if semantic else next_page_cursor(workflows, per_page, ranked)
+                ),
+                "facets": facet_counts,
+                "page": page,
+                "per_page": per_page,
+                "pages": pages,
+                "query": q,
+                "filters": {
+                    "trigger": trigger,
+                    "complexity": complexity,
+                    "active_only": active_only,
+                    "integration": integration,
+                    "node_type": node_type,
+                    "min_nodes": min_nodes,
+                    "max_nodes": max_nodes,
+                },
             },
+            response,
         )
     except Exception as e:
         raise HTTPException(
@@ -310,8 +716,31 @@ async def search_workflows(
         )
 
 
+def resolve_workflow_file(workflow: Dict[str, Any]) -> Optional[Path]:
+    """The file an indexed workflow was read from, if it is still there.
+
+    Paths come from the index rather than a directory scan, but are still
+    checked to stay inside the workflows directory.
+    """
+    if not workflow.get("path"):
+        return None
+    workflows_path = Path(db.workflows_dir).resolve()
+    file_path = (workflows_path / workflow["path"]).resolve()
+    try:
+        # Verify the file is actually within workflows directory
+        file_path.relative_to(workflows_path)
+    except ValueError:
+        print(f"Security: Blocked access to file outside workflows: {file_path}")
+        return None
+    if file_path.name != workflow["filename"] or not file_path.is_file():
+        return None
+    return file_path
+
+
 @app.get("/api/workflows/{filename}")
-async def get_workflow_detail(filename: str, request: Request):
+async def get_workflow_detail(
+    filename: str, request: Request, response: Response
+):
     """Get detailed workflow information including raw JSON."""
     try:
         # Security: Validate filename to prevent path traversal
@@ -326,35 +755,14 @@ async def get_workflow_detail(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Get workflow metadata from database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
-        if not workflows:
+        # Get workflow metadata, including its stored path, from database
+        workflow_meta = await io_executor.run(db.get_workflow_by_filename, filename)
+        if workflow_meta is None:
             raise HTTPException(
                 status_code=404, detail="Workflow not found in database"
             )
 
-        workflow_meta = workflows[0]
-
-        # Load raw JSON from file with security checks
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
+        matching_file = await io_executor.run(resolve_workflow_file, workflow_meta)
         if not matching_file:
             print(f"Warning: File {filename} not found in workflows directory")
             raise HTTPException(
@@ -362,9 +770,23 @@ async def get_workflow_detail(filename: str, request: Request):
                 detail=f"Workflow file '{filename}' not found on filesystem",
             )
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            raw_json = json.load(f)
+        # Metadata changes whenever the file is re-analyzed, even if its
+        # content is the same
+        analyzed_at = timestamp_seconds(workflow_meta.get("analyzed_at"))
+        headers = cache_headers(
+            etag(workflow_meta["file_hash"], f"{analyzed_at or 0:.0f}"),
+            analyzed_at,
+            WORKFLOW_CACHE_CONTROL,
+        )
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
+
+        raw_json = await io_executor.run(
+            load_workflow_json, str(matching_file), workflow_meta["file_hash"]
+        )
 
+        response.headers.update(headers)
         return {"metadata": workflow_meta, "raw_json": raw_json}
     except HTTPException:
         raise
@@ -388,45 +810,34 @@ async def download_workflow(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()  # Get absolute path
-
-        # Find the file safely
-        json_files = []
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory (defense in depth)
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        json_files.append(target_file)
-                    except ValueError:
-                        # File is outside workflows directory
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not json_files:
+        # Resolved through the path stored at index time
+        workflow = await io_executor.run(db.get_workflow_by_filename, filename)
+        file_path = (
+            await io_executor.run(resolve_workflow_file, workflow) if workflow else None
+        )
+        if file_path is None:
             print(f"File {filename} not found in workflows directory")
             raise HTTPException(
                 status_code=404, detail=f"Workflow file '{filename}' not found"
             )
 
-        file_path = json_files[0]
-
-        # Final security check: Ensure file is within workflows directory
-        try:
-            file_path.resolve().relative_to(workflows_path)
-        except ValueError:
-            print(
-                f"Security: Blocked final attempt to access file outside workflows: {file_path}"
-            )
-            raise HTTPException(status_code=403, detail="Access denied")
-
-        return FileResponse(
-            str(file_path), media_type="application/json", filename=filename
+        headers = cache_headers(
+            etag(workflow["file_hash"]),
+            await io_executor.run(os.path.getmtime, file_path),
+            WORKFLOW_CACHE_CONTROL,
+        )
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
+
+        return await io_executor.run(
+            precompressed_file_response,
+            request,
+            str(file_path),
+            compressed_store.base_path(workflow["file_hash"]),
+            "application/json",
+            filename=filename,
+            headers=headers,
         )
     except HTTPException:
         raise
@@ -438,7 +849,9 @@ async def download_workflow(filename: str, request: Request):
 
 
 @app.get("/api/workflows/{filename}/diagram")
-async def get_workflow_diagram(filename: str, request: Request):
+async def get_workflow_diagram(
+    filename: str, request: Request, response: Response
+):
     """Get Mermaid diagram code for workflow visualization."""
     try:
         # Security: Validate filename to prevent path traversal
@@ -453,50 +866,36 @@ async def get_workflow_diagram(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not matching_file:
-            print(f"Warning: File {filename} not found in workflows directory")
+        # Served from the graph stored at index time; no file access
+        workflow = await io_executor.run(db.get_workflow_by_filename, filename)
+        if workflow is None or workflow["file_hash"] is None:
             raise HTTPException(
-                status_code=404,
-                detail=f"Workflow file '{filename}' not found on filesystem",
+                status_code=404, detail="Workflow not found in database"
             )
+        file_hash = workflow["file_hash"]
 
-        with open(matching_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        nodes = data.get("nodes", [])
-        connections = data.get("connections", {})
+        # The diagram depends only on the file's content
+        headers = cache_headers(
+            etag(file_hash),
+            timestamp_seconds(workflow.get("analyzed_at")),
+            WORKFLOW_CACHE_CONTROL,
+        )
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
 
-        # Generate Mermaid diagram
-        diagram = generate_mermaid_diagram(nodes, connections)
+        try:
+            diagram = await io_executor.run(cached_workflow_diagram, file_hash)
+        except KeyError:
+            raise HTTPException(
+                status_code=404,
+                detail="Workflow diagram not indexed yet, please reindex",
+            )
 
+        response.headers.update(headers)
         return {"diagram": diagram}
     except HTTPException:
         raise
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON in {filename}: {str(e)}")
-        raise HTTPException(
-            status_code=400, detail=f"Invalid JSON in workflow file: {str(e)}"
-        )
     except Exception as e:
         print(f"Error generating diagram for {filename}: {str(e)}")
         raise HTTPException(
@@ -504,6 +903,68 @@ async def get_workflow_diagram(filename: str, request: Request):
         )
 
 
+@app.get("/api/workflows/{filename}/similar", response_model=SimilarResponse)
+async def get_similar_workflows(
+    filename: str,
+    request: Request,
+    limit: int = Query(10, ge=1, le=50, description="Max similar workflows"),
+):
+    """Workflows most like this one, by cosine similarity of their embeddings."""
+    try:
+        # Security: Validate filename to prevent path traversal
+        if not validate_filename(filename):
+            print(f"Security: Blocked path traversal attempt for filename: {filename}")
+            raise HTTPException(status_code=400, detail="Invalid filename format")
+
+        # Security: Rate limiting
+        client_ip = request.client.host if request.client else "unknown"
+        if not check_rate_limit(client_ip):
+            raise HTTPException(
+                status_code=429, detail="Rate limit exceeded. Please try again later."
+            )
+
+        if await io_executor.run(db.get_vector_index) is None:
+            raise HTTPException(
+                status_code=503, detail="Workflow embeddings not built, please reindex"
+            )
+        workflows = await io_executor.run(db.similar_workflows, filename, limit)
+        if workflows is None:
+            raise HTTPException(
+                status_code=404, detail="Workflow not found in database"
+            )
+
+        return SimilarResponse(
+            filename=filename,
+            workflows=[SimilarWorkflow(**workflow) for workflow in workflows],
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error finding workflows similar to {filename}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Error finding similar workflows: {str(e)}"
+        )
+
+
+@lru_cache(maxsize=64)
+def load_workflow_json(file_path: str, file_hash: str) -> Dict[str, Any]:
+    """Parse a workflow file, cached by content hash so edits are picked up."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=1024)
+def cached_workflow_diagram(file_hash: str) -> str:
+    """Mermaid diagram for the graph stored under a file hash.
+
+    Raises KeyError (which lru_cache doesn't cache) if no graph is stored.
+    """
+    graph = db.get_workflow_graph(file_hash)
+    if graph is None:
+        raise KeyError(file_hash)
+    return generate_mermaid_diagram(graph["nodes"], graph["connections"])
+
+
 def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
     """Generate Mermaid.js flowchart code from workflow nodes and connections."""
     if not nodes:
@@ -580,6 +1041,12 @@ async def reindex_workflows(
     background_tasks: BackgroundTasks,
     request: Request,
     force: bool = False,
+    bulk: bool = Query(
+        False, description="Rebuild the whole index in one bulk load (implies force)"
+    ),
+    workers: int = Query(
+        1, ge=1, le=32, description="Worker processes used for indexing"
+    ),
     admin_token: Optional[str] = Query(None, description="Admin authentication token"),
 ):
     """Trigger workflow reindexing in the background (requires authentication)."""
@@ -609,7 +1076,7 @@ async def reindex_workflows(
 
     def run_indexing():
         try:
-            db.index_all_workflows(force_reindex=force)
+            db.index_all_workflows(force_reindex=force, workers=workers, bulk=bulk)
             print(f"Reindexing completed successfully (requested by {client_ip})")
         except Exception as e:
             print(f"Error during reindexing: {e}")
@@ -622,7 +1089,7 @@ async def reindex_workflows(
 async def get_integrations():
     """Get list of all unique integrations."""
     try:
-        stats = db.get_stats()
+        stats = await io_executor.run(db.get_stats)
         # For now, return basic info. Could be enhanced to return detailed integration stats
         return {"integrations": [], "count": stats["unique_integrations"]}
     except Exception as e:
@@ -632,34 +1099,24 @@ async def get_integrations():
 
 
 @app.get("/api/categories")
-async def get_categories():
+async def get_categories(request: Request, response: Response):
     """Get available workflow categories for filtering."""
     try:
         # Try to load from the generated unique categories file
         categories_file = Path("context/unique_categories.json")
-        if categories_file.exists():
-            with open(categories_file, "r", encoding="utf-8") as f:
-                categories = json.load(f)
-            return {"categories": categories}
-        else:
-            # Fallback: extract categories from search_categories.json
-            search_categories_file = Path("context/search_categories.json")
-            if search_categories_file.exists():
-                with open(search_categories_file, "r", encoding="utf-8") as f:
-                    search_data = json.load(f)
-
-                unique_categories = set()
-                for item in search_data:
-                    if item.get("category"):
-                        unique_categories.add(item["category"])
-                    else:
-                        unique_categories.add("Uncategorized")
-
-                categories = sorted(list(unique_categories))
-                return {"categories": categories}
-            else:
-                # Last resort: return basic categories
-                return {"categories": ["Uncategorized"]}
+        search_categories_file = Path("context/search_categories.json")
+        headers = await io_executor.run(
+            index_cache_headers, categories_file, search_categories_file
+        )
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+
+        categories = await io_executor.run(
+            load_categories, categories_file, search_categories_file
+        )
+        return {"categories": categories}
 
     except Exception as e:
         print(f"Error loading categories: {e}")
@@ -668,26 +1125,59 @@ async def get_categories():
         )
 
 
-@app.get("/api/category-mappings")
-async def get_category_mappings():
-    """Get filename to category mappings for client-side filtering."""
-    try:
-        search_categories_file = Path("context/search_categories.json")
-        if not search_categories_file.exists():
-            return {"mappings": {}}
+def load_categories(categories_file: Path, search_categories_file: Path) -> List[str]:
+    """Categories from unique_categories.json, else from search_categories.json."""
+    if categories_file.exists():
+        with open(categories_file, "r", encoding="utf-8") as f:
+            return json.load(f)
 
+    # Fallback: extract categories from search_categories.json
+    if search_categories_file.exists():
         with open(search_categories_file, "r", encoding="utf-8") as f:
             search_data = json.load(f)
 
-        # Convert to a simple filename -> category mapping
-        mappings = {}
+        unique_categories = set()
         for item in search_data:
-            filename = item.get("filename")
-            category = item.get("category") or "Uncategorized"
-            if filename:
-                mappings[filename] = category
+            if item.get("category"):
+                unique_categories.add(item["category"])
+            else:
+                unique_categories.add("Uncategorized")
 
-        return {"mappings": mappings}
+        return sorted(list(unique_categories))
+
+    # Last resort: return basic categories
+    return ["Uncategorized"]
+
+
+@app.get("/api/category-mappings")
+async def get_category_mappings(request: Request):
+    """Get filename to category mappings for client-side filtering.
+
+    The body is built and compressed once per ETag.
+    """
+    global category_mappings_payload
+    try:
+        search_categories_file = Path("context/search_categories.json")
+        headers = await io_executor.run(index_cache_headers, search_categories_file)
+        unchanged = unchanged_response(request, headers)
+        if unchanged is not None:
+            return unchanged
+
+        cached = category_mappings_payload
+        if cached is None or cached[0] != headers["ETag"]:
+            payload = await io_executor.run(
+                category_mappings_payload_for, search_categories_file
+            )
+            cached = (headers["ETag"], payload)
+            category_mappings_payload = cached
+        payload = cached[1]
+
+        encoding, body = payload.pick(request.headers.get("accept-encoding"))
+        if payload.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
 
     except Exception as e:
         print(f"Error loading category mappings: {e}")
@@ -696,55 +1186,102 @@ async def get_category_mappings():
         )
 
 
+def category_mappings_payload_for(search_categories_file: Path) -> PrecompressedPayload:
+    """The /api/category-mappings body, encoded once and compressed."""
+    body = json.dumps(
+        category_mappings(search_categories_file),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return PrecompressedPayload(body)
+
+
+def category_mappings(search_categories_file: Path) -> Dict[str, Any]:
+    """The /api/category-mappings body, from search_categories.json."""
+    if not search_categories_file.exists():
+        return {"mappings": {}}
+
+    with open(search_categories_file, "r", encoding="utf-8") as f:
+        search_data = json.load(f)
+
+    # Convert to a simple filename -> category mapping
+    mappings = {}
+    for item in search_data:
+        filename = item.get("filename")
+        category = item.get("category") or "Uncategorized"
+        if filename:
+            mappings[filename] = category
+
+    return {"mappings": mappings}
+
+
 @app.get("/api/workflows/category/{category}", response_model=SearchResponse)
 async def search_workflows_by_category(
     category: str,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    exact_total: bool = Query(
+        True, description="Count every match; false returns a bounded estimate"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page; replaces page"
+    ),
 ):
     """Search workflows by service category (messaging, database, ai_ml, etc.)."""
+    validate_cursor(cursor, ranked=False)
+
     try:
-        offset = (page - 1) * per_page
+        offset = 0 if cursor else (page - 1) * per_page
+
+        # Runs on io_executor: even checking that the catalog is current
+        # queries the index generation
+        def search():
+            catalog = live_catalog.current()
+            if catalog is not None:
+                # The catalog always counts every match
+                workflows, total = catalog.search(
+                    category=category, limit=per_page, offset=offset, cursor=cursor
+                )
+                return workflows, total, True
+            workflows, total = db.search_by_category(
+                category=category,
+                limit=per_page,
+                offset=offset,
+                exact_total=exact_total,
+                cursor=cursor,
+            )
+            return (
+                workflows,
+                total,
+                exact_total or total < total_estimate_cap(offset + per_page),
+            )
 
-        workflows, total = db.search_by_category(
-            category=category, limit=per_page, offset=offset
+        workflows, total, total_exact = await io_executor.run(
+            cached_search,
+            request,
+            response,
+            ("category", category, page, per_page, exact_total, cursor),
+            search,
         )
 
-        # Convert to Pydantic models with error handling
-        workflow_summaries = []
-        for workflow in workflows:
-            try:
-                clean_workflow = {
-                    "id": workflow.get("id"),
-                    "filename": workflow.get("filename", ""),
-                    "name": workflow.get("name", ""),
-                    "active": workflow.get("active", False),
-                    "description": workflow.get("description", ""),
-                    "trigger_type": workflow.get("trigger_type", "Manual"),
-                    "complexity": workflow.get("complexity", "low"),
-                    "node_count": workflow.get("node_count", 0),
-                    "integrations": workflow.get("integrations", []),
-                    "tags": workflow.get("tags", []),
-                    "created_at": workflow.get("created_at"),
-                    "updated_at": workflow.get("updated_at"),
-                }
-                workflow_summaries.append(WorkflowSummary(**clean_workflow))
-            except Exception as e:
-                print(
-                    f"Error converting workflow {workflow.get('filename', 'unknown')}: {e}"
-                )
-                continue
-
         pages = (total + per_page - 1) // per_page
 
-        return SearchResponse(
-            workflows=workflow_summaries,
-            total=total,
-            page=page,
-            per_page=per_page,
-            pages=pages,
-            query=f"category:{category}",
-            filters={"category": category},
+        return json_response(
+            {
+                "workflows": [workflow_summary(workflow) for workflow in workflows],
+                "total": total,
+                "total_exact": total_exact,
+                "next_cursor": next_page_cursor(workflows, per_page, ranked=False),
+                "facets": None,
+                "page": page,
+                "per_page": per_page,
+                "pages": pages,
+                "query": f"category:{category}",
+                "filters": {"category": category},
+            },
+            response,
         )
     except Exception as e:
         raise HTTPException(
@@ -760,10 +1297,40 @@ async def global_exception_handler(request, exc):
     )
 
 
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving the variant of an asset that best matches
+    Accept-Encoding (see precompress_directory).
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        available = stored_encodings(str(full_path))
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding"), available)
+        if encoding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            if available:
+                response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        # The variant's own stat gives it a distinct ETag and the right length
+        variant = str(full_path) + ENCODING_SUFFIXES[encoding]
+        response = FileResponse(
+            variant,
+            status_code=status_code,
+            media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            method=scope["method"],
+            stat_result=os.stat(variant),
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
 # Mount static files AFTER all routes are defined
 static_dir = Path("static")
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
     print(f"✅ Static files mounted from {static_dir.absolute()}")
 else:
     print(f"❌ Warning: Static directory not found at {static_dir.absolute()}")
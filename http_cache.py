@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+HTTP Caching
+Validators (ETag, Last-Modified) and Cache-Control policies for API
+responses, and the conditional GET checks that turn repeat requests into
+304 Not Modified.
+"""
+
+import datetime
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# Responses tied to the index generation may be reused for a minute without
+# asking, then are revalidated; a stale copy may be shown meanwhile
+INDEX_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Responses tied to a workflow file's content hash change far less often
+WORKFLOW_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+_ETAG_RE = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+def etag(*parts: Any) -> str:
+    """Weak entity tag from parts.
+
+    Weak, because the same entity is sent gzipped or not depending on the
+    request, so its bytes are not always identical.
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def cache_headers(
+    tag: str, last_modified: Optional[float], cache_control: str
+) -> Dict[str, str]:
+    """ETag, Last-Modified (if known) and Cache-Control headers."""
+    headers = {"ETag": tag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def timestamp_seconds(value: Optional[str]) -> Optional[float]:
+    """Unix time of an SQLite CURRENT_TIMESTAMP value (UTC), or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def etag_matches(if_none_match: str, tag: str) -> bool:
+    """Whether an If-None-Match header names tag (weak comparison)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _ETAG_RE.fullmatch(tag).group(1)
+    return opaque in _ETAG_RE.findall(if_none_match)
+
+
+def not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    headers: Dict[str, str],
+) -> bool:
+    """Whether the client's cached copy is still current, given the request's
+    conditional headers and the response's cache_headers().
+
+    As in RFC 9110, If-Modified-Since is ignored when If-None-Match is sent.
+    """
+    if if_none_match is not None:
+        return etag_matches(if_none_match, headers["ETag"])
+    if if_modified_since is None or "Last-Modified" not in headers:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    modified = parsedate_to_datetime(headers["Last-Modified"])
+    return modified <= since
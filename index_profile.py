@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Workflow Indexing Profiler
+Collects per-phase and per-file timings for `workflow_db.py --index --profile`.
+"""
+
+import contextlib
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+# Phases timed for each analyzed file, in pipeline order. "hash" only shows up
+# per file when the planner didn't already hash it; "extract" covers metadata,
+# node type counts and the stored graph.
+FILE_PHASES = ("read", "parse", "hash", "extract", "analyze_nodes", "describe")
+
+
+class FileTimer:
+    """Attributes wall time to named phases between successive lap() calls."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+
+class _NullTimer:
+    def lap(self, phase: str):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+class IndexProfile:
+    """Timings gathered over one index run.
+
+    Index-level phases (scan, stat, write, ...) are measured in the indexing
+    process. Per-file phases are measured wherever the file was analyzed, so
+    with worker processes their totals add up CPU time across workers and can
+    exceed the wall-clock time of the run.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.files: List[Dict[str, Any]] = []
+        self.elapsed = 0.0
+        self.index_seconds = 0.0
+        self.stats: Dict[str, int] = {}
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_file(self, file_path: str, workflow_data: Dict[str, Any]):
+        """Record the timings an analyzed workflow carries back from analysis."""
+        timings = workflow_data.pop("timings", None) or {}
+        for phase, seconds in timings.items():
+            self.add(phase, seconds)
+        self.files.append(
+            {
+                "path": file_path,
+                "size": workflow_data["file_size"],
+                "node_count": workflow_data["node_count"],
+                "seconds": sum(timings.values()),
+                "phases": timings,
+            }
+        )
+
+    def finish(self, stats: Dict[str, int], index_seconds: Optional[float] = None):
+        """End the run; index_seconds excludes work after indexing (embed,
+        compress) from throughput, and defaults to the whole run."""
+        self.elapsed = time.perf_counter() - self._start
+        self.index_seconds = self.elapsed if index_seconds is None else index_seconds
+        self.stats = dict(stats)
+
+    def slowest(self, count: int = 20) -> List[Dict[str, Any]]:
+        return sorted(self.files, key=lambda f: f["seconds"], reverse=True)[:count]
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        index_seconds = max(self.index_seconds, 1e-6)
+        total_bytes = sum(f["size"] for f in self.files)
+        return {
+            "elapsed_seconds": self.elapsed,
+            "index_seconds": self.index_seconds,
+            "stats": self.stats,
+            "throughput": {
+                "files_per_second": len(self.files) / index_seconds,
+                "mb_per_second": total_bytes / (1024 * 1024) / index_seconds,
+            },
+            "phases": self.phases,
+            "slowest_files": self.slowest(top),
+        }
+
+    def print_report(self, top: int = 20):
+        report = self.to_dict(top)
+        elapsed = max(self.elapsed, 1e-6)
+
+        print(f"\n📈 Index profile ({self.elapsed:.2f}s wall clock)")
+        print(f"  {'phase':<16} {'seconds':>10} {'% wall':>8}")
+        for phase, seconds in sorted(
+            self.phases.items(), key=lambda item: item[1], reverse=True
+        ):
+            print(f"  {phase:<16} {seconds:>10.3f} {seconds / elapsed * 100:>7.1f}%")
+
+        throughput = report["throughput"]
+        print(
+            f"  {len(self.files)} files analyzed in {self.index_seconds:.2f}s - "
+            f"{throughput['files_per_second']:.1f} files/sec, "
+            f"{throughput['mb_per_second']:.2f} MB/sec"
+        )
+
+        if report["slowest_files"]:
+            print(f"\n🐢 {len(report['slowest_files'])} slowest files")
+            print(f"  {'ms':>8} {'KB':>8} {'nodes':>6}  file")
+            for f in report["slowest_files"]:
+                print(
+                    f"  {f['seconds'] * 1000:>8.2f} {f['size'] / 1024:>8.1f} "
+                    f"{f['node_count']:>6}  {f['path']}"
+                )
+
+    def write_json(self, path: str, top: int = 20):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(top), f, indent=2)
+
+
+def file_timer(profile: Optional[IndexProfile]):
+    """A FileTimer when profiling, otherwise a timer that records nothing."""
+    return FileTimer() if profile is not None else NULL_TIMER
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Blocking I/O Executor
+Runs the blocking SQLite queries and file reads of async request handlers on
+a bounded thread pool, so one slow query or large workflow file no longer
+stalls the event loop, and every other request on the worker with it.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from workflow_db import READ_POOL_SIZE
+
+# One thread per pooled read connection: more threads would only queue for
+# a connection, fewer would leave connections idle
+IO_THREADS = int(os.environ.get("WORKFLOW_IO_THREADS", str(READ_POOL_SIZE)))
+
+
+class IOExecutor:
+    """Bounded thread pool whose calls are awaited from the event loop.
+
+    Calls beyond max_workers queue in submission order; metrics() reports
+    how long they waited for a thread.
+    """
+
+    def __init__(self, max_workers: int = IO_THREADS):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="io"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) run on the pool, re-raising its errors."""
+        queued = time.perf_counter()
+
+        def call():
+            waited = time.perf_counter() - queued
+            with self._lock:
+                self._wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            return func(*args, **kwargs)
+
+        with self._lock:
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Thread count, calls in flight or queued, and time spent queued."""
+        with self._lock:
+            return {
+                "threads": self.max_workers,
+                "pending": self._pending,
+                "completed": self._completed,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_max": self._max_wait_seconds,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
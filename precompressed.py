@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Precompressed Payloads
+gzip, brotli and zstd variants of workflow files, static assets and hot API
+payloads, compressed once ahead of time so responses only pick a variant
+from Accept-Encoding instead of compressing on every request.
+"""
+
+import gzip
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: brotli variants
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: zstd variants
+    zstandard = None
+
+# Levels are chosen for one-off compression of a few thousand files: brotli
+# 11 and zstd 19 are 5-10x slower for 5-10% smaller output
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+ZSTD_LEVEL = 12
+# Same threshold as GZipMiddleware; smaller bodies aren't worth a variant
+MIN_COMPRESS_SIZE = 1000
+
+# File suffix by Content-Encoding, in order of preference when a client
+# accepts several equally
+ENCODING_SUFFIXES = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+STATIC_SUFFIXES = (".html", ".css", ".js", ".json", ".svg", ".txt")
+
+
+def available_encodings() -> List[str]:
+    """Encodings this installation can produce, in order of preference."""
+    return [
+        encoding
+        for encoding in ENCODING_SUFFIXES
+        if encoding == "gzip"
+        or (encoding == "br" and brotli is not None)
+        or (encoding == "zstd" and zstandard is not None)
+    ]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # A fixed mtime keeps variants of the same content byte-identical
+        return gzip.compress(data, GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def choose_encoding(
+    accept_encoding: Optional[str], available: Iterable[str]
+) -> Optional[str]:
+    """The available encoding the client prefers, or None for identity.
+
+    Honors q-values (q=0 refuses an encoding) and "*"; ties go to the order
+    of ENCODING_SUFFIXES.
+    """
+    accepted: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+
+    available = set(available)
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_SUFFIXES:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_variants(base_path: str, data: bytes, encodings: Iterable[str]) -> int:
+    """Write base_path + suffix for each encoding; returns the number written.
+
+    Variants that would not be smaller than data are skipped.
+    """
+    written = 0
+    for encoding in encodings:
+        compressed = compress(data, encoding)
+        if len(compressed) < len(data):
+            _write_atomic(base_path + ENCODING_SUFFIXES[encoding], compressed)
+            written += 1
+    return written
+
+
+def stored_encodings(base_path: str) -> List[str]:
+    """Encodings with a variant of base_path on disk, in order of preference.
+
+    Empty files are CompressedStore markers, not variants.
+    """
+    encodings = []
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        try:
+            if os.path.getsize(base_path + suffix) > 0:
+                encodings.append(encoding)
+        except OSError:
+            pass
+    return encodings
+
+
+def compressed_store_path(db_path: str) -> str:
+    """Where variants of the workflows indexed in db_path are stored."""
+    return db_path + ".compressed"
+
+
+class CompressedStore:
+    """Variants of workflow files, addressed by their content hash.
+
+    Files are laid out as <directory>/<hash[:2]>/<hash>.json.<suffix>, so a
+    workflow that moves or is renamed keeps its variants, and identical
+    files share them. A variant that would not be smaller is stored as an
+    empty marker, so the file isn't compressed again on every index run.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def base_path(self, file_hash: str) -> str:
+        return os.path.join(self.directory, file_hash[:2], file_hash + ".json")
+
+    def missing(self, file_hash: str) -> bool:
+        """Whether any variant this installation can produce is absent
+        (and was never attempted)."""
+        base_path = self.base_path(file_hash)
+        return any(
+            not os.path.exists(base_path + ENCODING_SUFFIXES[encoding])
+            for encoding in available_encodings()
+        )
+
+    def add_file(self, file_hash: str, source_path: str) -> bool:
+        """Compress source_path into the store, if it still has file_hash.
+
+        Returns False when the file changed since it was hashed, leaving it
+        for the next index run.
+        """
+        with open(source_path, "rb") as f:
+            data = f.read()
+        if hashlib.md5(data).hexdigest() != file_hash:
+            return False
+        base_path = self.base_path(file_hash)
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+        missing = [
+            encoding
+            for encoding in available_encodings()
+            if not os.path.exists(base_path + ENCODING_SUFFIXES[encoding])
+        ]
+        for encoding in missing:
+            if not write_variants(base_path, data, [encoding]):
+                _write_atomic(base_path + ENCODING_SUFFIXES[encoding], b"")
+        return True
+
+    def prune(self, keep: Set[str]) -> int:
+        """Delete variants of hashes not in keep; returns the number deleted."""
+        deleted = 0
+        if not os.path.isdir(self.directory):
+            return 0
+        for path in Path(self.directory).glob("*/*"):
+            if path.name.split(".", 1)[0] not in keep:
+                path.unlink()
+                deleted += 1
+        return deleted
+
+
+def precompress_directory(directory: str) -> int:
+    """Bring the variants next to each static asset in directory up to date;
+    returns the number of variants written.
+
+    Variants older than their asset are rewritten, or removed if the asset
+    no longer compresses, so a stale variant is never served.
+    """
+    written = 0
+    encodings = available_encodings()
+    for path in Path(directory).rglob("*"):
+        if path.suffix not in STATIC_SUFFIXES or not path.is_file():
+            continue
+        mtime = path.stat().st_mtime
+        stale = []
+        for encoding in encodings:
+            variant = Path(f"{path}{ENCODING_SUFFIXES[encoding]}")
+            if not variant.exists() or variant.stat().st_mtime < mtime:
+                stale.append(encoding)
+        if not stale:
+            continue
+        data = path.read_bytes()
+        for encoding in stale:
+            variant = Path(f"{path}{ENCODING_SUFFIXES[encoding]}")
+            if len(data) >= MIN_COMPRESS_SIZE and write_variants(
+                str(path), data, [encoding]
+            ):
+                written += 1
+            elif variant.exists():
+                variant.unlink()
+    return written
+
+
+class PrecompressedPayload:
+    """A response body and its compressed variants, made once."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            for encoding in available_encodings():
+                compressed = compress(body, encoding)
+                if len(compressed) < len(body):
+                    self.variants[encoding] = compressed
+
+    def pick(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """(Content-Encoding, body) for a request's Accept-Encoding."""
+        encoding = choose_encoding(accept_encoding, self.variants)
+        return encoding, self.variants[encoding] if encoding else self.body
+
+
+def main():
+    """Precompress the static assets in the given directories."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompress static assets")
+    parser.add_argument("directories", nargs="*", default=["static"])
+    args = parser.parse_args()
+
+    print(f"Encodings: {', '.join(available_encodings())}")
+    for directory in args.directories:
+        written = precompress_directory(directory)
+        print(f"🗜️  {directory}: {written} variants written")
+
+
+if __name__ == "__main__":
+    main()
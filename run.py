@@ -73,7 +73,7 @@ def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str
     stats = db.get_stats()
     if stats["total"] == 0 or force_reindex:
         print("📚 Indexing workflows...")
-        index_stats = db.index_all_workflows(force_reindex=True)
+        index_stats = db.index_all_workflows(bulk=True)
         print(f"✅ Indexed {index_stats['processed']} workflows")
 
         # Show final stats
@@ -85,7 +85,23 @@ def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str
     return db_path
 
 
-def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
+def setup_snapshot(snapshot_path: str) -> str:
+    """Serve a prebuilt snapshot read-only, without DDL or indexing."""
+    from workflow_db import WorkflowDatabase
+
+    print(f"📦 Serving read-only snapshot: {snapshot_path}")
+    os.environ["WORKFLOW_DB_READONLY"] = "1"
+    stats = WorkflowDatabase(snapshot_path, read_only=True).get_stats()
+    print(f"✅ Snapshot ready: {stats['total']} workflows")
+    return snapshot_path
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    reload: bool = False,
+    db_path: str = "database/workflows.db",
+):
     """Start the FastAPI server."""
     print(f"🌐 Starting server at http://{host}:{port}")
     print(f"📊 API Documentation: http://{host}:{port}/docs")
@@ -95,7 +111,7 @@ def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False
     print("-" * 50)
 
     # Configure database path
-    os.environ["WORKFLOW_DB_PATH"] = "database/workflows.db"
+    os.environ["WORKFLOW_DB_PATH"] = db_path
 
     # Start uvicorn with better configuration
     import uvicorn
@@ -123,6 +139,8 @@ Examples:
   python run.py --host 0.0.0.0     # Accept external connections
   python run.py --reindex          # Force database reindexing
   python run.py --dev              # Development mode with auto-reload
+  python run.py --watch            # Keep the index in sync with workflows/
+  python run.py --snapshot out.db  # Serve a snapshot from workflow_db.py --build-snapshot
         """,
     )
 
@@ -138,6 +156,16 @@ Examples:
     parser.add_argument(
         "--dev", action="store_true", help="Development mode with auto-reload"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Reindex workflow files as they change while the server runs",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="DB",
+        help="Serve a prebuilt snapshot database read-only (no DDL or indexing)",
+    )
     parser.add_argument(
         "--skip-index",
         action="store_true",
@@ -161,14 +189,26 @@ Examples:
 
     # Setup database
     try:
-        setup_database(force_reindex=args.reindex, skip_index=skip_index)
+        if args.snapshot:
+            db_path = setup_snapshot(args.snapshot)
+        else:
+            db_path = setup_database(force_reindex=args.reindex, skip_index=skip_index)
     except Exception as e:
         print(f"❌ Database setup error: {e}")
         sys.exit(1)
 
+    # Keep the index fresh while serving
+    if args.watch and args.snapshot:
+        print("⚠️  --watch is ignored when serving a read-only snapshot")
+    elif args.watch:
+        from workflow_db import WorkflowDatabase
+        from workflow_watcher import start_watch_thread
+
+        start_watch_thread(WorkflowDatabase(db_path))
+
     # Start server
     try:
-        start_server(host=args.host, port=args.port, reload=args.dev)
+        start_server(host=args.host, port=args.port, reload=args.dev, db_path=db_path)
     except KeyboardInterrupt:
         print("\n👋 Server stopped!")
     except Exception as e:
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyze_nodes on the largest workflow files
+Times node classification with cold and warm classifier caches.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import workflow_db
+from workflow_db import WorkflowDatabase
+
+
+def largest_workflows(workflows_dir: str, count: int):
+    """Return (path, nodes) for the workflows with the most nodes."""
+    workflows = []
+    for path in Path(workflows_dir).rglob("*.json"):
+        with open(path, "r", encoding="utf-8") as f:
+            workflows.append((path, json.load(f).get("nodes", [])))
+    workflows.sort(key=lambda item: len(item[1]), reverse=True)
+    return workflows[:count]
+
+
+def time_analyze_nodes(db, nodes, iterations: int, cold: bool) -> float:
+    """Average seconds per analyze_nodes call."""
+    total = 0.0
+    for _ in range(iterations):
+        if cold:
+            workflow_db._classify_node_type.cache_clear()
+            workflow_db._service_from_node_name.cache_clear()
+        start = time.perf_counter()
+        db.analyze_nodes(nodes)
+        total += time.perf_counter() - start
+    return total / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workflows-dir", default="workflows")
+    parser.add_argument("--files", type=int, default=5, help="Largest files to time")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    # analyze_nodes doesn't touch SQLite, so skip creating a database
+    db = WorkflowDatabase.__new__(WorkflowDatabase)
+
+    print(f"{'file':<50} {'nodes':>6} {'cold µs':>10} {'warm µs':>10}")
+    for path, nodes in largest_workflows(args.workflows_dir, args.files):
+        cold = time_analyze_nodes(db, nodes, args.iterations, cold=True)
+        warm = time_analyze_nodes(db, nodes, args.iterations, cold=False)
+        print(f"{path.name:<50} {len(nodes):>6} {cold * 1e6:>10.1f} {warm * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark API latency under concurrent clients
+Starts the API server (or uses --url) and has --clients clients send a mix
+of cheap and expensive requests at once, reporting p50/p99 latency per
+request type. Expensive searches bypass the search cache, so they always
+reach SQLite; while they run on the event loop, every cheap request queued
+behind them waits too.
+
+Rate-limited endpoints (workflow detail, download, diagram) are left out,
+since all clients share one address.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).parent.parent
+
+BYPASS = {"X-Cache-Bypass": "1"}
+# (label, path, headers), sent round-robin by each client
+REQUEST_MIX = [
+    ("stats", "/api/stats", {}),
+    ("suggest", "/api/suggest?q=sla", {}),
+    ("list", "/api/workflows?per_page=20", {}),
+    ("categories", "/api/categories", {}),
+    ("search", "/api/workflows?q=google&per_page=100", BYPASS),
+    ("facets", "/api/workflows?q=email&facets=true&per_page=50", BYPASS),
+    ("semantic", "/api/workflows?q=sync+crm+leads&mode=semantic", BYPASS),
+]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WORKFLOW_DB_PATH=db_path)
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api_server:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() > deadline:
+            raise RuntimeError("API server did not start")
+        await asyncio.sleep(0.2)
+
+
+async def run_client(client, offset, requests, timings, errors):
+    for i in range(requests):
+        label, path, headers = REQUEST_MIX[(offset + i) % len(REQUEST_MIX)]
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+        except httpx.TransportError as e:
+            errors[f"{label} {type(e).__name__}"] += 1
+            continue
+        timings[label].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors[f"{label} {response.status_code}"] += 1
+
+
+async def benchmark(url: str, clients: int, requests: int):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        await wait_until_up(client)
+        # Warm up caches that are built on first use (suggestions, vectors)
+        for _, path, headers in REQUEST_MIX:
+            await client.get(path, headers=headers)
+
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                run_client(client, i, requests, timings, errors)
+                for i in range(clients)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(samples) for samples in timings.values())
+    print(f"{clients} clients x {requests} requests: {total / elapsed:.0f} req/s")
+    print(f"{'request':<12} {'count':>6} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, _, _ in REQUEST_MIX:
+        p50, p99 = percentiles(timings[label])
+        print(f"{label:<12} {len(timings[label]):>6} {p50 * 1e3:>9.1f} {p99 * 1e3:>9.1f}")
+    p50, p99 = percentiles([t for samples in timings.values() for t in samples])
+    print(f"{'all':<12} {total:>6} {p50 * 1e3:>9.1f} {p99 * 1e3:>9.1f}")
+    for error, count in sorted(errors.items()):
+        print(f"  {count} x {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="database/workflows.db")
+    parser.add_argument("--url", help="Benchmark a running server instead")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20, help="Per client")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_server(str(Path(args.db).resolve()), port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(benchmark(url, args.clients, args.requests))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark search_workflows on common queries
+Compares exact and estimated totals, with the per-generation count cache
+cold (first request for a filter combination) and warm (paging through it),
+and reaching --page by offset versus by keyset cursor.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workflow_db import WorkflowDatabase, encode_cursor
+
+DEFAULT_QUERIES = ["telegram", "google", "email", ""]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def time_search(db, query, exact_total, cold, iterations, page):
+    samples = []
+    total = 0
+    for _ in range(iterations):
+        if cold:
+            db._count_cache = type(db._count_cache)(db._count_cache.max_entries)
+        start = time.perf_counter()
+        _, total = db.search_workflows(
+            query, limit=20, offset=(page - 1) * 20, exact_total=exact_total
+        )
+        samples.append(time.perf_counter() - start)
+    return total, percentiles(samples)
+
+
+def time_page(db, query, page, use_cursor, iterations):
+    """Time fetching `page` directly by offset, or by the previous page's cursor."""
+    cursor = None
+    offset = (page - 1) * 20
+    if use_cursor and page > 1:
+        previous, _ = db.search_workflows(query, limit=20, offset=offset - 20)
+        if not previous:
+            return None
+        cursor = encode_cursor(previous[-1], ranked=bool(query))
+        offset = 0
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        db.search_workflows(query, limit=20, offset=offset, cursor=cursor)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="database/workflows.db")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--page", type=int, default=1)
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    args = parser.parse_args()
+
+    db = WorkflowDatabase(args.db)
+
+    print(f"{'query':<12} {'total':>12} {'count cache':<12} {'p50 ms':>8} {'p99 ms':>8}")
+    for query in args.queries:
+        for exact_total in (True, False):
+            for cold in (True, False):
+                total, (p50, p99) = time_search(
+                    db, query, exact_total, cold, args.iterations, args.page
+                )
+                label = str(total) if exact_total else f"~{total}"
+                print(
+                    f"{query or '(all)':<12} {label:>12} "
+                    f"{'cold' if cold else 'warm':<12} {p50 * 1e3:>8.3f} {p99 * 1e3:>8.3f}"
+                )
+
+    print(f"\n{'query':<12} {'page':>6} {'paging':<8} {'p50 ms':>8} {'p99 ms':>8}")
+    for query in args.queries:
+        for page in sorted({1, args.page}):
+            for use_cursor in (False, True):
+                timing = time_page(db, query, page, use_cursor, args.iterations)
+                if timing is None:
+                    continue
+                p50, p99 = timing
+                print(
+                    f"{query or '(all)':<12} {page:>6} "
+                    f"{'cursor' if use_cursor else 'offset':<8} "
+                    f"{p50 * 1e3:>8.3f} {p99 * 1e3:>8.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
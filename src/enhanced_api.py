@@ -263,8 +263,10 @@ class EnhancedAPI:
             params.append(kwargs["complexity"])
 
         if kwargs.get("integration"):
-            conditions.append("w.integrations LIKE ?")
-            params.append(f"%{kwargs['integration']}%")
+            conditions.append(
+                "w.id IN (SELECT workflow_id FROM workflow_integrations WHERE integration = ?)"
+            )
+            params.append(kwargs["integration"])
 
         if kwargs.get("min_rating"):
             conditions.append("ws.average_rating >= ?")
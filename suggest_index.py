@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Typeahead Suggestion Index
+In-memory prefix index over workflow names, integrations, tags and node
+types, serving `/api/suggest` without touching the database.
+"""
+
+import bisect
+import heapq
+from typing import Any, Dict, Iterable, List, Tuple
+
+MAX_SUGGESTIONS = 25
+# Prefixes this short match too many keys to rank on every keystroke, so
+# their suggestions are ranked once when the index is built
+PRECOMPUTED_PREFIX_LEN = 2
+# A term can also be matched from the start of any word in it, e.g. "sheets"
+# in "Google Sheets" or "slack" in "n8n-nodes-base.slack"
+WORD_SEPARATORS = frozenset(" ._-/:()[]")
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def word_starts(key: str) -> List[int]:
+    return [
+        i
+        for i, char in enumerate(key)
+        if char not in WORD_SEPARATORS and (i == 0 or key[i - 1] in WORD_SEPARATORS)
+    ]
+
+
+class SuggestIndex:
+    """Sorted prefix index of suggestion terms, ranked by how often they occur.
+
+    Terms are sorted by rank once, so a term's position doubles as its rank
+    and the best matches for a prefix are simply its smallest term ids.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str, int]], generation: int = 0):
+        """Build from (text, kind, count) tuples, e.g. ("Slack", "integration", 42)."""
+        self.generation = generation
+
+        counts: Dict[Tuple[str, str], int] = {}
+        for text, kind, count in terms:
+            text = " ".join(str(text).split())
+            if text:
+                counts[(text, kind)] = counts.get((text, kind), 0) + count
+        ranked = sorted(
+            counts.items(), key=lambda item: (-item[1], len(item[0][0]), item[0])
+        )
+        self._terms: List[Dict[str, Any]] = [
+            {"text": text, "kind": kind, "count": count}
+            for (text, kind), count in ranked
+        ]
+
+        entries = []
+        top: Dict[str, set] = {}
+        for term_id, term in enumerate(self._terms):
+            key = normalize(term["text"])
+            for start in word_starts(key):
+                suffix = key[start:]
+                entries.append((suffix, term_id))
+                for length in range(1, min(PRECOMPUTED_PREFIX_LEN, len(suffix)) + 1):
+                    top.setdefault(suffix[:length], set()).add(term_id)
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._key_terms = [term_id for _, term_id in entries]
+        self._top = {
+            prefix: sorted(term_ids)[:MAX_SUGGESTIONS]
+            for prefix, term_ids in top.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent terms with a word starting with query, best first."""
+        prefix = normalize(query)
+        limit = max(0, min(limit, MAX_SUGGESTIONS))
+        if not prefix or not limit:
+            return []
+
+        if len(prefix) <= PRECOMPUTED_PREFIX_LEN:
+            term_ids = self._top.get(prefix, [])[:limit]
+        else:
+            lo = bisect.bisect_left(self._keys, prefix)
+            hi = bisect.bisect_left(self._keys, prefix + "\U0010ffff", lo)
+            term_ids = heapq.nsmallest(limit, set(self._key_terms[lo:hi]))
+        return [dict(self._terms[term_id]) for term_id in term_ids]
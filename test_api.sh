@@ -37,3 +37,22 @@ echo ""
 echo "6. Testing get specific workflow..."
 workflow=$(curl -s "http://localhost:8000/api/workflows/1" | python3 -c "import sys, json; data=json.load(sys.stdin); print(data['name'] if 'name' in data else 'NOT FOUND')")
 echo "   Workflow: $workflow"
+
+# Test typeahead suggestions
+echo ""
+echo "7. Testing suggestions for 'sla'..."
+suggestions=$(curl -s "http://localhost:8000/api/suggest?q=sla" | python3 -c "import sys, json; data=json.load(sys.stdin); print(', '.join(s['text'] for s in data['suggestions'][:3]))")
+echo "   Suggestions: $suggestions"
+
+# Test semantic search
+echo ""
+echo "8. Testing semantic search for 'notify my team about new leads'..."
+semantic=$(curl -s "http://localhost:8000/api/workflows?mode=semantic&q=notify+my+team+about+new+leads&per_page=3" | python3 -c "import sys, json; data=json.load(sys.stdin); print(', '.join(w['name'] for w in data['workflows']))")
+echo "   Results: $semantic"
+
+# Test conditional GET
+echo ""
+echo "9. Testing conditional GET of stats..."
+etag=$(curl -s -D - -o /dev/null "http://localhost:8000/api/stats" | tr -d '\r' | sed -n 's/^[Ee][Tt][Aa][Gg]: //p')
+status=$(curl -s -o /dev/null -w "%{http_code}" -H "If-None-Match: $etag" "http://localhost:8000/api/stats")
+echo "   ETag $etag revalidates with status $status"
@@ -0,0 +1,858 @@
+#!/usr/bin/env python3
+"""
+Workflow Database Tests
+Check the indexer and search engine against a sample of real workflows
+"""
+
+import functools
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import http_cache
+import precompressed
+import workflow_db
+import workflow_watcher
+from index_profile import FILE_PHASES, IndexProfile
+from suggest_index import SuggestIndex
+from workflow_catalog import LiveCatalog, WorkflowCatalog
+from workflow_db import WorkflowDatabase
+
+SAMPLE_DIRS = ["Telegram", "Webhook", "Code", "Manual"]
+
+ROW_COLUMNS = (
+    "id, filename, name, workflow_id, active, description, trigger_type, "
+    "complexity, node_count, integrations, tags, created_at, updated_at, "
+    "file_hash, file_size, path"
+)
+
+
+@pytest.fixture
+def sample_workflows(tmp_path):
+    """Copy a few workflow directories into a scratch workflows tree."""
+    workflows_dir = tmp_path / "workflows"
+    for name in SAMPLE_DIRS:
+        source = Path("workflows") / name
+        if source.exists():
+            shutil.copytree(source, workflows_dir / name)
+    return workflows_dir
+
+
+def make_db(tmp_path, workflows_dir, name="workflows.db"):
+    db = WorkflowDatabase(str(tmp_path / name))
+    db.workflows_dir = str(workflows_dir)
+    # Compressing every sample file would dominate test run time
+    db.precompress = False
+    return db
+
+
+def fetch_rows(db):
+    conn = sqlite3.connect(db.db_path)
+    rows = conn.execute(f"SELECT {ROW_COLUMNS} FROM workflows ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def fetch_children(db):
+    conn = sqlite3.connect(db.db_path)
+    integrations = conn.execute(
+        "SELECT workflow_id, integration FROM workflow_integrations ORDER BY 1, 2"
+    ).fetchall()
+    nodes = conn.execute(
+        "SELECT workflow_id, node_type, type_version, count FROM workflow_nodes "
+        "ORDER BY 1, 2, 3"
+    ).fetchall()
+    conn.close()
+    return integrations, nodes
+
+
+def test_parallel_index_matches_serial(tmp_path, sample_workflows):
+    serial_db = make_db(tmp_path, sample_workflows, "serial.db")
+    parallel_db = make_db(tmp_path, sample_workflows, "parallel.db")
+
+    serial_stats = serial_db.index_all_workflows(force_reindex=True)
+    parallel_stats = parallel_db.index_all_workflows(force_reindex=True, workers=2)
+
+    assert serial_stats == parallel_stats
+    assert serial_stats["processed"] > 0
+    assert fetch_rows(serial_db) == fetch_rows(parallel_db)
+    assert fetch_children(serial_db) == fetch_children(parallel_db)
+
+
+def test_incremental_index_skips_unchanged_files_without_hashing(
+    tmp_path, sample_workflows, monkeypatch
+):
+    db = make_db(tmp_path, sample_workflows)
+    first = db.index_all_workflows()
+
+    hashed = []
+    original_hash = db.get_file_hash
+    monkeypatch.setattr(
+        db, "get_file_hash", lambda path: hashed.append(path) or original_hash(path)
+    )
+
+    second = db.index_all_workflows()
+    assert second == {
+        "processed": 0,
+        "skipped": first["processed"],
+        "deleted": 0,
+        "errors": 0,
+    }
+    assert hashed == []
+
+    changed = next(sample_workflows.rglob("*.json"))
+    changed.write_text(changed.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    third = db.index_all_workflows()
+    assert third["processed"] == 1
+    assert hashed == [str(changed)]
+
+
+def test_removed_files_are_deleted_from_index_and_fts(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+
+    removed, renamed = sorted(sample_workflows.rglob("*.json"))[:2]
+    removed.unlink()
+    target = sample_workflows / "Renamed" / renamed.name
+    target.parent.mkdir()
+    renamed.rename(target)
+
+    stats = db.sync_paths([str(removed), str(renamed), str(target.parent)])
+    assert stats["deleted"] == 2
+    assert stats["processed"] == 1
+
+    conn = sqlite3.connect(db.db_path)
+    filenames = {row[0] for row in conn.execute("SELECT filename FROM workflows")}
+    # Raises if the FTS index still holds entries for deleted rows
+    conn.execute(
+        "INSERT INTO workflows_fts(workflows_fts, rank) VALUES ('integrity-check', 1)"
+    )
+    manifest_paths = {row[0] for row in conn.execute("SELECT path FROM workflow_manifest")}
+    conn.close()
+
+    assert removed.name not in filenames
+    assert target.name in filenames
+    assert f"Renamed/{target.name}" in manifest_paths
+    assert db.get_workflow_by_filename(target.name)["path"] == f"Renamed/{target.name}"
+    assert db.get_workflow_by_filename(removed.name) is None
+
+    # A full sweep finds nothing left to delete
+    assert db.index_all_workflows()["deleted"] == 0
+
+
+@pytest.mark.parametrize("removed_dir", ["A", "B"])
+def test_sync_keeps_workflows_that_share_a_filename(
+    tmp_path, sample_workflows, removed_dir
+):
+    workflows_dir = tmp_path / "shared"
+    source = next(sample_workflows.rglob("*.json"))
+    for directory in ("A", "B"):
+        (workflows_dir / directory).mkdir(parents=True)
+        shutil.copy(source, workflows_dir / directory / "x.json")
+    db = make_db(tmp_path, workflows_dir)
+    db.index_all_workflows()
+    assert db.get_stats()["total"] == 1
+
+    removed = workflows_dir / removed_dir / "x.json"
+    removed.unlink()
+    db.sync_paths([str(removed)])
+    kept = "B/x.json" if removed_dir == "A" else "A/x.json"
+    assert db.get_stats()["total"] == 1
+    assert db.get_workflow_by_filename("x.json")["path"] == kept
+    assert db.index_all_workflows()["deleted"] == 0
+    assert db.get_stats()["total"] == 1
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_watcher_applies_file_changes(tmp_path, sample_workflows, monkeypatch):
+    workflows_dir = tmp_path / "watched"
+    workflows_dir.mkdir()
+    sources = sorted(sample_workflows.rglob("*.json"))[:2]
+    shutil.copy(sources[0], workflows_dir / sources[0].name)
+    db = make_db(tmp_path, workflows_dir)
+
+    # Changes made before the watcher's first scan would go unnoticed
+    watching = threading.Event()
+
+    def create_watcher(root, poll=False, interval=1.0):
+        watcher = workflow_watcher.PollingWatcher(root, interval)
+        watching.set()
+        return watcher
+
+    monkeypatch.setattr(workflow_watcher, "create_watcher", create_watcher)
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=workflow_watcher.watch_workflows,
+        kwargs={"db": db, "debounce": 0.05, "poll": True, "stop_event": stop_event},
+    )
+    thread.start()
+    try:
+        assert watching.wait(30)
+        assert db.get_workflow_by_filename(sources[0].name) is not None
+
+        added = workflows_dir / sources[1].name
+        shutil.copy(sources[1], added)
+        wait_for(lambda: db.get_workflow_by_filename(added.name) is not None)
+
+        workflow = json.loads(added.read_text())
+        workflow["name"] = "Renamed by the watcher test"
+        added.write_text(json.dumps(workflow))
+        wait_for(
+            lambda: db.get_workflow_by_filename(added.name)["name"]
+            == "Renamed by the watcher test"
+        )
+
+        added.unlink()
+        wait_for(lambda: db.get_workflow_by_filename(added.name) is None)
+        assert db.get_workflow_by_filename(sources[0].name) is not None
+    finally:
+        stop_event.set()
+        thread.join()
+
+
+def test_bulk_rebuild_matches_incremental_index(tmp_path, sample_workflows):
+    incremental_db = make_db(tmp_path, sample_workflows, "incremental.db")
+    bulk_db = make_db(tmp_path, sample_workflows, "bulk.db")
+
+    incremental_db.index_all_workflows()
+    # A forced reindex over existing rows must update the FTS index in place
+    incremental_db.index_all_workflows(force_reindex=True)
+    bulk_db.index_all_workflows()
+    bulk_db.index_all_workflows(bulk=True)
+
+    assert fetch_rows(incremental_db) == fetch_rows(bulk_db)
+    assert fetch_children(incremental_db) == fetch_children(bulk_db)
+    for db in (incremental_db, bulk_db):
+        conn = sqlite3.connect(db.db_path)
+        conn.execute(
+            "INSERT INTO workflows_fts(workflows_fts, rank) VALUES ('integrity-check', 1)"
+        )
+        triggers = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchone()[0]
+        conn.close()
+        assert triggers == 4
+
+
+def test_analyze_nodes_classification():
+    db = WorkflowDatabase.__new__(WorkflowDatabase)
+    nodes = [
+        {"type": "n8n-nodes-base.scheduleTrigger", "name": "Every Day"},
+        # Name hints win over the node type, earliest mapping key first
+        {"type": "n8n-nodes-base.httpRequest", "name": "Post to Slack and Gmail"},
+        # "cal" must not match calculation nodes
+        {"type": "n8n-nodes-base.code", "name": "Calculation step"},
+        {"type": "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter", "name": "x"},
+        {"type": "@n8n/n8n-nodes-langchain.lmChatOpenAi", "name": "Model"},
+    ]
+    trigger_type, integrations = db.analyze_nodes(nodes)
+    assert trigger_type == "Scheduled"
+    assert integrations == {"Slack", "YouTube", "Lmchatopenai"}
+
+    webhook_nodes = nodes + [{"type": "n8n-nodes-base.set", "name": "Webhook data"}]
+    assert db.analyze_nodes(webhook_nodes)[0] == "Webhook"
+
+
+@pytest.mark.parametrize("parser", sorted(workflow_db.WORKFLOW_PARSERS))
+def test_workflow_parsers_agree(tmp_path, sample_workflows, parser):
+    reference = make_db(tmp_path, sample_workflows, "reference.db")
+    reference.json_parser = "json"
+    db = make_db(tmp_path, sample_workflows, f"{parser}.db")
+    db.json_parser = parser
+
+    reference.index_all_workflows()
+    db.index_all_workflows(workers=2)
+
+    assert fetch_rows(reference) == fetch_rows(db)
+
+
+def test_integration_and_node_type_filters(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+
+    workflows, total = db.search_workflows(integration_filter="telegram", limit=1000)
+    assert total == len(workflows) > 0
+    assert all("Telegram" in w["integrations"] for w in workflows)
+
+    workflows, total = db.search_workflows(
+        node_type_filter="n8n-nodes-base.telegram", limit=1000
+    )
+    assert total > 0
+
+    workflows, total = db.search_by_category("messaging", limit=1000)
+    messaging = set(db.get_service_categories()["messaging"])
+    assert total == len(workflows) > 0
+    assert all(messaging & set(w["integrations"]) for w in workflows)
+
+
+def test_graphs_are_stored_per_file_hash(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+
+    path = max(sample_workflows.rglob("*.json"), key=lambda p: p.stat().st_size)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    file_hash = db.get_workflow_file_hash(path.name)
+
+    graph = db.get_workflow_graph(file_hash)
+    assert [node["name"] for node in graph["nodes"]] == [
+        node["name"] for node in data["nodes"]
+    ]
+    assert graph["connections"] == workflow_db.slim_connections(data["connections"])
+
+    # Editing the file replaces its graph and the old one is pruned
+    path.write_text(json.dumps({**data, "nodes": data["nodes"][:1]}), encoding="utf-8")
+    db.index_all_workflows()
+    new_hash = db.get_workflow_file_hash(path.name)
+    assert new_hash != file_hash
+    assert len(db.get_workflow_graph(new_hash)["nodes"]) == 1
+    assert db.get_workflow_graph(file_hash) is None
+
+
+def test_snapshot_is_served_read_only(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    snapshot_path = str(tmp_path / "snapshot.db")
+    db.build_snapshot(snapshot_path)
+
+    snapshot = WorkflowDatabase(snapshot_path, read_only=True)
+    assert snapshot.get_stats()["total"] == db.get_stats()["total"]
+    assert snapshot.search_workflows("telegram") == db.search_workflows("telegram")
+
+    conn = sqlite3.connect(snapshot_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    conn.close()
+
+    # Indexing is refused and the file is never written to
+    mtime = Path(snapshot_path).stat().st_mtime_ns
+    assert snapshot.index_all_workflows(force_reindex=True)["processed"] == 0
+    with pytest.raises(sqlite3.OperationalError):
+        with snapshot._reader() as conn:
+            conn.execute("DELETE FROM workflows")
+    assert Path(snapshot_path).stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_index_profile_records_phases_and_files(tmp_path, sample_workflows, workers):
+    db = make_db(tmp_path, sample_workflows)
+    profile = IndexProfile()
+    stats = db.index_all_workflows(workers=workers, profile=profile)
+
+    assert db.profile is None
+    assert len(profile.files) == stats["processed"] > 0
+    assert set(FILE_PHASES) <= set(profile.phases)
+    assert {"scan", "stat", "write"} <= set(profile.phases)
+
+    report = profile.to_dict(top=5)
+    assert report["stats"] == stats
+    # Throughput is measured over indexing, before embeddings are built
+    assert report["index_seconds"] <= (
+        report["elapsed_seconds"] - profile.phases.get("embed", 0.0)
+    )
+    slowest = [f["seconds"] for f in report["slowest_files"]]
+    assert len(slowest) == 5 and slowest == sorted(slowest, reverse=True)
+    json.dumps(report)
+
+
+def test_read_pool_reuses_connections_across_threads(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+
+    def search(_):
+        return db.search_workflows("telegram", limit=5)[1]
+
+    acquired = db.pool_metrics()["acquired"]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        totals = set(executor.map(search, range(200)))
+
+    assert len(totals) == 1
+    metrics = db.pool_metrics()
+    assert metrics["acquired"] - acquired == 200
+    assert metrics["in_use"] == 0
+    assert metrics["open"] <= metrics["size"]
+
+    # Pooled readers are query-only but still see the writer's commits
+    with db._reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM workflows")
+    removed = next(sample_workflows.rglob("*.json"))
+    removed.unlink()
+    db.index_all_workflows()
+    assert db.get_workflow_file_hash(removed.name) is None
+
+
+def test_index_generation_invalidates_search_cache(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    cache = workflow_db.SearchResultCache(max_entries=2)
+
+    generation = db.get_index_generation()
+    assert generation == 1
+    result = db.search_workflows("telegram", limit=5)
+    cache.put("telegram", generation, result, rows=len(result[0]))
+    assert cache.get("telegram", generation) is result
+
+    # A no-op run doesn't invalidate; a real change does
+    db.index_all_workflows()
+    assert db.get_index_generation() == generation
+    next(sample_workflows.rglob("*.json")).unlink()
+    db.index_all_workflows()
+    assert db.get_index_generation() == generation + 1
+    assert cache.get("telegram", db.get_index_generation()) is None
+
+    for key in ("a", "b", "c"):
+        cache.put(key, generation + 1, ([], 0))
+    assert cache.get("a", generation + 1) is None
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["evictions"], metrics["invalidations"]) == (1, 1, 1)
+
+
+def test_estimated_total_is_capped_lower_bound(tmp_path, sample_workflows, monkeypatch):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    monkeypatch.setattr(workflow_db, "TOTAL_ESTIMATE_CAP", 10)
+
+    workflows, exact = db.search_workflows(limit=5)
+    estimated_workflows, estimate = db.search_workflows(limit=5, exact_total=False)
+    assert estimated_workflows == workflows
+    assert exact > 10 and estimate == workflow_db.total_estimate_cap(5) == 10
+
+    # Deep pages always count at least one row past the page
+    _, estimate = db.search_workflows(limit=5, offset=20, exact_total=False)
+    assert estimate == 26
+
+    # Result sets smaller than the cap are counted exactly either way
+    _, exact = db.search_workflows("telegram", limit=200)
+    assert db.search_workflows("telegram", limit=200, exact_total=False)[1] == exact
+
+
+def collect_cursor_pages(search, limit, ranked=False):
+    workflows, cursor = [], None
+    while True:
+        page, _ = search(limit=limit, cursor=cursor)
+        workflows += page
+        if len(page) < limit:
+            return workflows
+        cursor = workflow_db.encode_cursor(page[-1], ranked)
+
+
+@pytest.mark.parametrize("query", ["", "telegram"])
+def test_cursor_pages_match_offset_pages(tmp_path, sample_workflows, query):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    # Split analyzed_at so cursors cross from one timestamp to the next
+    conn = sqlite3.connect(db.db_path)
+    conn.execute(
+        "UPDATE workflows SET analyzed_at = '2000-01-01 00:00:00' WHERE id % 3 = 0"
+    )
+    conn.commit()
+    conn.close()
+
+    everything, total = db.search_workflows(query, limit=1000)
+    assert 7 < total == len(everything)
+    search = functools.partial(db.search_workflows, query)
+    assert collect_cursor_pages(search, limit=7, ranked=bool(query)) == everything
+
+    offset_pages = []
+    for offset in range(0, total, 7):
+        offset_pages += db.search_workflows(query, limit=7, offset=offset)[0]
+    assert offset_pages == everything
+
+    category = "messaging"
+    everything, _ = db.search_by_category(category, limit=1000)
+    search = functools.partial(db.search_by_category, category)
+    assert everything and collect_cursor_pages(search, limit=3) == everything
+
+    with pytest.raises(ValueError):
+        db.search_workflows(query, cursor="not-a-cursor")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("telegram", '"telegram"*'),
+        ("google-sheets", '"google sheets"*'),
+        ('"send email" sl', '"send email" "sl"*'),
+        ('"send email"', '"send email"'),
+        ('name:slack OR x', 'name:"slack" "OR" "x"'),
+        ('bogus:"a b', '"bogus a b"'),
+        ('" - *', ""),
+    ],
+)
+def test_compile_fts_query(text, expected):
+    assert workflow_db.compile_fts_query(text) == expected
+
+
+def test_search_is_safe_and_column_weighted(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+
+    for text in ['"', "foo-", "AND", "NEAR(", "tele*", "a:b:c", ")(", "'"]:
+        db.search_workflows(text)
+
+    # Prefixes are served by the prefix indexes and match whole words
+    assert db.search_workflows("telegr", limit=1000)[1] == (
+        db.search_workflows("telegram", limit=1000)[1]
+    )
+    workflows, _ = db.search_workflows("telegram", limit=5)
+    assert all("telegram" in w["name"].lower() for w in workflows)
+
+
+def test_misspelled_search_falls_back_to_trigrams(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    index = db.get_trigram_index()
+    assert index.similar("telgram")[0][0] == "telegram"
+    assert index.is_known("telegr", prefix=True) and not index.is_known("telegr")
+
+    # Corrections are whole words, like a closed quote
+    for typo, text in [("telgram", '"telegram"'), ("telegarm bot", '"telegram" bot')]:
+        assert db.search_workflows(typo, limit=1000) == (
+            db.search_workflows(text, limit=1000)
+        )
+        assert db.search_ids(typo) and db.search_ids(typo) == db.search_ids(text)
+    assert db.search_workflows("name:telgram")[1] == (
+        db.search_workflows('name:"telegram"')[1]
+    )
+    # Nothing close enough means no results, not a guess
+    assert db.search_workflows("telgram qxzvw") == ([], 0)
+
+
+def test_suggest_index_ranks_terms_by_frequency(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    index = SuggestIndex(db.get_suggestion_terms(), db.get_index_generation())
+
+    suggestions = index.suggest("Tel", limit=5)
+    assert suggestions[0] == {
+        "text": "Telegram",
+        "kind": "integration",
+        "count": db.search_workflows(integration_filter="Telegram")[1],
+    }
+    counts = [s["count"] for s in suggestions]
+    assert counts == sorted(counts, reverse=True)
+
+    # Words inside a term match too, and short prefixes agree with long ones
+    assert any(s["kind"] == "node_type" for s in index.suggest("telegram", 25))
+    assert index.suggest("t", 25)[:3] == index.suggest("t", 3)
+    assert index.suggest("  ", 5) == [] and index.suggest("zzzzq", 5) == []
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"trigger_filter": "Webhook", "complexity_filter": "high"},
+        {"integration_filter": "TELEGRAM", "active_only": True},
+        {"node_type_filter": "n8n-nodes-base.code", "min_nodes": 3},
+        {"min_nodes": 5, "max_nodes": 10},
+        {"integration_filter": "no-such-integration"},
+    ],
+)
+def test_catalog_matches_database_search(tmp_path, sample_workflows, filters):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    catalog = WorkflowCatalog.from_database(db)
+
+    for offset in (0, 7, 500):
+        assert catalog.search(limit=7, offset=offset, **filters) == (
+            db.search_workflows(limit=7, offset=offset, **filters)
+        )
+    page, _ = db.search_workflows(limit=7, **filters)
+    if page:
+        cursor = workflow_db.encode_cursor(page[-1], ranked=False)
+        assert catalog.search(limit=7, cursor=cursor, **filters) == (
+            db.search_workflows(limit=7, cursor=cursor, **filters)
+        )
+    assert catalog.search(category="messaging", limit=50) == (
+        db.search_by_category("messaging", limit=50)
+    )
+
+
+def test_embeddings_find_similar_workflows(tmp_path, sample_workflows):
+    pytest.importorskip("numpy")
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    vectors = db.get_vector_index()
+    assert len(vectors) == db.get_stats()["total"]
+    assert vectors.generation == db.get_index_generation()
+
+    filename = db.search_workflows('"telegram"', limit=1)[0][0]["filename"]
+    similar = db.similar_workflows(filename, limit=5)
+    assert len(similar) == 5 and filename not in [w["filename"] for w in similar]
+    scores = [w["similarity"] for w in similar]
+    assert scores == sorted(scores, reverse=True) and scores[0] > 0.5
+    assert db.similar_workflows("missing.json") is None
+
+    # Hybrid search keeps the keyword matches and respects filters
+    keyword_ids = db.search_ids('"telegram"', trigger_filter="Webhook")
+    ranked = db.semantic_search_ids("telegram", trigger_filter="Webhook")
+    assert set(keyword_ids) <= set(ranked) <= set(db.search_ids(trigger_filter="Webhook"))
+    workflows, total = db.semantic_search("telegram", limit=5, offset=5)
+    assert total >= 10 and [w["id"] for w in workflows] == (
+        db.semantic_search_ids("telegram")[5:10]
+    )
+
+
+def test_sync_paths_updates_embeddings(tmp_path, sample_workflows):
+    pytest.importorskip("numpy")
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    source = next(sample_workflows.glob("Telegram/*.json"))
+    added = source.with_name("synced_copy.json")
+    shutil.copy(source, added)
+
+    db.sync_paths([str(added)])
+    assert db.get_vector_index().generation == db.get_index_generation()
+    similar = db.similar_workflows("synced_copy.json", limit=5)
+    assert similar[0]["similarity"] > 0.99
+    assert source.name in [w["filename"] for w in similar]
+
+
+def test_live_catalog_is_replaced_after_reindex(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    live = LiveCatalog(db)
+    catalog = live.refresh()
+    assert live.current() is catalog and catalog.memory_bytes() > 0
+
+    next(sample_workflows.rglob("*.json")).unlink()
+    db.index_all_workflows()
+    live.refresh_in_background = lambda: None
+    assert live.current() is None
+
+    fresh = live.refresh()
+    assert live.current() is fresh and fresh.size == catalog.size - 1
+
+
+@pytest.mark.parametrize(
+    "query, filters",
+    [("", {}), ("telegram", {}), ("", {"trigger_filter": "Webhook"}), ('"', {})],
+)
+def test_facets_from_sql_and_bitmaps_agree(tmp_path, sample_workflows, query, filters):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    catalog = WorkflowCatalog.from_database(db)
+
+    facets = db.search_facets(query, top_integrations=5, **filters)
+    rows = catalog.rows_for_ids(db.search_ids(query, **filters))
+    assert catalog.facets(rows, top_integrations=5) == facets
+    if not query:
+        assert catalog.matching_rows(**filters) == rows
+
+    _, total = db.search_workflows(query, **filters)
+    assert sum(facets["trigger_type"].values()) == total
+    assert len(facets["integration"]) <= 5
+    counts = list(facets["integration"].values())
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_index_version_changes_with_each_index_run(tmp_path, sample_workflows):
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    instance, generation, modified = db.get_index_version()
+    assert instance and generation and modified
+
+    next(sample_workflows.rglob("*.json")).unlink()
+    db.index_all_workflows()
+    assert db.get_index_version()[:2] == (instance, generation + 1)
+    other = make_db(tmp_path, sample_workflows, name="other.db")
+    assert other.get_index_version()[0] != instance
+
+
+LAST_MODIFIED = "Sun, 18 Oct 2026 10:00:00 GMT"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, if_modified_since, expected",
+    [
+        ('W/"7-3"', None, True),
+        ('"7-3"', None, True),
+        ('W/"1-2", W/"7-3"', None, True),
+        ("*", None, True),
+        ('W/"7-2"', LAST_MODIFIED, False),
+        (None, LAST_MODIFIED, True),
+        (None, "Sun, 18 Oct 2026 09:59:59 GMT", False),
+        (None, "not a date", False),
+        (None, None, False),
+    ],
+)
+def test_conditional_get(if_none_match, if_modified_since, expected):
+    headers = http_cache.cache_headers(
+        http_cache.etag(7, 3),
+        http_cache.timestamp_seconds("2026-10-18 10:00:00"),
+        http_cache.INDEX_CACHE_CONTROL,
+    )
+    assert headers["ETag"] == 'W/"7-3"' and headers["Last-Modified"] == LAST_MODIFIED
+    assert http_cache.not_modified(if_none_match, if_modified_since, headers) is expected
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, available, expected",
+    [
+        ("gzip, deflate, br, zstd", ["br", "zstd", "gzip"], "br"),
+        ("gzip, deflate, br, zstd", ["zstd", "gzip"], "zstd"),
+        ("gzip;q=1, br;q=0.5", ["br", "gzip"], "gzip"),
+        ("br;q=0, *", ["br", "gzip"], "gzip"),
+        ("identity", ["br", "gzip"], None),
+        (None, ["gzip"], None),
+    ],
+)
+def test_choose_encoding(accept_encoding, available, expected):
+    assert precompressed.choose_encoding(accept_encoding, available) == expected
+
+
+def test_index_writes_compressed_variants(tmp_path, sample_workflows):
+    workflows_dir = tmp_path / "few"
+    workflows_dir.mkdir()
+    for source in sorted(sample_workflows.rglob("*.json"))[:4]:
+        shutil.copy(source, workflows_dir / source.name)
+    db = make_db(tmp_path, workflows_dir)
+    db.precompress = True
+    db.index_all_workflows()
+
+    store = precompressed.CompressedStore(
+        precompressed.compressed_store_path(db.db_path)
+    )
+    decompress = {"gzip": gzip.decompress}
+    if precompressed.brotli is not None:
+        decompress["br"] = precompressed.brotli.decompress
+    if precompressed.zstandard is not None:
+        decompress["zstd"] = precompressed.zstandard.ZstdDecompressor().decompress
+    files = sorted(workflows_dir.iterdir())
+    for path in files:
+        workflow = db.get_workflow_by_filename(path.name)
+        base_path = store.base_path(workflow["file_hash"])
+        assert set(precompressed.stored_encodings(base_path)) == set(decompress)
+        for encoding, suffix in precompressed.ENCODING_SUFFIXES.items():
+            if encoding in decompress:
+                data = Path(base_path + suffix).read_bytes()
+                assert decompress[encoding](data) == path.read_bytes()
+
+    removed_hash = db.get_workflow_file_hash(files[0].name)
+    files[0].unlink()
+    db.index_all_workflows()
+    assert precompressed.stored_encodings(store.base_path(removed_hash)) == []
+
+
+def test_incompressible_files_are_compressed_once(tmp_path):
+    source = tmp_path / "random.json"
+    source.write_bytes(os.urandom(4000))
+    file_hash = hashlib.md5(source.read_bytes()).hexdigest()
+    store = precompressed.CompressedStore(str(tmp_path / "store"))
+
+    assert store.missing(file_hash)
+    assert store.add_file(file_hash, str(source))
+    assert not store.missing(file_hash)
+    assert precompressed.stored_encodings(store.base_path(file_hash)) == []
+    assert store.prune(set()) == len(precompressed.available_encodings())
+
+
+def test_precompress_directory_replaces_stale_variants(tmp_path):
+    asset = tmp_path / "index.html"
+    asset.write_text("<p>workflow</p>\n" * 200)
+    assert precompressed.precompress_directory(str(tmp_path)) == len(
+        precompressed.available_encodings()
+    )
+    assert precompressed.precompress_directory(str(tmp_path)) == 0
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == (
+        asset.read_bytes()
+    )
+
+    asset.write_text("<p>tiny</p>")
+    os.utime(asset, (time.time() + 10, time.time() + 10))
+    precompressed.precompress_directory(str(tmp_path))
+    assert precompressed.stored_encodings(str(asset)) == []
+
+
+@pytest.fixture
+def api(tmp_path, sample_workflows, monkeypatch):
+    """api_server serving an indexed sample database."""
+    pytest.importorskip("fastapi")
+    monkeypatch.setenv("WORKFLOW_DB_PATH", str(tmp_path / "import.db"))
+    api_server = importlib.import_module("api_server")
+    db = make_db(tmp_path, sample_workflows)
+    db.index_all_workflows()
+    live_catalog = LiveCatalog(db)
+    live_catalog.refresh()
+    monkeypatch.setattr(api_server, "db", db)
+    monkeypatch.setattr(api_server, "live_catalog", live_catalog)
+    monkeypatch.setattr(api_server, "search_cache", workflow_db.SearchResultCache())
+    return api_server
+
+
+@pytest.mark.parametrize("path", ["/api/stats", "/api/workflows?q=telegram"])
+def test_index_responses_are_revalidated(api, path):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(api.app)
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == http_cache.INDEX_CACHE_CONTROL
+    tag = response.headers["ETag"]
+
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["ETag"] == tag
+
+    # Any index change yields a new ETag, so stale copies are replaced
+    filename = api.db.search_workflows('"telegram"', limit=1)[0][0]["filename"]
+    workflow = api.db.get_workflow_by_filename(filename)
+    Path(api.db.workflows_dir, workflow["path"]).unlink()
+    api.db.index_all_workflows()
+    response = client.get(path, headers={"If-None-Match": tag})
+    assert response.status_code == 200 and response.headers["ETag"] != tag
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/workflows?per_page=100",
+        "/api/workflows?q=telegram&facets=true",
+        "/api/workflows?q=send+a+message&mode=semantic",
+        "/api/workflows?q=nothingmatchesthis",
+        "/api/workflows/category/messaging?per_page=100",
+    ],
+)
+def test_search_responses_keep_their_schema(api, path):
+    from fastapi.testclient import TestClient
+
+    response = TestClient(api.app).get(path)
+    assert response.status_code == 200
+    body = response.json()
+    # Exactly the document SearchResponse would produce: no missing or extra
+    # fields, and no values the model would have converted
+    assert api.SearchResponse.model_validate(body).model_dump(mode="json") == body
+    assert body["workflows"] or "nothing" in path
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/workflows?exact_total=false&page=60&per_page=100",
+        "/api/workflows/category/messaging?exact_total=false&page=60&per_page=100",
+    ],
+)
+def test_catalog_totals_are_exact(api, path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    # Past the estimate cap, only an exact count may report total_exact
+    monkeypatch.setattr(api, "total_estimate_cap", lambda limit: 0)
+    body = TestClient(api.app).get(path).json()
+    assert body["total"] > 0 and body["total_exact"] is True
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Typo-Tolerant Term Index
+In-memory trigram index over the search vocabulary, used to find the known
+words closest to a misspelled one when a search matches nothing as typed.
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Tuple
+
+# As in pg_trgm: words sharing less than this are not taken for a typo
+SIMILARITY_THRESHOLD = 0.3
+MAX_CORRECTIONS = 3
+# Corrections much less similar than the best one only add noise
+CORRECTION_SPREAD = 0.8
+# Shorter words have too few trigrams to compare meaningfully
+MIN_TERM_LEN = 3
+
+
+def trigrams(word: str) -> frozenset:
+    """Trigrams of word, padded so that its first letters count the most."""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to correction terms.
+
+    Similarity is the Jaccard index of two words' trigram sets, so
+    "telgram" is 0.55 similar to "telegram" and "gogle" 0.62 to "google".
+    """
+
+    def __init__(
+        self,
+        terms: Iterable[Tuple[str, int]],
+        vocabulary: Iterable[str],
+        generation: int = 0,
+    ):
+        """Build from (term, document count) correction candidates.
+
+        vocabulary is every searchable word, which is never corrected.
+        """
+        self.generation = generation
+        self._vocabulary = sorted(set(vocabulary))
+
+        counts: Dict[str, int] = {}
+        for term, count in terms:
+            if len(term) >= MIN_TERM_LEN and not term.isdigit():
+                counts[term] = counts.get(term, 0) + count
+        self._terms: List[Tuple[str, int, int]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for term_id, (term, count) in enumerate(sorted(counts.items())):
+            grams = trigrams(term)
+            self._terms.append((term, count, len(grams)))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(term_id)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def is_known(self, word: str, prefix: bool = False) -> bool:
+        """Whether word (or, with prefix, any word starting with it) is searchable."""
+        i = bisect.bisect_left(self._vocabulary, word)
+        if i == len(self._vocabulary):
+            return False
+        found = self._vocabulary[i]
+        return found.startswith(word) if prefix else found == word
+
+    def similar(
+        self, word: str, limit: int = MAX_CORRECTIONS
+    ) -> List[Tuple[str, float]]:
+        """Terms most similar to word, with their similarity, best first.
+
+        Ties go to the term found in more workflows.
+        """
+        if len(word) < MIN_TERM_LEN:
+            return []
+        grams = trigrams(word)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        scored = []
+        for term_id, overlap in shared.items():
+            term, count, size = self._terms[term_id]
+            score = overlap / (len(grams) + size - overlap)
+            if score >= SIMILARITY_THRESHOLD:
+                scored.append((-score, -count, term))
+        scored.sort()
+        if not scored:
+            return []
+        cutoff = -scored[0][0] * CORRECTION_SPREAD
+        return [
+            (term, -score) for score, _, term in scored[:limit] if -score >= cutoff
+        ]
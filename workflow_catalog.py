@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+In-Memory Workflow Catalog
+Columnar copy of the workflows table with a bitmap per filter value, so
+filter-only searches are bitwise ANDs instead of SQLite queries.
+"""
+
+import bisect
+import sys
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from workflow_db import (
+    FACET_TOP_INTEGRATIONS,
+    WorkflowDatabase,
+    decode_cursor,
+    facet_counts,
+)
+
+# Fields with at most this many distinct values (and repeats) are stored as
+# codes into a table of shared values
+MAX_INTERNED_VALUES = 1 << 16
+# Set bits are located a chunk of this many bytes (256 rows) at a time
+_CHUNK_BYTES = 32
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count  # noqa: F811
+
+
+def _bitmap(positions: List[int], size: int) -> int:
+    """An int with the given bit positions set."""
+    raw = bytearray((size + 7) // 8)
+    for position in positions:
+        raw[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(raw, "little")
+
+
+def _set_bits(bitmap: int, skip: int, limit: int) -> List[int]:
+    """Positions of the first `limit` set bits of bitmap after `skip` of them."""
+    positions: List[int] = []
+    if limit <= 0 or not bitmap:
+        return positions
+
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for start in range(0, len(raw), _CHUNK_BYTES):
+        chunk = int.from_bytes(raw[start : start + _CHUNK_BYTES], "little")
+        count = _popcount(chunk)
+        if skip >= count:
+            skip -= count
+            continue
+
+        base = start * 8
+        while chunk:
+            low = chunk & -chunk
+            chunk ^= low
+            if skip:
+                skip -= 1
+                continue
+            positions.append(base + low.bit_length() - 1)
+            if len(positions) == limit:
+                return positions
+    return positions
+
+
+def _deep_size(value: Any, seen: set) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_deep_size(item, seen) for item in value)
+    return size
+
+
+class _Column:
+    """One field of every row: an int array, codes into shared values, or a list.
+
+    List values (integrations, tags) are held as tuples and handed out as
+    fresh lists.
+    """
+
+    def __init__(self, values: List[Any]):
+        self.is_list = bool(values) and isinstance(values[0], list)
+        if self.is_list:
+            values = [tuple(value) for value in values]
+
+        self.table: Optional[List[Any]] = None
+        if values and all(type(value) is int for value in values):
+            self.values: Any = array("q", values)
+            return
+
+        codes: Dict[Any, int] = {}
+        for value in values:
+            codes.setdefault(value, len(codes))
+        if len(codes) <= min(len(values) // 2, MAX_INTERNED_VALUES):
+            self.table = list(codes)
+            self.values = array("H", (codes[value] for value in values))
+        else:
+            self.values = values
+
+    def __getitem__(self, position: int) -> Any:
+        value = self.values[position]
+        if self.table is not None:
+            value = self.table[value]
+        return list(value) if self.is_list else value
+
+    def memory_bytes(self, seen: set) -> int:
+        size = _deep_size(self.values, seen)
+        if self.table is not None:
+            size += _deep_size(self.table, seen)
+        return size
+
+
+class WorkflowCatalog:
+    """Read-only, columnar snapshot of the indexed workflows.
+
+    Rows are kept in the default listing order (newest first) and row i is
+    bit i of every bitmap, so a filter combination is the AND of a few ints,
+    its total is a popcount and its page is the next few set bits. Row dicts
+    are only built for the page being returned, and match what
+    WorkflowDatabase.search_workflows returns for the same filters.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        workflows: List[Dict[str, Any]],
+        node_types: List[Tuple[int, str]],
+        categories: Dict[str, List[str]],
+    ):
+        self.generation = generation
+        self.size = len(workflows)
+        self._all = (1 << self.size) - 1
+
+        self._fields = list(workflows[0]) if workflows else []
+        self._columns = {
+            field: _Column([workflow[field] for workflow in workflows])
+            for field in self._fields
+        }
+        # (analyzed_at, id) ascending, i.e. rows in reverse, for cursors
+        self._sort_keys = [
+            (workflow["analyzed_at"] or "", workflow["id"])
+            for workflow in reversed(workflows)
+        ]
+
+        positions: Dict[str, Dict[Any, List[int]]] = {
+            "trigger_type": {},
+            "complexity": {},
+            "integration": {},
+            "node_type": {},
+        }
+        active = []
+        # Integrations are matched case-insensitively and shown by their
+        # first spelling in code point order, as in search_facets
+        self._integration_names: Dict[str, str] = {}
+        self._positions: Dict[int, int] = {}
+        for position, workflow in enumerate(workflows):
+            self._positions[workflow["id"]] = position
+            if workflow["active"] == 1:  # as SQLite compares it
+                active.append(position)
+            for field in ("trigger_type", "complexity"):
+                positions[field].setdefault(workflow[field], []).append(position)
+            for name in workflow["integrations"]:
+                key = name.lower()
+                shown = self._integration_names.get(key)
+                if shown is None or name < shown:
+                    self._integration_names[key] = name
+            for integration in {name.lower() for name in workflow["integrations"]}:
+                positions["integration"].setdefault(integration, []).append(position)
+        for workflow_id, node_type in node_types:
+            if workflow_id in self._positions:
+                rows = positions["node_type"].setdefault(node_type, [])
+                rows.append(self._positions[workflow_id])
+
+        self._active = _bitmap(active, self.size)
+        self._bitmaps = {
+            field: {value: _bitmap(rows, self.size) for value, rows in values.items()}
+            for field, values in positions.items()
+        }
+        self._bitmaps["category"] = {
+            category: self._any_integration(services)
+            for category, services in categories.items()
+        }
+
+        # Rows with node_count <= _node_counts[k] are _at_most[k]
+        node_counts: Dict[int, List[int]] = {}
+        for position, workflow in enumerate(workflows):
+            node_counts.setdefault(workflow["node_count"] or 0, []).append(position)
+        self._node_counts = sorted(node_counts)
+        self._at_most = []
+        raw = bytearray((self.size + 7) // 8)
+        for node_count in self._node_counts:
+            for position in node_counts[node_count]:
+                raw[position >> 3] |= 1 << (position & 7)
+            self._at_most.append(int.from_bytes(raw, "little"))
+
+    @classmethod
+    def from_database(cls, db: WorkflowDatabase) -> "WorkflowCatalog":
+        generation, workflows, node_types = db.get_catalog_rows()
+        return cls(generation, workflows, node_types, db.get_service_categories())
+
+    def _any_integration(self, services: List[str]) -> int:
+        rows = 0
+        for service in services:
+            rows |= self._bitmaps["integration"].get(service.lower(), 0)
+        return rows
+
+    def _rows_at_most(self, node_count: int) -> int:
+        k = bisect.bisect_right(self._node_counts, node_count)
+        return self._at_most[k - 1] if k else 0
+
+    def _start_after(self, cursor: str) -> int:
+        """First row position after the row an (unranked) cursor was made from."""
+        analyzed_at, workflow_id = decode_cursor(cursor, ranked=False)
+        older = bisect.bisect_left(self._sort_keys, (analyzed_at, workflow_id))
+        return self.size - older
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        return {field: self._columns[field][position] for field in self._fields}
+
+    def search(
+        self,
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], int]:
+        """Filter-only search_workflows (or search_by_category) from memory.
+
+        The total is always exact.
+        """
+        rows = self.matching_rows(
+            trigger_filter,
+            complexity_filter,
+            active_only,
+            integration_filter,
+            node_type_filter,
+            min_nodes,
+            max_nodes,
+            category,
+        )
+        total = _popcount(rows)
+        if cursor is not None:
+            start = self._start_after(cursor)
+            rows = rows >> start << start
+            offset = 0
+
+        positions = _set_bits(rows, offset, limit)
+        return [self._row(position) for position in positions], total
+
+    def matching_rows(
+        self,
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> int:
+        """Bitmap of the rows that pass the filters."""
+        rows = self._all
+        if active_only:
+            rows &= self._active
+        if trigger_filter != "all":
+            rows &= self._bitmaps["trigger_type"].get(trigger_filter, 0)
+        if complexity_filter != "all":
+            rows &= self._bitmaps["complexity"].get(complexity_filter, 0)
+        if integration_filter != "all":
+            rows &= self._bitmaps["integration"].get(integration_filter.lower(), 0)
+        if node_type_filter != "all":
+            rows &= self._bitmaps["node_type"].get(node_type_filter, 0)
+        if min_nodes is not None:
+            rows &= ~self._rows_at_most(min_nodes - 1)
+        if max_nodes is not None:
+            rows &= self._rows_at_most(max_nodes)
+        if category is not None:
+            rows &= self._bitmaps["category"].get(category, 0)
+        return rows
+
+    def rows_for_ids(self, workflow_ids: List[int]) -> int:
+        """Bitmap of the given workflows; ids the catalog doesn't have are skipped."""
+        positions = [
+            self._positions[workflow_id]
+            for workflow_id in workflow_ids
+            if workflow_id in self._positions
+        ]
+        return _bitmap(positions, self.size)
+
+    def facets(
+        self, rows: int, top_integrations: int = FACET_TOP_INTEGRATIONS
+    ) -> Dict[str, Dict[str, int]]:
+        """WorkflowDatabase.search_facets for a bitmap of rows, by popcounts."""
+        facets = {
+            field: facet_counts(
+                (value, _popcount(rows & bitmap))
+                for value, bitmap in self._bitmaps[field].items()
+            )
+            for field in ("trigger_type", "complexity", "category")
+        }
+        facets["integration"] = facet_counts(
+            (
+                (self._integration_names[key], _popcount(rows & bitmap))
+                for key, bitmap in self._bitmaps["integration"].items()
+            ),
+            top_integrations,
+        )
+        return facets
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the catalog's columns and bitmaps."""
+        seen: set = set()
+        size = sum(column.memory_bytes(seen) for column in self._columns.values())
+        size += _deep_size(self._sort_keys, seen)
+        size += sys.getsizeof(self._active)
+        size += sum(
+            sys.getsizeof(bitmap)
+            for values in self._bitmaps.values()
+            for bitmap in values.values()
+        )
+        size += sum(sys.getsizeof(bitmap) for bitmap in self._at_most)
+        return size
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "generation": self.generation,
+            "rows": self.size,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+class LiveCatalog:
+    """The WorkflowCatalog of a database, swapped for a new one after reindexing.
+
+    current() never returns a catalog for an older index generation. The
+    replacement is built on a background thread and swapped in with a single
+    assignment; until then current() returns None and callers use SQLite.
+    """
+
+    def __init__(self, db: WorkflowDatabase):
+        self.db = db
+        self.catalog: Optional[WorkflowCatalog] = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def current(self) -> Optional[WorkflowCatalog]:
+        catalog = self.catalog
+        if catalog is not None and catalog.generation == self.db.get_index_generation():
+            return catalog
+        self.refresh_in_background()
+        return None
+
+    def refresh(self) -> WorkflowCatalog:
+        """Build a catalog of the database as it is now and swap it in."""
+        catalog = WorkflowCatalog.from_database(self.db)
+        self.catalog = catalog
+        return catalog
+
+    def refresh_in_background(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        def rebuild():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Catalog rebuild failed: {e}")
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+
+        threading.Thread(target=rebuild, name="catalog-rebuild", daemon=True).start()
+
+    def metrics(self) -> Optional[Dict[str, int]]:
+        catalog = self.catalog
+        return catalog.metrics() if catalog is not None else None
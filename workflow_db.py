@@ -5,36 +5,944 @@ SQLite-based workflow indexer and search engine for instant performance.
 """
 
 import sqlite3
+import base64
+import contextlib
 import json
 import os
+import re
 import datetime
+import functools
 import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+import queue
+import secrets
+import shutil
+import zlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple,
+)
 from pathlib import Path
 
+from index_profile import IndexProfile, file_timer
+from precompressed import MIN_COMPRESS_SIZE, CompressedStore, compressed_store_path
+from trigram_index import TrigramIndex
+from workflow_embeddings import (
+    SEMANTIC_CANDIDATES,
+    VectorIndex,
+    document_tokens,
+    embeddings_available,
+    fuse_rankings,
+    vectors_path,
+)
+
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing while indexing
+    orjson = None
+
+# Files handed to a worker process per task, and rows committed per transaction
+INDEX_CHUNK_SIZE = 64
+INDEX_BATCH_SIZE = 500
+
+WORKFLOW_COLUMNS = (
+    "filename", "name", "workflow_id", "active", "description", "trigger_type",
+    "complexity", "node_count", "integrations", "tags", "created_at", "updated_at",
+    "file_hash", "file_size", "path",
+)
+
+WORKFLOW_INSERT_SQL = f"""
+    INSERT INTO {{table}} ({", ".join(WORKFLOW_COLUMNS)}, analyzed_at)
+    VALUES ({", ".join("?" for _ in WORKFLOW_COLUMNS)}, CURRENT_TIMESTAMP)
+"""
+
+# A true upsert rather than INSERT OR REPLACE: REPLACE deletes the old row
+# without firing workflows_ad, which leaves stale entries in workflows_fts.
+# DO UPDATE fires workflows_au instead and keeps the row id stable.
+UPSERT_WORKFLOW_SQL = WORKFLOW_INSERT_SQL.format(table="workflows") + (
+    " ON CONFLICT(filename) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in WORKFLOW_COLUMNS[1:])
+    + ", analyzed_at = excluded.analyzed_at"
+)
+
+
+# The only parts of a workflow file the indexer reads. Everything else (node
+# parameters, pinData, sticky note bodies, ...) is dropped right after parsing.
+INDEXED_WORKFLOW_FIELDS = (
+    "id", "name", "active", "tags", "createdAt", "updatedAt", "description",
+)
+INDEXED_NODE_FIELDS = ("type", "name", "typeVersion")
+
+# Bumped whenever init_database has to migrate existing data (PRAGMA user_version)
+SCHEMA_VERSION = 4
+
+# Read connections memory-map the database so that pooled connections (and,
+# for snapshots, replicas on one host) share the OS page cache instead of
+# copying pages into per-connection caches
+READ_MMAP_SIZE = 1 << 30
+READ_CACHE_KIB = 16 * 1024
+READ_CACHED_STATEMENTS = 256
+READ_POOL_SIZE = int(os.environ.get("WORKFLOW_DB_POOL_SIZE", "8"))
+READ_POOL_TIMEOUT = 10.0
+
+# search_workflows(exact_total=False) stops counting matches at this many
+# (or at the end of the requested page, if that is further)
+TOTAL_ESTIMATE_CAP = 1000
+COUNT_CACHE_ENTRIES = 512
+
+# Integrations listed in search facets, most common first
+FACET_TOP_INTEGRATIONS = 20
+
+# bm25() weight of each workflows_fts column, in table order
+FTS_COLUMN_WEIGHTS = {
+    "filename": 1.0,
+    "name": 10.0,
+    "description": 2.0,
+    "integrations": 6.0,
+    "tags": 4.0,
+}
+# Shortest last term that search-as-you-type matches as a prefix; 2 and 3
+# character prefixes are answered from the FTS prefix indexes
+FTS_MIN_PREFIX = 2
+
+# A user search term: optional `column:` then a "quoted phrase" (possibly
+# still unterminated while typing) or a bare word
+_FTS_TERM_RE = re.compile(r'(?:(\w+):)?(?:"([^"]*)("?)|(\S+))')
+# Runs of letters and digits, the tokens FTS5's unicode61 tokenizer keeps
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _parse_json_stdlib(raw: bytes) -> Any:
+    return json.loads(raw.decode("utf-8"))
+
+
+# Parsers for raw workflow file bytes, selectable via WORKFLOW_JSON_PARSER.
+# Each must raise json.JSONDecodeError/UnicodeDecodeError on invalid input
+# (orjson.JSONDecodeError subclasses json.JSONDecodeError).
+WORKFLOW_PARSERS = {"json": _parse_json_stdlib}
+if orjson is not None:
+    WORKFLOW_PARSERS["orjson"] = orjson.loads
+
+DEFAULT_WORKFLOW_PARSER = os.environ.get(
+    "WORKFLOW_JSON_PARSER", "orjson" if orjson is not None else "json"
+)
+
+
+def slim_workflow(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields of a parsed workflow that indexing uses."""
+    slim = {key: data[key] for key in INDEXED_WORKFLOW_FIELDS if key in data}
+    slim["nodes"] = [
+        {key: node[key] for key in INDEXED_NODE_FIELDS if key in node}
+        for node in data.get("nodes", [])
+    ]
+    slim["connections"] = slim_connections(data.get("connections", {}))
+    return slim
+
+
+def slim_connections(connections: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the "main" edges of a workflow's connections.
+
+    The result has the same shape generate_mermaid_diagram reads; outputs
+    that aren't lists become None so output indexes are preserved.
+    """
+    slim = {}
+    if not isinstance(connections, dict):
+        return slim
+    for source, source_connections in connections.items():
+        if not isinstance(source_connections, dict):
+            continue
+        main = source_connections.get("main")
+        if not isinstance(main, list):
+            continue
+        slim[source] = {
+            "main": [
+                [
+                    {"node": connection["node"]}
+                    for connection in output
+                    if isinstance(connection, dict) and "node" in connection
+                ]
+                if isinstance(output, list)
+                else None
+                for output in main
+            ]
+        }
+    return slim
+
+
+def encode_graph(nodes: List[Dict], connections: Dict) -> bytes:
+    """Pack a workflow's nodes (name/type) and connections for workflow_graphs."""
+    graph = {
+        "nodes": [
+            {key: node[key] for key in ("name", "type") if key in node}
+            for node in nodes
+        ],
+        "connections": connections,
+    }
+    return zlib.compress(json.dumps(graph, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_graph(blob: bytes) -> Dict[str, Any]:
+    """Inverse of encode_graph."""
+    data = zlib.decompress(blob)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def workflow_row(workflow_data: Dict[str, Any]) -> Tuple:
+    """Build the UPSERT_WORKFLOW_SQL parameters for an analyzed workflow."""
+    return (
+        workflow_data["filename"],
+        workflow_data["name"],
+        workflow_data["workflow_id"],
+        workflow_data["active"],
+        workflow_data["description"],
+        workflow_data["trigger_type"],
+        workflow_data["complexity"],
+        workflow_data["node_count"],
+        json.dumps(workflow_data["integrations"]),
+        json.dumps(workflow_data["tags"]),
+        workflow_data["created_at"],
+        workflow_data["updated_at"],
+        workflow_data["file_hash"],
+        workflow_data["file_size"],
+        workflow_data["path"],
+    )
+
+
+# Enhanced service mapping for better recognition, keyed by lowercased
+# node type suffix. None marks utility nodes excluded from integrations.
+SERVICE_MAPPINGS = {
+    # Messaging & Communication
+    "telegram": "Telegram",
+    "telegramTrigger": "Telegram",
+    "discord": "Discord",
+    "slack": "Slack",
+    "whatsapp": "WhatsApp",
+    "mattermost": "Mattermost",
+    "teams": "Microsoft Teams",
+    "rocketchat": "Rocket.Chat",
+    # Email
+    "gmail": "Gmail",
+    "mailjet": "Mailjet",
+    "emailreadimap": "Email (IMAP)",
+    "emailsendsmt": "Email (SMTP)",
+    "outlook": "Outlook",
+    # Cloud Storage
+    "googledrive": "Google Drive",
+    "googledocs": "Google Docs",
+    "googlesheets": "Google Sheets",
+    "dropbox": "Dropbox",
+    "onedrive": "OneDrive",
+    "box": "Box",
+    # Databases
+    "postgres": "PostgreSQL",
+    "mysql": "MySQL",
+    "mongodb": "MongoDB",
+    "redis": "Redis",
+    "airtable": "Airtable",
+    "notion": "Notion",
+    # Project Management
+    "jira": "Jira",
+    "github": "GitHub",
+    "gitlab": "GitLab",
+    "trello": "Trello",
+    "asana": "Asana",
+    "mondaycom": "Monday.com",
+    # AI/ML Services
+    "openai": "OpenAI",
+    "anthropic": "Anthropic",
+    "huggingface": "Hugging Face",
+    # Social Media
+    "linkedin": "LinkedIn",
+    "twitter": "Twitter/X",
+    "facebook": "Facebook",
+    "instagram": "Instagram",
+    # E-commerce
+    "shopify": "Shopify",
+    "stripe": "Stripe",
+    "paypal": "PayPal",
+    # Analytics
+    "googleanalytics": "Google Analytics",
+    "mixpanel": "Mixpanel",
+    # Calendar & Tasks
+    "googlecalendar": "Google Calendar",
+    "googletasks": "Google Tasks",
+    "cal": "Cal.com",
+    "calendly": "Calendly",
+    # Forms & Surveys
+    "typeform": "Typeform",
+    "googleforms": "Google Forms",
+    "form": "Form Trigger",
+    # Development Tools
+    "webhook": "Webhook",
+    "httpRequest": "HTTP Request",
+    "graphql": "GraphQL",
+    "sse": "Server-Sent Events",
+    # Utility nodes (exclude from integrations)
+    "set": None,
+    "function": None,
+    "code": None,
+    "if": None,
+    "switch": None,
+    "merge": None,
+    "split": None,
+    "stickynote": None,
+    "stickyNote": None,
+    "wait": None,
+    "schedule": None,
+    "cron": None,
+    "manual": None,
+    "stopanderror": None,
+    "noop": None,
+    "noOp": None,
+    "error": None,
+    "limit": None,
+    "aggregate": None,
+    "summarize": None,
+    "filter": None,
+    "sort": None,
+    "removeDuplicates": None,
+    "dateTime": None,
+    "extractFromFile": None,
+    "convertToFile": None,
+    "readBinaryFile": None,
+    "readBinaryFiles": None,
+    "executionData": None,
+    "executeWorkflow": None,
+    "executeCommand": None,
+    "respondToWebhook": None,
+}
+
+
+# Case-insensitive substring hints used to find services in custom node types
+CUSTOM_NODE_SERVICES = (
+    ("youtube", "YouTube"),
+    ("telegram", "Telegram"),
+    ("discord", "Discord"),
+    ("calcslive", "CalcsLive"),
+)
+
+
+def _compile_service_hints(exclude: Tuple[str, ...] = ()) -> "re.Pattern":
+    """Compile the mapping keys that can match a lowercased node name.
+
+    Keys with uppercase letters can never match and utility keys map to
+    None, so both are left out. The alternation keeps SERVICE_MAPPINGS
+    order and sits inside a lookahead, so findall() reports, for every
+    position, the highest-priority key starting there.
+    """
+    keys = [
+        re.escape(key)
+        for key, service in SERVICE_MAPPINGS.items()
+        if service and key == key.lower() and key not in exclude
+    ]
+    return re.compile(f"(?=({'|'.join(keys)}))")
+
+
+_SERVICE_PRIORITY = {key: priority for priority, key in enumerate(SERVICE_MAPPINGS)}
+_SERVICE_HINTS = _compile_service_hints()
+# Avoid false positive: "cal" in calcslive-related terms should not match "Cal.com"
+_SERVICE_HINTS_WITHOUT_CAL = _compile_service_hints(exclude=("cal",))
+_CAL_FALSE_POSITIVES = ("calcslive", "calc", "calculation")
+
+
+@functools.lru_cache(maxsize=None)
+def _classify_node_type(node_type: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (service, trigger contribution) for a node type.
+
+    The trigger contribution is "Webhook", "Scheduled", "Trigger" (a
+    non-manual trigger node, which counts as a webhook only while the
+    workflow is still considered manual) or None.
+    """
+    type_lower = node_type.lower()
+    if "webhook" in type_lower:
+        trigger = "Webhook"
+    elif "cron" in type_lower or "schedule" in type_lower:
+        trigger = "Scheduled"
+    elif "trigger" in type_lower and "manual" not in type_lower:
+        trigger = "Trigger"
+    else:
+        trigger = None
+
+    service_name = None
+
+    # Handle n8n-nodes-base nodes
+    if node_type.startswith("n8n-nodes-base."):
+        raw_service = node_type.replace("n8n-nodes-base.", "").lower()
+        raw_service = raw_service.replace("trigger", "")
+        service_name = SERVICE_MAPPINGS.get(
+            raw_service, raw_service.title() if raw_service else None
+        )
+
+    # Handle @n8n/ namespaced nodes
+    elif node_type.startswith("@n8n/"):
+        raw_service = node_type.split(".")[-1].lower() if "." in node_type else type_lower
+        raw_service = raw_service.replace("trigger", "")
+        service_name = SERVICE_MAPPINGS.get(
+            raw_service, raw_service.title() if raw_service else None
+        )
+
+    # Handle custom nodes like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
+    elif "-" in node_type or "@" in node_type:
+        for part in type_lower.split("."):
+            service_name = next(
+                (service for hint, service in CUSTOM_NODE_SERVICES if hint in part),
+                None,
+            )
+            if service_name:
+                break
+
+    return service_name, trigger
+
+
+@functools.lru_cache(maxsize=8192)
+def _service_from_node_name(node_name: str) -> Optional[str]:
+    """Service hinted at by a lowercased node name, if any.
+
+    Same result as checking every SERVICE_MAPPINGS key in order with `in`,
+    but done in one regex scan of the name.
+    """
+    if any(term in node_name for term in _CAL_FALSE_POSITIVES):
+        hints = _SERVICE_HINTS_WITHOUT_CAL
+    else:
+        hints = _SERVICE_HINTS
+    matches = hints.findall(node_name)
+    if not matches:
+        return None
+    return SERVICE_MAPPINGS[min(matches, key=_SERVICE_PRIORITY.__getitem__)]
+
+
+def compile_fts_query(text: str) -> str:
+    """Compile user search text into an FTS5 MATCH expression that can't fail.
+
+    Each word or "quoted phrase" becomes an FTS5 phrase of its letter and
+    digit runs, so quotes, hyphens and operators in the input are inert, and
+    terms are ANDed. A `column:` prefix naming a workflows_fts column limits
+    a term to that column. The last term, unless its quote was closed, also
+    matches as a prefix. Returns "" when the text has nothing to search for.
+    """
+    terms = []
+    prefix = False
+    for match in _FTS_TERM_RE.finditer(text):
+        column, quoted, closed, bare = match.groups()
+        words = quoted if quoted is not None else bare
+        if column is not None and column.lower() not in FTS_COLUMN_WEIGHTS:
+            words = f"{column} {words}"
+            column = None
+
+        tokens = _FTS_TOKEN_RE.findall(words)
+        if not tokens:
+            continue
+        phrase = '"' + " ".join(tokens) + '"'
+        terms.append(f"{column.lower()}:{phrase}" if column else phrase)
+        prefix = not closed and len(tokens[-1]) >= FTS_MIN_PREFIX
+
+    if terms and prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def compile_fuzzy_fts_query(text: str, index: TrigramIndex) -> str:
+    """Compile text like compile_fts_query, with misspelled words corrected.
+
+    Each word index doesn't know becomes an OR of the most similar known
+    terms, so "telgram" searches for "telegram". Phrases are loosened to
+    their words, ANDed, and `column:` prefixes still apply. Returns "" when
+    a word has nothing similar enough to stand in for it.
+    """
+    terms = []
+    prefix = False
+    for match in _FTS_TERM_RE.finditer(text):
+        column, quoted, closed, bare = match.groups()
+        words = quoted if quoted is not None else bare
+        if column is not None and column.lower() not in FTS_COLUMN_WEIGHTS:
+            words = f"{column} {words}"
+            column = None
+
+        tokens = _FTS_TOKEN_RE.findall(words.lower())
+        if not tokens:
+            continue
+        terms += [(column.lower() if column else None, token) for token in tokens]
+        prefix = not closed and len(tokens[-1]) >= FTS_MIN_PREFIX
+
+    expressions = []
+    for position, (column, token) in enumerate(terms, 1):
+        prefix_term = prefix and position == len(terms)
+        if index.is_known(token, prefix_term):
+            expression = f'"{token}"' + ("*" if prefix_term else "")
+        else:
+            similar = index.similar(token)
+            if not similar:
+                return ""
+            expression = "(" + " OR ".join(f'"{term}"' for term, _ in similar) + ")"
+        expressions.append(f"{column}:{expression}" if column else expression)
+    # FTS5 only ANDs bare phrases implicitly, not parenthesized groups
+    return " AND ".join(expressions)
+
+
+def clean_tags(raw_tags: List[Any]) -> List[str]:
+    """Tags as strings; n8n tag objects become their name (or id)."""
+    tags = []
+    for tag in raw_tags:
+        if isinstance(tag, dict):
+            # Extract name from tag dict if available
+            tags.append(tag.get("name", str(tag.get("id", "tag"))))
+        else:
+            tags.append(str(tag))
+    return tags
+
+
+def workflow_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """A search result from a workflows row, with its JSON columns parsed."""
+    workflow = dict(row)
+    workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+    workflow["tags"] = clean_tags(json.loads(workflow["tags"] or "[]"))
+    return workflow
+
+
+def facet_counts(
+    counts: Iterable[Tuple[Any, int]], top: Optional[int] = None
+) -> Dict[str, int]:
+    """Non-zero (value, count) pairs as a dict, most common first."""
+    ranked = sorted(
+        ((value, count) for value, count in counts if value is not None and count),
+        key=lambda item: (-item[1], item[0]),
+    )
+    return dict(ranked[:top])
+
+
+def total_estimate_cap(page_end: int) -> int:
+    """Where an estimated total stops counting for a page ending at page_end."""
+    return max(TOTAL_ESTIMATE_CAP, page_end + 1)
+
+
+def encode_cursor(workflow: Dict[str, Any], ranked: bool) -> str:
+    """Opaque cursor that resumes a listing after `workflow`.
+
+    Full-text (ranked) listings resume after (rank, id), the others after
+    (analyzed_at, id).
+    """
+    key = [workflow["rank"] if ranked else workflow["analyzed_at"], workflow["id"]]
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, ranked: bool) -> Tuple[Any, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, workflow_id = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    sort_types = (int, float) if ranked else (str,)
+    if (
+        not isinstance(sort_key, sort_types)
+        or isinstance(sort_key, bool)
+        or not isinstance(workflow_id, int)
+        or isinstance(workflow_id, bool)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return sort_key, workflow_id
+
+
+class ReadConnectionPool:
+    """Thread-safe pool of long-lived, query-only SQLite connections.
+
+    Connections are opened lazily, up to `size`, with their PRAGMAs applied
+    once. They are shared across threads, but each is only used by one
+    thread at a time.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        size: int = READ_POOL_SIZE,
+        timeout: float = READ_POOL_TIMEOUT,
+    ):
+        self._connect = connect
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+        self._in_use = 0
+        self._acquired = 0
+        self._waited = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available after {self.timeout}s "
+                f"(pool size {self.size})"
+            ) from None
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        start = time.perf_counter()
+        conn = self._acquire()
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._acquired += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            if waited > 1e-3:
+                self._waited += 1
+        try:
+            yield conn
+        finally:
+            conn.row_factory = None
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(conn)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool size, usage and time spent waiting for a connection."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": len(self._all),
+                "in_use": self._in_use,
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_max": self._max_wait_seconds,
+            }
+
+    def close(self):
+        with self._lock:
+            connections, self._all = self._all, []
+        for conn in connections:
+            conn.close()
+        self._idle = queue.LifoQueue()
+
+
+class SearchResultCache:
+    """LRU of search results, dropped whenever the index generation changes.
+
+    Bounded both by entry count and by the total number of cached rows.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_rows: int = 50_000):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_generation(self, generation: int):
+        if generation != self._generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._rows = 0
+            self._generation = generation
+
+    def get(self, key: Any, generation: int) -> Optional[Any]:
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Any, generation: int, value: Any, rows: int = 1):
+        if rows > self.max_rows:
+            return
+        with self._lock:
+            self._check_generation(generation)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= previous[1]
+            self._entries[key] = (value, rows)
+            self._rows += rows
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, (_, evicted_rows) = self._entries.popitem(last=False)
+                self._rows -= evicted_rows
+                self.evictions += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "max_entries": self.max_entries,
+                "max_rows": self.max_rows,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
 
 class WorkflowDatabase:
     """High-performance SQLite database for workflow metadata and search."""
 
-    def __init__(self, db_path: str = None):
+    # Key into WORKFLOW_PARSERS used by analyze_workflow_file
+    json_parser = DEFAULT_WORKFLOW_PARSER
+    # Set for the duration of index_all_workflows(profile=...)
+    profile: Optional[IndexProfile] = None
+    # Whether index runs write compressed variants of workflow files
+    precompress = True
+
+    def __init__(self, db_path: str = None, read_only: Optional[bool] = None):
         # Use environment variable if no path provided
         if db_path is None:
             db_path = os.environ.get("WORKFLOW_DB_PATH", "workflows.db")
+        if read_only is None:
+            read_only = os.environ.get("WORKFLOW_DB_READONLY", "").lower() in (
+                "true", "1", "yes",
+            )
         self.db_path = db_path
         self.workflows_dir = "workflows"
-        self.init_database()
+        self._read_pool: Optional[ReadConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._count_cache = SearchResultCache(max_entries=COUNT_CACHE_ENTRIES)
+        self._trigram_index: Optional[TrigramIndex] = None
+        self._trigram_lock = threading.Lock()
+        self._vector_index: Optional[VectorIndex] = None
+        self._vector_file: Optional[Tuple[int, int, int]] = None
+        self._vector_lock = threading.Lock()
+        # Read-only mode serves a prebuilt snapshot (see build_snapshot):
+        # no DDL, no migrations and no indexing
+        self.read_only = read_only
+        if read_only:
+            if not os.path.exists(db_path):
+                raise FileNotFoundError(f"Snapshot database not found: {db_path}")
+        else:
+            self.init_database()
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """Open a query-only connection for the read pool."""
+        if self.read_only:
+            # immutable=1 skips file locking and change detection entirely
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro&immutable=1"
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                check_same_thread=False,
+                cached_statements=READ_CACHED_STATEMENTS,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=READ_CACHED_STATEMENTS,
+            )
+        conn.execute(f"PRAGMA mmap_size={READ_MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{READ_CACHE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA query_only=1")
+        return conn
+
+    def _reader(self) -> ContextManager[sqlite3.Connection]:
+        """Borrow a connection from the read pool."""
+        if self._read_pool is None:
+            with self._pool_lock:
+                if self._read_pool is None:
+                    self._read_pool = ReadConnectionPool(self._connect_reader)
+        return self._read_pool.connection()
+
+    @contextlib.contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the single writer connection, serializing writes across threads."""
+        if self.read_only:
+            raise sqlite3.OperationalError("database is opened read-only")
+        with self._write_lock:
+            if self._write_conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=10000")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                self._write_conn = conn
+            try:
+                yield self._write_conn
+            finally:
+                if self._write_conn.in_transaction:
+                    self._write_conn.rollback()
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        """Read pool size and wait-time metrics (empty before the first query)."""
+        return self._read_pool.metrics() if self._read_pool is not None else {}
+
+    def close(self):
+        """Close pooled and writer connections."""
+        if self._read_pool is not None:
+            self._read_pool.close()
+            self._read_pool = None
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
 
     def init_database(self):
         """Initialize SQLite database with optimized schema and indexes."""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging for performance
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
+        # The writer connection enables WAL (write-ahead logging) on open
+        with self._writer() as conn:
+            self._init_schema(conn)
+            conn.commit()
 
+    def _init_schema(self, conn: sqlite3.Connection):
+        """Create tables, indexes and triggers, then migrate older data."""
         # Create main workflows table
+        self._create_workflows_table(conn)
+
+        # Create FTS5 table for full-text search
+        self._create_fts_table(conn)
+
+        # Stat manifest so unchanged files are skipped without being read
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_manifest (
+                path TEXT PRIMARY KEY,  -- relative to workflows_dir
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                file_hash TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+        # Normalized integrations and node types for indexed filtering
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_integrations (
+                workflow_id INTEGER NOT NULL,
+                integration TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (integration, workflow_id)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_nodes (
+                workflow_id INTEGER NOT NULL,
+                node_type TEXT NOT NULL,
+                type_version REAL,
+                count INTEGER NOT NULL
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_workflow_integrations_workflow "
+            "ON workflow_integrations(workflow_id, integration)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_workflow_nodes_type "
+            "ON workflow_nodes(node_type, workflow_id, type_version, count)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_workflow_nodes_workflow "
+            "ON workflow_nodes(workflow_id)"
+        )
+
+        # Pre-parsed nodes and connections, shared by identical files
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_graphs (
+                file_hash TEXT PRIMARY KEY,
+                graph BLOB NOT NULL  -- zlib-compressed JSON, see encode_graph
+            ) WITHOUT ROWID
+        """)
+
+        # Bumped on every committed index change, so caches know when to drop
         conn.execute("""
-            CREATE TABLE IF NOT EXISTS workflows (
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        # Random per database, so two databases at the same generation are
+        # still told apart (e.g. by HTTP validators, see get_index_version)
+        conn.execute(
+            "INSERT OR IGNORE INTO index_meta (key, value) VALUES ('instance', ?)",
+            (secrets.randbits(62),),
+        )
+
+        # Create indexes for fast filtering
+        self._create_workflow_indexes(conn)
+
+        # Create triggers to keep FTS and child tables in sync
+        self._create_fts_triggers(conn)
+        self._create_child_triggers(conn)
+
+        self._migrate(conn)
+
+        # Persisted in the FTS config, so `rank` applies the column weights
+        weights = ", ".join(str(weight) for weight in FTS_COLUMN_WEIGHTS.values())
+        conn.execute(
+            "INSERT INTO workflows_fts(workflows_fts, rank) VALUES ('rank', ?)",
+            (f"bm25({weights})",),
+        )
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Bring data in databases created by older versions up to date."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version < 1:
+            # Integrations can be backfilled from the JSON column right away
+            conn.execute("""
+                INSERT OR IGNORE INTO workflow_integrations (workflow_id, integration)
+                SELECT w.id, j.value FROM workflows w, json_each(w.integrations) j
+            """)
+
+        if version < 2:
+            # Node types (v1) and graphs (v2) need the files, so force the
+            # next index run to re-analyze everything
+            conn.execute("DELETE FROM workflow_manifest")
+            conn.execute("UPDATE workflows SET file_hash = NULL")
+
+        if version < 3:
+            # Recreate the full-text index with prefix indexes
+            conn.execute("DROP TABLE IF EXISTS workflows_fts")
+            self._create_fts_table(conn)
+            conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES ('rebuild')")
+
+        if version < 4:
+            # Workflow file paths, backfilled from the manifest
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(workflows)")}
+            if "path" not in columns:
+                conn.execute("ALTER TABLE workflows ADD COLUMN path TEXT")
+            paths = {}
+            for (path,) in conn.execute(
+                "SELECT path FROM workflow_manifest ORDER BY path DESC"
+            ):
+                paths[path.rsplit("/", 1)[-1]] = path
+            conn.executemany(
+                "UPDATE workflows SET path = ? WHERE filename = ?",
+                [(path, filename) for filename, path in paths.items()],
+            )
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @staticmethod
+    def _create_workflows_table(conn: sqlite3.Connection, table: str = "workflows"):
+        """Create the workflows table (or a same-shaped table for bulk loads)."""
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 filename TEXT UNIQUE NOT NULL,
                 name TEXT NOT NULL,
@@ -50,24 +958,31 @@ class WorkflowDatabase:
                 updated_at TEXT,
                 file_hash TEXT,
                 file_size INTEGER,
+                path TEXT,  -- relative to workflows_dir
                 analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
-        # Create FTS5 table for full-text search
-        conn.execute("""
+    @staticmethod
+    def _create_fts_table(conn: sqlite3.Connection):
+        """Create workflows_fts over the workflows table, and its vocabulary."""
+        conn.execute(f"""
             CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts USING fts5(
-                filename,
-                name,
-                description,
-                integrations,
-                tags,
+                {", ".join(FTS_COLUMN_WEIGHTS)},
                 content=workflows,
-                content_rowid=id
+                content_rowid=id,
+                prefix='2 3'
             )
         """)
+        # Per-column term statistics, the vocabulary for typo correction
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts_vocab "
+            "USING fts5vocab(workflows_fts, 'col')"
+        )
 
-        # Create indexes for fast filtering
+    @staticmethod
+    def _create_workflow_indexes(conn: sqlite3.Connection):
+        """Create the filtering indexes on the workflows table."""
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_trigger_type ON workflows(trigger_type)"
         )
@@ -79,8 +994,15 @@ class WorkflowDatabase:
             "CREATE INDEX IF NOT EXISTS idx_node_count ON workflows(node_count)"
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_filename ON workflows(filename)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_file_hash ON workflows(file_hash)")
+        # Serves the default listing order and its keyset cursors
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analyzed_at ON workflows(analyzed_at, id)"
+        )
 
-        # Create triggers to keep FTS table in sync
+    @staticmethod
+    def _create_fts_triggers(conn: sqlite3.Connection):
+        """Create the triggers that keep workflows_fts in sync with workflows."""
         conn.execute("""
             CREATE TRIGGER IF NOT EXISTS workflows_ai AFTER INSERT ON workflows BEGIN
                 INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
@@ -104,8 +1026,119 @@ class WorkflowDatabase:
             END
         """)
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _create_child_triggers(conn: sqlite3.Connection):
+        """Drop integration and node-type rows together with their workflow."""
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS workflows_children_ad AFTER DELETE ON workflows BEGIN
+                DELETE FROM workflow_integrations WHERE workflow_id = old.id;
+                DELETE FROM workflow_nodes WHERE workflow_id = old.id;
+            END
+        """)
+
+    @staticmethod
+    def _write_workflow_children(
+        conn: sqlite3.Connection, workflows_data: List[Dict[str, Any]]
+    ):
+        """Replace the integration, node-type and graph rows of stored workflows."""
+        if not workflows_data:
+            return
+        filenames = json.dumps([w["filename"] for w in workflows_data])
+        ids = dict(
+            conn.execute(
+                "SELECT filename, id FROM workflows "
+                "WHERE filename IN (SELECT value FROM json_each(?))",
+                (filenames,),
+            )
+        )
+        workflow_ids = [(ids[w["filename"]],) for w in workflows_data]
+        conn.executemany(
+            "DELETE FROM workflow_integrations WHERE workflow_id = ?", workflow_ids
+        )
+        conn.executemany("DELETE FROM workflow_nodes WHERE workflow_id = ?", workflow_ids)
+        conn.executemany(
+            "INSERT OR IGNORE INTO workflow_integrations (workflow_id, integration) "
+            "VALUES (?, ?)",
+            [
+                (ids[w["filename"]], integration)
+                for w in workflows_data
+                for integration in w["integrations"]
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO workflow_nodes (workflow_id, node_type, type_version, count) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (ids[w["filename"]], node_type, type_version, count)
+                for w in workflows_data
+                for node_type, type_version, count in w["node_types"]
+            ],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO workflow_graphs (file_hash, graph) VALUES (?, ?)",
+            [(w["file_hash"], w["graph"]) for w in workflows_data],
+        )
+
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection):
+        conn.execute("""
+            INSERT INTO index_meta (key, value) VALUES ('generation', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """)
+        conn.execute("""
+            INSERT INTO index_meta (key, value)
+            VALUES ('generation_time', CAST(strftime('%s', 'now') AS INTEGER))
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """)
+
+    def get_index_generation(self) -> int:
+        """Counter bumped whenever indexing commits changes to workflows."""
+        with self._reader() as conn:
+            return self._read_generation(conn)
+
+    def get_index_version(self) -> Tuple[int, int, Optional[int]]:
+        """(database instance id, generation, unix time of the last change).
+
+        The instance id tells apart databases built separately; both ids are 0
+        and the time None on databases that predate them.
+        """
+        with self._reader() as conn:
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM index_meta"))
+            except sqlite3.OperationalError:
+                # Read-only snapshot built before index_meta existed
+                meta = {}
+        return (
+            meta.get("instance", 0),
+            meta.get("generation", 0),
+            meta.get("generation_time"),
+        )
+
+    @staticmethod
+    def _read_generation(conn: sqlite3.Connection) -> int:
+        try:
+            row = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'generation'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # Read-only snapshot built before index_meta existed
+            return 0
+        return row[0] if row else 0
+
+    @staticmethod
+    def _prune_graphs(conn: sqlite3.Connection):
+        """Drop graphs no longer referenced by any workflow."""
+        conn.execute("""
+            DELETE FROM workflow_graphs WHERE file_hash NOT IN (
+                SELECT file_hash FROM workflows WHERE file_hash IS NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def _drop_fts_triggers(conn: sqlite3.Connection):
+        """Suspend FTS syncing, e.g. while bulk loading."""
+        for trigger in ("workflows_ai", "workflows_ad", "workflows_au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
 
     def get_file_hash(self, file_path: str) -> str:
         """Get MD5 hash of file for change detection."""
@@ -153,18 +1186,32 @@ class WorkflowDatabase:
 
         return " ".join(readable_parts)
 
-    def analyze_workflow_file(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Analyze a single workflow file and extract metadata."""
+    def analyze_workflow_file(
+        self, file_path: str, file_hash: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Analyze a single workflow file and extract metadata.
+
+        Pass file_hash when the caller has already hashed the file.
+        The file is read once; hashing and parsing share the same bytes.
+        """
+        timer = file_timer(self.profile)
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        timer.lap("read")
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            parse = WORKFLOW_PARSERS.get(self.json_parser, _parse_json_stdlib)
+            data = slim_workflow(parse(raw))
         except (json.JSONDecodeError, UnicodeDecodeError) as e:
             print(f"Error reading {file_path}: {str(e)}")
             return None
+        timer.lap("parse")
 
         filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = self.get_file_hash(file_path)
+        file_size = len(raw)
+        if file_hash is None:
+            file_hash = hashlib.md5(raw).hexdigest()
+            timer.lap("hash")
+        del raw
 
         # Extract basic metadata
         workflow = {
@@ -172,13 +1219,13 @@ class WorkflowDatabase:
             "name": self.format_workflow_name(filename),
             "workflow_id": data.get("id", ""),
             "active": data.get("active", False),
-            "nodes": data.get("nodes", []),
-            "connections": data.get("connections", {}),
+            "nodes": data["nodes"],
             "tags": data.get("tags", []),
             "created_at": data.get("createdAt", ""),
             "updated_at": data.get("updatedAt", ""),
             "file_hash": file_hash,
             "file_size": file_size,
+            "path": self._relative_path(file_path),
         }
 
         # Use JSON name if available and meaningful, otherwise use formatted filename
@@ -194,6 +1241,15 @@ class WorkflowDatabase:
         # Analyze nodes
         node_count = len(workflow["nodes"])
         workflow["node_count"] = node_count
+        node_types = Counter(
+            (node.get("type", ""), node.get("typeVersion"))
+            for node in workflow["nodes"]
+        )
+        workflow["node_types"] = [
+            (node_type, type_version, count)
+            for (node_type, type_version), count in node_types.items()
+            if node_type
+        ]
 
         # Determine complexity
         if node_count <= 5:
@@ -204,10 +1260,16 @@ class WorkflowDatabase:
             complexity = "high"
         workflow["complexity"] = complexity
 
+        workflow["graph"] = encode_graph(workflow["nodes"], data["connections"])
+
+        timer.lap("extract")
+
         # Find trigger type and integrations
         trigger_type, integrations = self.analyze_nodes(workflow["nodes"])
+        timer.lap("analyze_nodes")
         workflow["trigger_type"] = trigger_type
-        workflow["integrations"] = list(integrations)
+        # Sorted so the output doesn't depend on per-process string hashing
+        workflow["integrations"] = sorted(integrations)
 
         # Use JSON description if available, otherwise generate one
         json_description = data.get("description", "").strip()
@@ -215,9 +1277,12 @@ class WorkflowDatabase:
             workflow["description"] = json_description
         else:
             workflow["description"] = self.generate_description(
-                workflow, trigger_type, integrations
+                workflow, trigger_type, workflow["integrations"]
             )
+        timer.lap("describe")
 
+        if self.profile is not None:
+            workflow["timings"] = timer.phases
         return workflow
 
     def analyze_nodes(self, nodes: List[Dict]) -> Tuple[str, set]:
@@ -225,174 +1290,21 @@ class WorkflowDatabase:
         trigger_type = "Manual"
         integrations = set()
 
-        # Enhanced service mapping for better recognition
-        service_mappings = {
-            # Messaging & Communication
-            "telegram": "Telegram",
-            "telegramTrigger": "Telegram",
-            "discord": "Discord",
-            "slack": "Slack",
-            "whatsapp": "WhatsApp",
-            "mattermost": "Mattermost",
-            "teams": "Microsoft Teams",
-            "rocketchat": "Rocket.Chat",
-            # Email
-            "gmail": "Gmail",
-            "mailjet": "Mailjet",
-            "emailreadimap": "Email (IMAP)",
-            "emailsendsmt": "Email (SMTP)",
-            "outlook": "Outlook",
-            # Cloud Storage
-            "googledrive": "Google Drive",
-            "googledocs": "Google Docs",
-            "googlesheets": "Google Sheets",
-            "dropbox": "Dropbox",
-            "onedrive": "OneDrive",
-            "box": "Box",
-            # Databases
-            "postgres": "PostgreSQL",
-            "mysql": "MySQL",
-            "mongodb": "MongoDB",
-            "redis": "Redis",
-            "airtable": "Airtable",
-            "notion": "Notion",
-            # Project Management
-            "jira": "Jira",
-            "github": "GitHub",
-            "gitlab": "GitLab",
-            "trello": "Trello",
-            "asana": "Asana",
-            "mondaycom": "Monday.com",
-            # AI/ML Services
-            "openai": "OpenAI",
-            "anthropic": "Anthropic",
-            "huggingface": "Hugging Face",
-            # Social Media
-            "linkedin": "LinkedIn",
-            "twitter": "Twitter/X",
-            "facebook": "Facebook",
-            "instagram": "Instagram",
-            # E-commerce
-            "shopify": "Shopify",
-            "stripe": "Stripe",
-            "paypal": "PayPal",
-            # Analytics
-            "googleanalytics": "Google Analytics",
-            "mixpanel": "Mixpanel",
-            # Calendar & Tasks
-            "googlecalendar": "Google Calendar",
-            "googletasks": "Google Tasks",
-            "cal": "Cal.com",
-            "calendly": "Calendly",
-            # Forms & Surveys
-            "typeform": "Typeform",
-            "googleforms": "Google Forms",
-            "form": "Form Trigger",
-            # Development Tools
-            "webhook": "Webhook",
-            "httpRequest": "HTTP Request",
-            "graphql": "GraphQL",
-            "sse": "Server-Sent Events",
-            # Utility nodes (exclude from integrations)
-            "set": None,
-            "function": None,
-            "code": None,
-            "if": None,
-            "switch": None,
-            "merge": None,
-            "split": None,
-            "stickynote": None,
-            "stickyNote": None,
-            "wait": None,
-            "schedule": None,
-            "cron": None,
-            "manual": None,
-            "stopanderror": None,
-            "noop": None,
-            "noOp": None,
-            "error": None,
-            "limit": None,
-            "aggregate": None,
-            "summarize": None,
-            "filter": None,
-            "sort": None,
-            "removeDuplicates": None,
-            "dateTime": None,
-            "extractFromFile": None,
-            "convertToFile": None,
-            "readBinaryFile": None,
-            "readBinaryFiles": None,
-            "executionData": None,
-            "executeWorkflow": None,
-            "executeCommand": None,
-            "respondToWebhook": None,
-        }
-
         for node in nodes:
             node_type = node.get("type", "")
             node_name = node.get("name", "").lower()
+            type_service, type_trigger = _classify_node_type(node_type)
 
             # Determine trigger type
-            if "webhook" in node_type.lower() or "webhook" in node_name:
+            if type_trigger == "Webhook" or "webhook" in node_name:
                 trigger_type = "Webhook"
-            elif "cron" in node_type.lower() or "schedule" in node_type.lower():
+            elif type_trigger == "Scheduled":
                 trigger_type = "Scheduled"
-            elif "trigger" in node_type.lower() and trigger_type == "Manual":
-                if "manual" not in node_type.lower():
-                    trigger_type = "Webhook"
-
-            # Extract integrations with enhanced mapping
-            service_name = None
-
-            # Handle n8n-nodes-base nodes
-            if node_type.startswith("n8n-nodes-base."):
-                raw_service = node_type.replace("n8n-nodes-base.", "").lower()
-                raw_service = raw_service.replace("trigger", "")
-                service_name = service_mappings.get(
-                    raw_service, raw_service.title() if raw_service else None
-                )
-
-            # Handle @n8n/ namespaced nodes
-            elif node_type.startswith("@n8n/"):
-                raw_service = (
-                    node_type.split(".")[-1].lower()
-                    if "." in node_type
-                    else node_type.lower()
-                )
-                raw_service = raw_service.replace("trigger", "")
-                service_name = service_mappings.get(
-                    raw_service, raw_service.title() if raw_service else None
-                )
+            elif type_trigger == "Trigger" and trigger_type == "Manual":
+                trigger_type = "Webhook"
 
-            # Handle custom nodes
-            elif "-" in node_type or "@" in node_type:
-                # Try to extract service name from custom node names like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
-                parts = node_type.lower().split(".")
-                for part in parts:
-                    if "youtube" in part:
-                        service_name = "YouTube"
-                        break
-                    elif "telegram" in part:
-                        service_name = "Telegram"
-                        break
-                    elif "discord" in part:
-                        service_name = "Discord"
-                        break
-                    elif "calcslive" in part:
-                        service_name = "CalcsLive"
-                        break
-
-            # Also check node names for service hints (but avoid false positives)
-            for service_key, service_value in service_mappings.items():
-                if service_key in node_name and service_value:
-                    # Avoid false positive: "cal" in calcslive-related terms should not match "Cal.com"
-                    if service_key == "cal" and any(
-                        term in node_name.lower()
-                        for term in ["calcslive", "calc", "calculation"]
-                    ):
-                        continue
-                    service_name = service_value
-                    break
+            # Node names hint at services too, and take precedence over the type
+            service_name = _service_from_node_name(node_name) or type_service
 
             # Add to integrations if valid service found
             if service_name and service_name not in ["None", None]:
@@ -452,87 +1364,656 @@ class WorkflowDatabase:
 
         return desc + "."
 
-    def index_all_workflows(self, force_reindex: bool = False) -> Dict[str, int]:
-        """Index all workflow files. Only reprocesses changed files unless force_reindex=True."""
+    def index_all_workflows(
+        self,
+        force_reindex: bool = False,
+        workers: int = 1,
+        bulk: bool = False,
+        profile: Optional[IndexProfile] = None,
+    ) -> Dict[str, int]:
+        """Index all workflow files. Only reprocesses changed files unless force_reindex=True.
+
+        With workers > 1, parsing and analysis are fanned out to a process pool
+        while a single writer thread commits the results to SQLite in batches.
+
+        bulk=True implies force_reindex and rebuilds the table from scratch,
+        bypassing the per-row FTS triggers (see _index_bulk).
+
+        Pass an IndexProfile to collect phase and per-file timings.
+        """
+        self.profile = profile
+        try:
+            return self._index_all_workflows(force_reindex or bulk, workers, bulk)
+        finally:
+            self.profile = None
+
+    def _timed(self, phase: str):
+        """Context manager adding its duration to a profile phase, if profiling."""
+        if self.profile is None:
+            return contextlib.nullcontext()
+        return self.profile.phase(phase)
+
+    def _index_all_workflows(
+        self, force_reindex: bool, workers: int, bulk: bool
+    ) -> Dict[str, int]:
+        if self.read_only:
+            print("Warning: Database opened read-only, skipping indexing.")
+            return {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0}
         if not os.path.exists(self.workflows_dir):
             print(f"Warning: Workflows directory '{self.workflows_dir}' not found.")
-            return {"processed": 0, "skipped": 0, "errors": 0}
+            return {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0}
 
-        workflows_path = Path(self.workflows_dir)
-        json_files = [str(p) for p in workflows_path.rglob("*.json")]
+        start_time = time.perf_counter()
+        with self._timed("scan"):
+            workflows_path = Path(self.workflows_dir)
+            json_files = [str(p) for p in workflows_path.rglob("*.json")]
 
         if not json_files:
             print(f"Warning: No JSON files found in '{self.workflows_dir}' directory.")
-            return {"processed": 0, "skipped": 0, "errors": 0}
+            return {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0}
 
         print(f"Indexing {len(json_files)} workflow files...")
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        stats = {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0, "bytes": 0}
+        tasks, manifest_rows = self._plan_index(json_files, force_reindex, stats)
 
-        stats = {"processed": 0, "skipped": 0, "errors": 0}
+        if bulk:
+            self._index_bulk(tasks, manifest_rows, workers, stats)
+        elif workers > 1 and tasks:
+            self._index_parallel(tasks, manifest_rows, workers, stats)
+        else:
+            with self._writer() as conn:
+                self._index_serial(conn, tasks, manifest_rows, stats)
+                with self._timed("write"):
+                    conn.commit()
 
-        for file_path in json_files:
-            filename = os.path.basename(file_path)
+        with self._timed("delete_stale"):
+            stats["deleted"] = self._delete_stale(json_files)
 
-            try:
-                # Check if file needs to be reprocessed
-                if not force_reindex:
-                    current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?",
-                        (filename,),
+        if stats["processed"] or stats["deleted"]:
+            with self._writer() as conn:
+                self._bump_generation(conn)
+                conn.commit()
+
+        # Throughput covers indexing only, not the derived data built after it
+        elapsed = max(time.perf_counter() - start_time, 1e-6)
+        bytes_indexed = stats.pop("bytes")
+
+        if embeddings_available():
+            with self._timed("embed"):
+                self._update_embeddings()
+
+        if self.precompress:
+            with self._timed("compress"):
+                self._update_compressed(workers)
+
+        print(
+            f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, "
+            f"{stats['deleted']} deleted, {stats['errors']} errors"
+        )
+        print(
+            f"⏱️  {elapsed:.2f}s - {stats['processed'] / elapsed:.1f} files/sec, "
+            f"{bytes_indexed / (1024 * 1024) / elapsed:.2f} MB/sec"
+        )
+        if self.profile is not None:
+            self.profile.finish(stats, index_seconds=elapsed)
+        return stats
+
+    def _update_embeddings(self):
+        """Rewrite the vectors file unless it matches the index generation."""
+        path = vectors_path(self.db_path)
+        generation = self.get_index_generation()
+        try:
+            if VectorIndex.load(path).generation == generation:
+                return
+        except (OSError, ValueError):
+            pass  # Missing or unreadable: rebuild it
+
+        documents = self.get_embedding_documents()
+        if not documents:
+            return
+        start_time = time.perf_counter()
+        VectorIndex.build(documents, generation).save(path)
+        print(
+            f"🧭 Embedded {len(documents)} workflows "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+
+    def _update_compressed(self, workers: int = 1):
+        """Compress workflow files lacking variants and drop unused variants."""
+        store = CompressedStore(compressed_store_path(self.db_path))
+        with self._reader() as conn:
+            rows = conn.execute(
+                "SELECT file_hash, path, file_size FROM workflows "
+                "WHERE file_hash IS NOT NULL AND path IS NOT NULL"
+            ).fetchall()
+        tasks = {}
+        for file_hash, path, file_size in rows:
+            if (
+                (file_size or 0) >= MIN_COMPRESS_SIZE
+                and file_hash not in tasks
+                and store.missing(file_hash)
+            ):
+                tasks[file_hash] = os.path.join(self.workflows_dir, path)
+
+        start_time = time.perf_counter()
+        chunks = _chunked(list(tasks.items()), INDEX_CHUNK_SIZE)
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                compressed = sum(
+                    executor.map(
+                        functools.partial(_compress_chunk, store.directory), chunks
                     )
-                    row = cursor.fetchone()
-                    if row and row["file_hash"] == current_hash:
-                        stats["skipped"] += 1
-                        continue
+                )
+        else:
+            compressed = sum(_compress_chunk(store.directory, chunk) for chunk in chunks)
+        pruned = store.prune({file_hash for file_hash, _, _ in rows})
+        if compressed or pruned:
+            print(
+                f"🗜️  Compressed {compressed} workflow files, "
+                f"removed {pruned} unused variants "
+                f"in {time.perf_counter() - start_time:.2f}s"
+            )
+
+    def _relative_path(self, file_path: str) -> str:
+        """Path of a workflow file relative to workflows_dir, as stored in the manifest."""
+        return Path(file_path).relative_to(self.workflows_dir).as_posix()
+
+    def _delete_stale(self, json_files: List[str]) -> int:
+        """Remove rows and manifest entries for files that no longer exist.
+
+        Deleting from workflows fires the workflows_ad trigger, which drops
+        the matching FTS entry as well.
+        """
+        present_paths = {self._relative_path(p) for p in json_files}
+        present_filenames = {os.path.basename(p) for p in json_files}
+
+        with self._writer() as conn:
+            stale_paths = [
+                (path,)
+                for (path,) in conn.execute("SELECT path FROM workflow_manifest")
+                if path not in present_paths
+            ]
+            stale_filenames = [
+                (filename,)
+                for (filename,) in conn.execute("SELECT filename FROM workflows")
+                if filename not in present_filenames
+            ]
+            with conn:
+                conn.executemany(
+                    "DELETE FROM workflow_manifest WHERE path = ?", stale_paths
+                )
+                conn.executemany(
+                    "DELETE FROM workflows WHERE filename = ?", stale_filenames
+                )
+                # Also catches graphs left behind by files whose content changed
+                self._prune_graphs(conn)
+        return len(stale_filenames)
+
+    def _load_index_state(
+        self, conn: sqlite3.Connection, json_files: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Tuple], Dict[str, str]]:
+        """Load manifest entries and indexed hashes, for all files or just json_files."""
+        manifest_sql = "SELECT path, mtime_ns, size, inode, file_hash FROM workflow_manifest"
+        hashes_sql = "SELECT filename, file_hash FROM workflows"
+        if json_files is None:
+            manifest_rows = conn.execute(manifest_sql)
+            hash_rows = conn.execute(hashes_sql)
+        else:
+            rel_paths = json.dumps([self._relative_path(p) for p in json_files])
+            filenames = json.dumps([os.path.basename(p) for p in json_files])
+            manifest_rows = conn.execute(
+                manifest_sql + " WHERE path IN (SELECT value FROM json_each(?))",
+                (rel_paths,),
+            )
+            hash_rows = conn.execute(
+                hashes_sql + " WHERE filename IN (SELECT value FROM json_each(?))",
+                (filenames,),
+            )
+        manifest = {row[0]: row[1:] for row in manifest_rows}
+        return manifest, dict(hash_rows)
+
+    def _plan_index(
+        self,
+        json_files: List[str],
+        force_reindex: bool,
+        stats: Dict[str, int],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> Tuple[List[Tuple[str, Optional[str]]], Dict[str, Tuple]]:
+        """Decide which files need analysis using the stat manifest.
+
+        Files whose (mtime_ns, size, inode) match the manifest are skipped
+        without being opened. Files whose stat changed are hashed once; if the
+        content is unchanged only their manifest entry is refreshed.
+
+        Returns (file_path, known_hash) tasks plus pending manifest rows keyed
+        by file path. Rows for tasks are completed once their hash is known.
+
+        When conn is given, only the entries for json_files are loaded from it.
+        """
+        with self._timed("load_state"):
+            if conn is None:
+                with self._reader() as conn:
+                    manifest, indexed_hashes = self._load_index_state(conn)
+            else:
+                manifest, indexed_hashes = self._load_index_state(conn, json_files)
+
+        tasks = []
+        manifest_rows = {}
+        for file_path in json_files:
+            try:
+                rel_path = self._relative_path(file_path)
+                with self._timed("stat"):
+                    st = os.stat(file_path)
+                stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+                if force_reindex:
+                    tasks.append((file_path, None))
+                    manifest_rows[file_path] = (rel_path, *stat_key)
+                    continue
+
+                entry = manifest.get(rel_path)
+                if entry and entry[:3] == stat_key:
+                    stats["skipped"] += 1
+                    continue
+
+                with self._timed("hash"):
+                    file_hash = self.get_file_hash(file_path)
+                manifest_rows[file_path] = (rel_path, *stat_key, file_hash)
+                if indexed_hashes.get(os.path.basename(file_path)) == file_hash:
+                    # Touched but not modified
+                    stats["skipped"] += 1
+                    continue
+
+                tasks.append((file_path, file_hash))
+            except Exception as e:
+                print(f"Error processing {file_path}: {str(e)}")
+                stats["errors"] += 1
+
+        return tasks, manifest_rows
+
+    @staticmethod
+    def _manifest_row(
+        manifest_rows: Dict[str, Tuple], file_path: str, file_hash: str
+    ) -> Tuple:
+        """Complete a pending manifest row with the file's hash."""
+        return manifest_rows.pop(file_path)[:4] + (file_hash,)
+
+    @staticmethod
+    def _write_manifest(conn: sqlite3.Connection, rows: List[Tuple]):
+        conn.executemany(
+            "INSERT OR REPLACE INTO workflow_manifest "
+            "(path, mtime_ns, size, inode, file_hash) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _index_serial(
+        self,
+        conn: sqlite3.Connection,
+        tasks: List[Tuple[str, Optional[str]]],
+        manifest_rows: Dict[str, Tuple],
+        stats: Dict[str, int],
+    ):
+        """Analyze and store workflow files one by one on the current thread.
+
+        Nothing is committed; the caller owns the transaction.
+        """
+        manifest_updates = []
+        written = []
 
+        for file_path, file_hash in tasks:
+            try:
                 # Analyze workflow
-                workflow_data = self.analyze_workflow_file(file_path)
+                workflow_data = self.analyze_workflow_file(file_path, file_hash)
                 if not workflow_data:
                     stats["errors"] += 1
+                    manifest_rows.pop(file_path, None)
                     continue
 
+                if self.profile is not None:
+                    self.profile.add_file(file_path, workflow_data)
+
                 # Insert or update in database
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        workflow_data["filename"],
-                        workflow_data["name"],
-                        workflow_data["workflow_id"],
-                        workflow_data["active"],
-                        workflow_data["description"],
-                        workflow_data["trigger_type"],
-                        workflow_data["complexity"],
-                        workflow_data["node_count"],
-                        json.dumps(workflow_data["integrations"]),
-                        json.dumps(workflow_data["tags"]),
-                        workflow_data["created_at"],
-                        workflow_data["updated_at"],
-                        workflow_data["file_hash"],
-                        workflow_data["file_size"],
-                    ),
+                with self._timed("write"):
+                    conn.execute(UPSERT_WORKFLOW_SQL, workflow_row(workflow_data))
+                written.append(workflow_data)
+                manifest_updates.append(
+                    self._manifest_row(
+                        manifest_rows, file_path, workflow_data["file_hash"]
+                    )
                 )
 
                 stats["processed"] += 1
+                stats["bytes"] += workflow_data["file_size"]
 
             except Exception as e:
                 print(f"Error processing {file_path}: {str(e)}")
                 stats["errors"] += 1
+                manifest_rows.pop(file_path, None)
+                continue
+
+        with self._timed("write"):
+            self._write_workflow_children(conn, written)
+
+            # Whatever is left are unchanged files that only need fresh stat data
+            manifest_updates.extend(manifest_rows.values())
+            self._write_manifest(conn, manifest_updates)
+
+    def _index_parallel(
+        self,
+        tasks: List[Tuple[str, Optional[str]]],
+        manifest_rows: Dict[str, Tuple],
+        workers: int,
+        stats: Dict[str, int],
+    ):
+        """Analyze files in a process pool and write them from a single thread.
+
+        Chunks are consumed in submission order, so rows are inserted in the
+        same order as the serial path and end up with the same ids.
+        """
+        chunks = _chunked(tasks, INDEX_CHUNK_SIZE)
+        task_paths = {file_path for file_path, _ in tasks}
+        # Unchanged files only need fresh stat data
+        refreshed = [
+            row for file_path, row in manifest_rows.items() if file_path not in task_paths
+        ]
+        results: "queue.Queue" = queue.Queue(maxsize=workers * 2)
+        writer_errors: List[BaseException] = []
+
+        def write_batch(conn, batch, manifest_batch):
+            with self._timed("write"):
+                conn.executemany(UPSERT_WORKFLOW_SQL, [workflow_row(w) for w in batch])
+                self._write_workflow_children(conn, batch)
+                self._write_manifest(conn, manifest_batch)
+                conn.commit()
+
+        def write_results():
+            batch = []
+            manifest_batch = []
+            try:
+                with self._writer() as conn:
+                    while True:
+                        chunk_results = results.get()
+                        if chunk_results is None:
+                            break
+                        for file_path, workflow_data, error in chunk_results:
+                            if workflow_data is None:
+                                if error:
+                                    print(f"Error processing {file_path}: {error}")
+                                stats["errors"] += 1
+                                continue
+                            if self.profile is not None:
+                                self.profile.add_file(file_path, workflow_data)
+                            batch.append(workflow_data)
+                            manifest_batch.append(
+                                self._manifest_row(
+                                    manifest_rows, file_path, workflow_data["file_hash"]
+                                )
+                            )
+                            stats["processed"] += 1
+                            stats["bytes"] += workflow_data["file_size"]
+                        if len(batch) >= INDEX_BATCH_SIZE:
+                            write_batch(conn, batch, manifest_batch)
+                            batch = []
+                            manifest_batch = []
+                    write_batch(conn, batch, manifest_batch + refreshed)
+            except BaseException as e:
+                writer_errors.append(e)
+                # Keep draining so the producer never blocks on a full queue
+                while results.get() is not None:
+                    pass
+
+        writer = threading.Thread(target=write_results, name="index-writer")
+        writer.start()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_index_worker,
+                initargs=(
+                    self.json_parser, self.workflows_dir, self.profile is not None
+                ),
+            ) as executor:
+                for chunk_results in executor.map(_analyze_chunk, chunks):
+                    results.put(chunk_results)
+        finally:
+            results.put(None)
+            writer.join()
+
+        if writer_errors:
+            raise writer_errors[0]
+
+    def _analyze_tasks(
+        self, tasks: List[Tuple[str, Optional[str]]], workers: int
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Yield (file_path, workflow_data, error) for each task, in task order."""
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_index_worker,
+                initargs=(
+                    self.json_parser, self.workflows_dir, self.profile is not None
+                ),
+            ) as executor:
+                for chunk_results in executor.map(
+                    _analyze_chunk, _chunked(tasks, INDEX_CHUNK_SIZE)
+                ):
+                    yield from chunk_results
+            return
+
+        for file_path, file_hash in tasks:
+            try:
+                yield file_path, self.analyze_workflow_file(file_path, file_hash), None
+            except Exception as e:
+                yield file_path, None, str(e)
+
+    def _index_bulk(
+        self,
+        tasks: List[Tuple[str, Optional[str]]],
+        manifest_rows: Dict[str, Tuple],
+        workers: int,
+        stats: Dict[str, int],
+    ):
+        """Rebuild the workflows table in one transaction without per-row FTS work.
+
+        Rows are loaded with executemany into a fresh table while the FTS
+        triggers are dropped, the table is swapped in, and the FTS index is
+        then rebuilt and optimized once. Readers keep seeing the old index
+        until the transaction commits.
+        """
+        loaded = []
+        manifest_updates = []
+        for file_path, workflow_data, error in self._analyze_tasks(tasks, workers):
+            if workflow_data is None:
+                if error:
+                    print(f"Error processing {file_path}: {error}")
+                stats["errors"] += 1
                 continue
+            workflow_data.pop("nodes", None)
+            if self.profile is not None:
+                self.profile.add_file(file_path, workflow_data)
+            loaded.append(workflow_data)
+            manifest_updates.append(
+                self._manifest_row(manifest_rows, file_path, workflow_data["file_hash"])
+            )
+            stats["processed"] += 1
+            stats["bytes"] += workflow_data["file_size"]
 
-        conn.commit()
+        with self._writer() as conn:
+            # Autocommit mode so the DDL below is part of our explicit transaction
+            conn.isolation_level = None
+            try:
+                with self._timed("write"):
+                    conn.execute("BEGIN IMMEDIATE")
+                    self._drop_fts_triggers(conn)
+                    conn.execute("DROP TABLE IF EXISTS workflows_new")
+                    self._create_workflows_table(conn, "workflows_new")
+                    conn.executemany(
+                        WORKFLOW_INSERT_SQL.format(table="workflows_new"),
+                        [workflow_row(w) for w in loaded],
+                    )
+                    conn.execute("DROP TABLE workflows")
+                    conn.execute("ALTER TABLE workflows_new RENAME TO workflows")
+                    self._create_workflow_indexes(conn)
+                    self._create_fts_triggers(conn)
+                    self._create_child_triggers(conn)
+
+                    conn.execute("DELETE FROM workflow_integrations")
+                    conn.execute("DELETE FROM workflow_nodes")
+                    conn.execute("DELETE FROM workflow_graphs")
+                    self._write_workflow_children(conn, loaded)
+
+                    conn.execute("DELETE FROM workflow_manifest")
+                    self._write_manifest(conn, manifest_updates)
+
+                with self._timed("fts_rebuild"):
+                    for command in ("rebuild", "optimize"):
+                        conn.execute(
+                            "INSERT INTO workflows_fts(workflows_fts) VALUES (?)",
+                            (command,),
+                        )
+                with self._timed("write"):
+                    conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.isolation_level = ""
+
+    def sync_paths(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Bring the index in line with a set of changed paths.
+
+        Existing files are upserted (subject to the usual manifest checks),
+        existing directories are expanded to their JSON files, and paths that
+        no longer exist are deleted along with anything indexed beneath them.
+        All changes are applied in a single transaction.
+        """
+        if self.read_only:
+            print("Warning: Database opened read-only, skipping sync.")
+            return {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0}
+
+        stats = {"processed": 0, "skipped": 0, "deleted": 0, "errors": 0, "bytes": 0}
+
+        existing = set()
+        removed = set()
+        for path in paths:
+            if os.path.isdir(path):
+                existing.update(str(p) for p in Path(path).rglob("*.json"))
+            elif os.path.isfile(path):
+                if path.endswith(".json"):
+                    existing.add(path)
+            else:
+                removed.add(path)
+
+        with self._writer() as conn:
+            with conn:
+                # Deletions go first so a file renamed across directories
+                # is removed and then re-inserted under its new path
+                for path in sorted(removed):
+                    rel_path = self._relative_path(path)
+                    stale_paths = [
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT path FROM workflow_manifest "
+                            "WHERE path = ? OR substr(path, 1, ?) = ?",
+                            (rel_path, len(rel_path) + 1, rel_path + "/"),
+                        )
+                    ]
+                    if path.endswith(".json"):
+                        stale_paths.append(rel_path)
+                    for stale_path in set(stale_paths):
+                        conn.execute(
+                            "DELETE FROM workflow_manifest WHERE path = ?", (stale_path,)
+                        )
+                        cursor = conn.execute(
+                            "DELETE FROM workflows WHERE path = ?", (stale_path,)
+                        )
+                        stats["deleted"] += cursor.rowcount
+                        if not cursor.rowcount:
+                            continue
+                        # Files share a row by name: reindex any copy left
+                        # elsewhere, or it would stay "unchanged" and unlisted
+                        name = os.path.basename(stale_path)
+                        for (other_path,) in conn.execute(
+                            "SELECT path FROM workflow_manifest "
+                            "WHERE path = ? OR substr(path, ?) = ?",
+                            (name, -len(name) - 1, "/" + name),
+                        ).fetchall():
+                            full_path = os.path.join(self.workflows_dir, other_path)
+                            if os.path.isfile(full_path):
+                                conn.execute(
+                                    "DELETE FROM workflow_manifest WHERE path = ?",
+                                    (other_path,),
+                                )
+                                existing.add(full_path)
+
+                json_files = sorted(existing)
+                tasks, manifest_rows = self._plan_index(
+                    json_files, False, stats, conn=conn
+                )
+                self._index_serial(conn, tasks, manifest_rows, stats)
+                self._prune_graphs(conn)
+                if stats["processed"] or stats["deleted"]:
+                    self._bump_generation(conn)
+
+        if stats["processed"] or stats["deleted"]:
+            if embeddings_available():
+                self._update_embeddings()
+            if self.precompress:
+                self._update_compressed()
+
+        stats.pop("bytes")
+        return stats
+
+    def build_snapshot(
+        self,
+        output_path: str,
+        force_reindex: bool = False,
+        workers: int = 1,
+        bulk: bool = False,
+    ) -> Dict[str, Any]:
+        """Write a fully indexed, compacted copy of the database for serving.
+
+        The index is brought up to date first, then the FTS index is merged,
+        planner statistics are gathered and the result is written with
+        VACUUM INTO. The snapshot uses a rollback journal rather than WAL so
+        it can be opened with immutable=1 (see read_only).
+        """
+        stats = self.index_all_workflows(
+            force_reindex=force_reindex, workers=workers, bulk=bulk
+        )
+        start_time = time.perf_counter()
+
+        # Build next to the target and rename, so readers never see a partial file
+        tmp_path = output_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        with self._writer() as conn:
+            conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES ('optimize')")
+            conn.execute("ANALYZE")
+            conn.commit()
+            conn.execute("VACUUM INTO ?", (tmp_path,))
+
+        conn = sqlite3.connect(tmp_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.execute("PRAGMA optimize")
         conn.close()
+        os.replace(tmp_path, output_path)
+        # The snapshot keeps the generation, so its embeddings are the same
+        if os.path.exists(vectors_path(self.db_path)):
+            shutil.copyfile(vectors_path(self.db_path), vectors_path(output_path))
+        if os.path.isdir(compressed_store_path(self.db_path)):
+            shutil.copytree(
+                compressed_store_path(self.db_path),
+                compressed_store_path(output_path),
+                dirs_exist_ok=True,
+            )
 
+        stats["snapshot_bytes"] = os.path.getsize(output_path)
         print(
-            f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors"
+            f"📦 Snapshot written to {output_path} "
+            f"({stats['snapshot_bytes'] / 1e6:.1f} MB) "
+            f"in {time.perf_counter() - start_time:.2f}s"
         )
         return stats
 
@@ -544,11 +2025,207 @@ class WorkflowDatabase:
         active_only: bool = False,
         limit: int = 50,
         offset: int = 0,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        exact_total: bool = True,
+        cursor: Optional[str] = None,
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
     ) -> Tuple[List[Dict], int]:
-        """Fast search with filters and pagination."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Fast search with filters and pagination.
+
+        query is compiled with compile_fts_query, so any text is safe to pass.
+
+        integration_filter matches an integration name case-insensitively and
+        node_type_filter a full node type such as "n8n-nodes-base.slack"; both
+        are answered from the workflow_integrations/workflow_nodes indexes.
+        min_nodes and max_nodes bound node_count, inclusively.
+
+        With exact_total=False the total stops counting at
+        total_estimate_cap(offset, limit); see _count_matches.
+
+        A cursor from encode_cursor (ranked when query is non-empty) replaces
+        offset: the page starts right after the workflow it was made from, so
+        deep pages cost the same as the first one.
+        """
+        # FTS matches are ranked by column-weighted bm25
+        columns = "w.*, rank" if query.strip() else "w.*, 0 as rank"
+
+        with self._reader() as conn:
+            search = self._search_clause(
+                conn,
+                query,
+                trigger_filter,
+                complexity_filter,
+                active_only,
+                integration_filter,
+                node_type_filter,
+                min_nodes,
+                max_nodes,
+            )
+            if search is None:
+                return [], 0
+            from_clause, params = search
+            conn.row_factory = sqlite3.Row
+
+            # Count total results (without computing bm25 ranks)
+            total = self._count_matches(
+                conn, f"SELECT w.id {from_clause}", params, exact_total, offset + limit
+            )
+
+            # Get paginated results, resuming after the cursor when given
+            base_query = f"SELECT {columns} {from_clause}"
+            if not query.strip():
+                rows = self._page_by_analyzed_at(
+                    conn, base_query, params, limit, offset, cursor
+                )
+            elif cursor is None:
+                rows = conn.execute(
+                    f"{base_query} ORDER BY rank, w.id LIMIT {limit} OFFSET {offset}",
+                    params,
+                ).fetchall()
+            else:
+                # bm25 has to be computed for every match either way, but the
+                # sorter only keeps the page after the cursor
+                rows = conn.execute(
+                    f"{base_query} AND (rank, w.id) > (?, ?) "
+                    f"ORDER BY rank, w.id LIMIT {limit}",
+                    [*params, *decode_cursor(cursor, ranked=True)],
+                ).fetchall()
+
+            # Convert to dictionaries and parse JSON fields
+            results = [workflow_from_row(row) for row in rows]
+
+        return results, total
+
+    def search_ids(
+        self,
+        query: str = "",
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> List[int]:
+        """Ids of every search_workflows match, unranked."""
+        with self._reader() as conn:
+            search = self._search_clause(
+                conn,
+                query,
+                trigger_filter,
+                complexity_filter,
+                active_only,
+                integration_filter,
+                node_type_filter,
+                min_nodes,
+                max_nodes,
+            )
+            if search is None:
+                return []
+            from_clause, params = search
+            rows = conn.execute(f"SELECT w.id {from_clause}", params)
+            return [row[0] for row in rows]
+
+    def search_facets(
+        self,
+        query: str = "",
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        top_integrations: int = FACET_TOP_INTEGRATIONS,
+    ) -> Dict[str, Dict[str, int]]:
+        """Match counts by trigger type, complexity, integration and category.
+
+        Takes search_workflows' filters and aggregates its whole match set in
+        a single query, over the workflow_integrations index. Only the
+        top_integrations most common integrations are returned.
+        """
+        facets: Dict[str, List[Tuple[Any, int]]] = {
+            "trigger_type": [],
+            "complexity": [],
+            "integration": [],
+            "category": [],
+        }
+        services = [
+            [service, category]
+            for category, names in self.get_service_categories().items()
+            for service in names
+        ]
+        with self._reader() as conn:
+            search = self._search_clause(
+                conn,
+                query,
+                trigger_filter,
+                complexity_filter,
+                active_only,
+                integration_filter,
+                node_type_filter,
+                min_nodes,
+                max_nodes,
+            )
+            if search is not None:
+                from_clause, params = search
+                rows = conn.execute(
+                    f"""
+                    WITH matches AS (
+                        SELECT w.id, w.trigger_type, w.complexity {from_clause}
+                    ),
+                    services(service, category) AS (
+                        SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                        FROM json_each(?)
+                    )
+                    SELECT 'trigger_type', trigger_type, COUNT(*)
+                    FROM matches GROUP BY trigger_type
+                    UNION ALL
+                    SELECT 'complexity', complexity, COUNT(*)
+                    FROM matches GROUP BY complexity
+                    UNION ALL
+                    SELECT 'integration', MIN(wi.integration COLLATE BINARY), COUNT(*)
+                    FROM matches m
+                    JOIN workflow_integrations wi ON wi.workflow_id = m.id
+                    GROUP BY wi.integration
+                    UNION ALL
+                    SELECT 'category', s.category, COUNT(DISTINCT m.id)
+                    FROM matches m
+                    JOIN workflow_integrations wi ON wi.workflow_id = m.id
+                    JOIN services s ON wi.integration = s.service
+                    GROUP BY s.category
+                    """,
+                    [*params, json.dumps(services)],
+                ).fetchall()
+                for facet, value, count in rows:
+                    facets[facet].append((value, count))
+
+        return {
+            facet: facet_counts(
+                counts, top_integrations if facet == "integration" else None
+            )
+            for facet, counts in facets.items()
+        }
 
+    def _search_clause(
+        self,
+        conn: sqlite3.Connection,
+        query: str,
+        trigger_filter: str,
+        complexity_filter: str,
+        active_only: bool,
+        integration_filter: str,
+        node_type_filter: str,
+        min_nodes: Optional[int],
+        max_nodes: Optional[int],
+    ) -> Optional[Tuple[str, List[Any]]]:
+        """FROM/WHERE clause and parameters selecting a search's matches as `w`.
+
+        None when query has nothing to search for, so nothing matches. A query
+        that matches nothing as typed is typo-corrected; see _fts_match.
+        """
         # Build WHERE clause
         where_conditions = []
         params = []
@@ -564,109 +2241,259 @@ class WorkflowDatabase:
             where_conditions.append("w.complexity = ?")
             params.append(complexity_filter)
 
+        if min_nodes is not None:
+            where_conditions.append("w.node_count >= ?")
+            params.append(min_nodes)
+
+        if max_nodes is not None:
+            where_conditions.append("w.node_count <= ?")
+            params.append(max_nodes)
+
+        if integration_filter != "all":
+            where_conditions.append(
+                "w.id IN (SELECT workflow_id FROM workflow_integrations "
+                "WHERE integration = ?)"
+            )
+            params.append(integration_filter)
+
+        if node_type_filter != "all":
+            where_conditions.append(
+                "w.id IN (SELECT workflow_id FROM workflow_nodes "
+                "WHERE node_type = ?)"
+            )
+            params.append(node_type_filter)
+
         # Use FTS search if query provided
         if query.strip():
-            # FTS search with ranking
-            base_query = """
-                SELECT w.*, rank
+            match = self._fts_match(conn, query)
+            if not match:
+                return None
+
+            from_clause = """
                 FROM workflows_fts fts
                 JOIN workflows w ON w.id = fts.rowid
                 WHERE workflows_fts MATCH ?
             """
-            params.insert(0, query)
+            params.insert(0, match)
         else:
             # Regular query without FTS
-            base_query = """
-                SELECT w.*, 0 as rank
+            from_clause = """
                 FROM workflows w
                 WHERE 1=1
             """
 
         if where_conditions:
-            base_query += " AND " + " AND ".join(where_conditions)
+            from_clause += " AND " + " AND ".join(where_conditions)
 
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM ({base_query}) t"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
-
-        # Get paginated results
-        if query.strip():
-            base_query += " ORDER BY rank"
-        else:
-            base_query += " ORDER BY w.analyzed_at DESC"
+        return from_clause, params
 
-        base_query += f" LIMIT {limit} OFFSET {offset}"
+    def _fts_match(self, conn: sqlite3.Connection, query: str) -> str:
+        """MATCH expression for query, with typos corrected if it finds nothing.
 
-        cursor = conn.execute(base_query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-
-            # Parse tags and convert dict tags to strings
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    # Extract name from tag dict if available
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
-
-            results.append(workflow)
+        Only queries without a single full-text hit fall back to
+        compile_fuzzy_fts_query, so correctly spelled searches never pay for it.
+        Both the hit check and the trigram index are kept per index generation.
+        """
+        match = compile_fts_query(query)
+        if not match:
+            return match
+
+        generation = self._read_generation(conn)
+        key = ("fts_hits", match)
+        has_hits = self._count_cache.get(key, generation)
+        if has_hits is None:
+            has_hits = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM workflows_fts "
+                "WHERE workflows_fts MATCH ?)",
+                (match,),
+            ).fetchone()[0]
+            self._count_cache.put(key, generation, has_hits)
+        if has_hits:
+            return match
+
+        index = self._get_trigram_index(conn, generation)
+        return compile_fuzzy_fts_query(query, index) or match
+
+    def get_trigram_index(self) -> TrigramIndex:
+        """The trigram index misspelled searches are corrected with, built if stale."""
+        with self._reader() as conn:
+            return self._get_trigram_index(conn, self._read_generation(conn))
+
+    def _get_trigram_index(
+        self, conn: sqlite3.Connection, generation: int
+    ) -> TrigramIndex:
+        """The typo-correction index for generation, built on first use."""
+        index = self._trigram_index
+        if index is not None and index.generation == generation:
+            return index
+        with self._trigram_lock:
+            index = self._trigram_index
+            if index is None or index.generation != generation:
+                index = self._build_trigram_index(conn, generation)
+                self._trigram_index = index
+        return index
+
+    @staticmethod
+    def _build_trigram_index(
+        conn: sqlite3.Connection, generation: int
+    ) -> TrigramIndex:
+        """Index the words of workflow names, integrations and node types.
+
+        Node types count through their FTS terms (e.g. "googlesheets" from
+        n8n-nodes-base.googleSheets), since corrections have to be searchable.
+        """
+        try:
+            rows = conn.execute(
+                "SELECT term, col, doc FROM workflows_fts_vocab"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # Read-only snapshot built before workflows_fts_vocab existed
+            return TrigramIndex([], [], generation)
+
+        vocabulary: Dict[str, int] = {}
+        terms = []
+        for term, column, docs in rows:
+            vocabulary[term] = vocabulary.get(term, 0) + docs
+            if column in ("name", "integrations"):
+                terms.append((term, docs))
+        for (node_type,) in conn.execute(
+            "SELECT DISTINCT node_type FROM workflow_nodes"
+        ):
+            for token in _FTS_TOKEN_RE.findall(node_type.rsplit(".", 1)[-1].lower()):
+                if token in vocabulary:
+                    terms.append((token, vocabulary[token]))
+        return TrigramIndex(terms, vocabulary, generation)
 
-        conn.close()
-        return results, total
+    def _count_matches(
+        self,
+        conn: sqlite3.Connection,
+        matching_sql: str,
+        params: List[Any],
+        exact: bool,
+        page_end: int,
+    ) -> int:
+        """Count the rows of matching_sql, remembering counts per index generation.
+
+        Counts are cached by query and parameters, so paging through a result
+        set only counts it once. When exact is False, counting stops at
+        total_estimate_cap(page_end); a total equal to the cap is a lower bound.
+        """
+        if exact:
+            count_sql = f"SELECT COUNT(*) FROM ({matching_sql})"
+            count_params = tuple(params)
+        else:
+            count_sql = f"SELECT COUNT(*) FROM ({matching_sql} LIMIT ?)"
+            count_params = (*params, total_estimate_cap(page_end))
+
+        generation = self._read_generation(conn)
+        key = (count_sql, count_params)
+        total = self._count_cache.get(key, generation)
+        if total is None:
+            total = conn.execute(count_sql, count_params).fetchone()[0]
+            self._count_cache.put(key, generation, total)
+        return total
+
+    @staticmethod
+    def _page_by_analyzed_at(
+        conn: sqlite3.Connection,
+        select_sql: str,
+        params: List[Any],
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+    ) -> List[sqlite3.Row]:
+        """One page of select_sql (workflows aliased as w), newest first.
+
+        SQLite won't seek idx_analyzed_at on a row value that includes the
+        rowid, so a cursor page is read as two index range scans: the rest of
+        the cursor's analyzed_at tie, then the older rows.
+        """
+        order = "ORDER BY w.analyzed_at DESC, w.id DESC"
+        if cursor is None:
+            return conn.execute(
+                f"{select_sql} {order} LIMIT {limit} OFFSET {offset}", params
+            ).fetchall()
+
+        analyzed_at, last_id = decode_cursor(cursor, ranked=False)
+        rows = conn.execute(
+            f"{select_sql} AND w.analyzed_at = ? AND w.id < ? {order} LIMIT {limit}",
+            [*params, analyzed_at, last_id],
+        ).fetchall()
+        if len(rows) < limit:
+            rows += conn.execute(
+                f"{select_sql} AND w.analyzed_at < ? {order} "
+                f"LIMIT {limit - len(rows)}",
+                [*params, analyzed_at],
+            ).fetchall()
+        return rows
+
+    def get_workflow_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """An indexed workflow by filename, including its path; None if unknown."""
+        with self._reader() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM workflows WHERE filename = ?", (filename,)
+            ).fetchone()
+        return workflow_from_row(row) if row else None
+
+    def get_workflow_file_hash(self, filename: str) -> Optional[str]:
+        """Return the content hash of an indexed workflow, or None if unknown."""
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT file_hash FROM workflows WHERE filename = ?", (filename,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_workflow_graph(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the stored nodes and connections for a file hash."""
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT graph FROM workflow_graphs WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+        return decode_graph(row[0]) if row else None
 
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        # Basic counts
-        cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
-        total = cursor.fetchone()["total"]
+        with self._reader() as conn:
+            conn.row_factory = sqlite3.Row
 
-        cursor = conn.execute(
-            "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
-        )
-        active = cursor.fetchone()["active"]
-
-        # Trigger type breakdown
-        cursor = conn.execute("""
-            SELECT trigger_type, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY trigger_type
-        """)
-        triggers = {row["trigger_type"]: row["count"] for row in cursor.fetchall()}
+            # Basic counts
+            cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
+            total = cursor.fetchone()["total"]
 
-        # Complexity breakdown
-        cursor = conn.execute("""
-            SELECT complexity, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY complexity
-        """)
-        complexity = {row["complexity"]: row["count"] for row in cursor.fetchall()}
-
-        # Node stats
-        cursor = conn.execute("SELECT SUM(node_count) as total_nodes FROM workflows")
-        total_nodes = cursor.fetchone()["total_nodes"] or 0
-
-        # Unique integrations count
-        cursor = conn.execute(
-            "SELECT integrations FROM workflows WHERE integrations != '[]'"
-        )
-        all_integrations = set()
-        for row in cursor.fetchall():
-            integrations = json.loads(row["integrations"])
-            all_integrations.update(integrations)
+            cursor = conn.execute(
+                "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
+            )
+            active = cursor.fetchone()["active"]
+
+            # Trigger type breakdown
+            cursor = conn.execute("""
+                SELECT trigger_type, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY trigger_type
+            """)
+            triggers = {row["trigger_type"]: row["count"] for row in cursor.fetchall()}
+
+            # Complexity breakdown
+            cursor = conn.execute("""
+                SELECT complexity, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY complexity
+            """)
+            complexity = {row["complexity"]: row["count"] for row in cursor.fetchall()}
+
+            # Node stats
+            cursor = conn.execute(
+                "SELECT SUM(node_count) as total_nodes FROM workflows"
+            )
+            total_nodes = cursor.fetchone()["total_nodes"] or 0
 
-        conn.close()
+            # Unique integrations count
+            cursor = conn.execute(
+                "SELECT COUNT(DISTINCT integration COLLATE BINARY) "
+                "AS unique_integrations FROM workflow_integrations"
+            )
+            unique_integrations = cursor.fetchone()["unique_integrations"]
 
         return {
             "total": total,
@@ -675,10 +2502,219 @@ class WorkflowDatabase:
             "triggers": triggers,
             "complexity": complexity,
             "total_nodes": total_nodes,
-            "unique_integrations": len(all_integrations),
+            "unique_integrations": unique_integrations,
             "last_indexed": datetime.datetime.now().isoformat(),
         }
 
+    def get_catalog_rows(
+        self,
+    ) -> Tuple[int, List[Dict[str, Any]], List[Tuple[int, str]]]:
+        """Everything WorkflowCatalog loads, read from one consistent snapshot.
+
+        Returns the index generation, every workflow as search_workflows
+        returns it (newest first) and the (workflow_id, node_type) pairs.
+        """
+        with self._reader() as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN")
+            generation = self._read_generation(conn)
+            rows = conn.execute(
+                "SELECT w.*, 0 AS rank FROM workflows w "
+                "ORDER BY w.analyzed_at DESC, w.id DESC"
+            )
+            workflows = [workflow_from_row(row) for row in rows]
+            node_types = [
+                tuple(row)
+                for row in conn.execute(
+                    "SELECT DISTINCT workflow_id, node_type FROM workflow_nodes"
+                )
+            ]
+        return generation, workflows, node_types
+
+    def get_embedding_documents(self) -> List[Tuple[int, List[str]]]:
+        """(workflow id, words) of every workflow, as VectorIndex.build embeds them."""
+        with self._reader() as conn:
+            rows = conn.execute("""
+                SELECT w.id, w.name, w.description, w.integrations,
+                    (SELECT json_group_array(node_type) FROM workflow_nodes n
+                     WHERE n.workflow_id = w.id)
+                FROM workflows w ORDER BY w.id
+            """).fetchall()
+        return [
+            (
+                workflow_id,
+                document_tokens(
+                    name,
+                    description or "",
+                    json.loads(integrations or "[]"),
+                    json.loads(node_types),
+                ),
+            )
+            for workflow_id, name, description, integrations, node_types in rows
+        ]
+
+    def get_vector_index(self) -> Optional[VectorIndex]:
+        """The memory-mapped embeddings of the last index run, None if unavailable.
+
+        The file is mapped again whenever an index run has replaced it.
+        """
+        if not embeddings_available():
+            return None
+        path = vectors_path(self.db_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._vector_lock:
+            if self._vector_file != signature:
+                try:
+                    self._vector_index = VectorIndex.load(path)
+                except (OSError, ValueError) as e:
+                    print(f"Error loading embeddings from {path}: {e}")
+                    self._vector_index = None
+                self._vector_file = signature
+            return self._vector_index
+
+    def get_workflows_by_ids(self, workflow_ids: List[int]) -> List[Dict[str, Any]]:
+        """Workflows as search_workflows returns them, in workflow_ids order."""
+        with self._reader() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT w.*, 0 AS rank FROM workflows w "
+                "WHERE w.id IN (SELECT value FROM json_each(?))",
+                (json.dumps(workflow_ids),),
+            ).fetchall()
+        workflows = {row["id"]: workflow_from_row(row) for row in rows}
+        return [workflows[i] for i in workflow_ids if i in workflows]
+
+    def similar_workflows(
+        self, filename: str, limit: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Workflows most like the one in filename, with their `similarity`.
+
+        None when there are no embeddings or filename isn't indexed.
+        """
+        vectors = self.get_vector_index()
+        if vectors is None:
+            return None
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT id FROM workflows WHERE filename = ?", (filename,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        matches = dict(vectors.similar(row[0], limit))
+        workflows = self.get_workflows_by_ids(list(matches))
+        for workflow in workflows:
+            workflow["similarity"] = matches[workflow["id"]]
+        return workflows
+
+    def semantic_search(
+        self,
+        query: str,
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+    ) -> Tuple[List[Dict], int]:
+        """Hybrid keyword and embedding search; see semantic_search_ids.
+
+        Falls back to search_workflows without embeddings or query.
+        """
+        filters = {
+            "trigger_filter": trigger_filter,
+            "complexity_filter": complexity_filter,
+            "active_only": active_only,
+            "integration_filter": integration_filter,
+            "node_type_filter": node_type_filter,
+            "min_nodes": min_nodes,
+            "max_nodes": max_nodes,
+        }
+        if self.get_vector_index() is None or not query.strip():
+            return self.search_workflows(query, limit=limit, offset=offset, **filters)
+
+        ranked = self.semantic_search_ids(
+            query, depth=max(SEMANTIC_CANDIDATES, offset + limit), **filters
+        )
+        return self.get_workflows_by_ids(ranked[offset:offset + limit]), len(ranked)
+
+    def semantic_search_ids(
+        self,
+        query: str,
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        integration_filter: str = "all",
+        node_type_filter: str = "all",
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        depth: int = SEMANTIC_CANDIDATES,
+    ) -> List[int]:
+        """Ids of semantic_search's matches, best first.
+
+        The best `depth` keyword matches and nearest workflow vectors are
+        merged with reciprocal rank fusion, so workflows that share no words
+        with query can still rank. Takes search_workflows' filters; falls back
+        to search_ids without embeddings.
+        """
+        filters = {
+            "trigger_filter": trigger_filter,
+            "complexity_filter": complexity_filter,
+            "active_only": active_only,
+            "integration_filter": integration_filter,
+            "node_type_filter": node_type_filter,
+            "min_nodes": min_nodes,
+            "max_nodes": max_nodes,
+        }
+        vectors = self.get_vector_index()
+        if vectors is None:
+            return self.search_ids(query, **filters)
+
+        keyword, _ = self.search_workflows(
+            query, limit=depth, exact_total=False, **filters
+        )
+        unfiltered = (
+            trigger_filter == complexity_filter == "all"
+            and integration_filter == node_type_filter == "all"
+            and not active_only
+            and min_nodes is None
+            and max_nodes is None
+        )
+        candidates = None if unfiltered else self.search_ids(**filters)
+        nearest = vectors.search(query, depth, candidates)
+        return fuse_rankings(
+            [workflow["id"] for workflow in keyword],
+            [workflow_id for workflow_id, _ in nearest],
+        )
+
+    def get_suggestion_terms(self) -> List[Tuple[str, str, int]]:
+        """(text, kind, workflow count) of names, integrations, tags and node types."""
+        with self._reader() as conn:
+            return conn.execute("""
+                SELECT name, 'workflow', COUNT(*) FROM workflows GROUP BY name
+                UNION ALL
+                SELECT MIN(integration), 'integration', COUNT(*)
+                FROM workflow_integrations GROUP BY integration
+                UNION ALL
+                SELECT tag, 'tag', COUNT(*) FROM (
+                    SELECT CASE j.type
+                        WHEN 'object' THEN json_extract(j.value, '$.name')
+                        ELSE j.value
+                    END AS tag
+                    FROM workflows w, json_each(w.tags) j
+                ) WHERE tag IS NOT NULL GROUP BY tag
+                UNION ALL
+                SELECT node_type, 'node_type', COUNT(DISTINCT workflow_id)
+                FROM workflow_nodes GROUP BY node_type
+            """).fetchall()
+
     def get_service_categories(self) -> Dict[str, List[str]]:
         """Get service categories for enhanced filtering."""
         return {
@@ -737,61 +2773,103 @@ class WorkflowDatabase:
         }
 
     def search_by_category(
-        self, category: str, limit: int = 50, offset: int = 0
+        self,
+        category: str,
+        limit: int = 50,
+        offset: int = 0,
+        exact_total: bool = True,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict], int]:
-        """Search workflows by service category."""
+        """Search workflows by service category.
+
+        cursor works as in search_workflows (unranked).
+        """
         categories = self.get_service_categories()
         if category not in categories:
             return [], 0
 
         services = categories[category]
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        with self._reader() as conn:
+            conn.row_factory = sqlite3.Row
 
-        # Build OR conditions for all services in category
-        service_conditions = []
-        params = []
-        for service in services:
-            service_conditions.append("integrations LIKE ?")
-            params.append(f'%"{service}"%')
-
-        where_clause = " OR ".join(service_conditions)
-
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM workflows WHERE {where_clause}"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
-
-        # Get paginated results
-        query = f"""
-            SELECT * FROM workflows 
-            WHERE {where_clause}
-            ORDER BY analyzed_at DESC
-            LIMIT {limit} OFFSET {offset}
-        """
+            # Workflows using any service in the category, via the integrations index
+            matching_ids = """
+                SELECT DISTINCT workflow_id FROM workflow_integrations
+                WHERE integration IN (SELECT value FROM json_each(?))
+            """
+            params = [json.dumps(services)]
 
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
-            results.append(workflow)
+            # Count total results
+            total = self._count_matches(
+                conn, matching_ids, params, exact_total, offset + limit
+            )
+
+            # Get paginated results
+            query = (
+                f"SELECT w.*, 0 AS rank FROM workflows w WHERE w.id IN ({matching_ids})"
+            )
+            rows = self._page_by_analyzed_at(
+                conn, query, params, limit, offset, cursor
+            )
+
+            # Convert to dictionaries and parse JSON fields
+            results = [workflow_from_row(row) for row in rows]
 
-        conn.close()
         return results, total
 
 
+def _chunked(items: List, size: int) -> List[List]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+# Analyzer used by index worker processes, set up by _init_index_worker
+_worker_db: Optional[WorkflowDatabase] = None
+
+
+def _init_index_worker(json_parser: str, workflows_dir: str, profile: bool = False):
+    """Process pool initializer for parallel indexing."""
+    global _worker_db
+    # Analysis never touches SQLite, so skip init_database() in the workers
+    _worker_db = WorkflowDatabase.__new__(WorkflowDatabase)
+    _worker_db.json_parser = json_parser
+    _worker_db.workflows_dir = workflows_dir
+    if profile:
+        # Per-file timings travel back with each result
+        _worker_db.profile = IndexProfile()
+
+
+def _analyze_chunk(
+    tasks: List[Tuple[str, Optional[str]]],
+) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Analyze a chunk of (file_path, known_hash) tasks inside a worker process."""
+    results = []
+    for file_path, file_hash in tasks:
+        try:
+            # Parse failures are reported by analyze_workflow_file itself
+            workflow_data = _worker_db.analyze_workflow_file(file_path, file_hash)
+            error = None
+        except Exception as e:
+            workflow_data, error = None, str(e)
+        if workflow_data:
+            # Nodes are not stored; don't ship them back
+            workflow_data.pop("nodes", None)
+        results.append((file_path, workflow_data, error))
+    return results
+
+
+def _compress_chunk(store_dir: str, tasks: List[Tuple[str, str]]) -> int:
+    """Add (file_hash, file_path) tasks to a CompressedStore; returns how many."""
+    store = CompressedStore(store_dir)
+    compressed = 0
+    for file_hash, file_path in tasks:
+        try:
+            compressed += store.add_file(file_hash, file_path)
+        except OSError as e:
+            # Removed or unreadable since indexing; the next run retries
+            print(f"Error compressing {file_path}: {e}")
+    return compressed
+
+
 def main():
     """Command-line interface for workflow database."""
     import argparse
@@ -799,6 +2877,42 @@ def main():
     parser = argparse.ArgumentParser(description="N8N Workflow Database")
     parser.add_argument("--index", action="store_true", help="Index all workflows")
     parser.add_argument("--force", action="store_true", help="Force reindex all files")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Rebuild the index from scratch in one bulk load (implies --force)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes used for indexing (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the workflows directory and reindex changed files",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Use polling instead of inotify in --watch mode",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="With --index, report per-phase timings and the slowest files",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="With --index --profile, also write the profile as JSON to PATH",
+    )
+    parser.add_argument(
+        "--build-snapshot",
+        metavar="OUT_DB",
+        help="Index, optimize and write a read-only snapshot database to OUT_DB",
+    )
     parser.add_argument("--search", help="Search workflows")
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
 
@@ -807,8 +2921,35 @@ def main():
     db = WorkflowDatabase()
 
     if args.index:
-        stats = db.index_all_workflows(force_reindex=args.force)
+        profile = IndexProfile() if args.profile or args.profile_json else None
+        stats = db.index_all_workflows(
+            force_reindex=args.force,
+            workers=args.workers,
+            bulk=args.bulk,
+            profile=profile,
+        )
         print(f"Indexed {stats['processed']} workflows")
+        if profile is not None:
+            profile.print_report()
+            if args.profile_json:
+                profile.write_json(args.profile_json)
+                print(f"Profile written to {args.profile_json}")
+
+    elif args.build_snapshot:
+        db.build_snapshot(
+            args.build_snapshot,
+            force_reindex=args.force,
+            workers=args.workers,
+            bulk=args.bulk,
+        )
+
+    elif args.watch:
+        from workflow_watcher import watch_workflows
+
+        try:
+            watch_workflows(db, poll=args.poll)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
 
     elif args.search:
         results, total = db.search_workflows(args.search, limit=10)
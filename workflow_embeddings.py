@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Workflow Embeddings
+Offline hashing TF-IDF + truncated SVD vectors for "similar workflows" and
+semantic search, stored as a packed float32 matrix that is memory-mapped at
+serve time. No network or model files involved.
+"""
+
+import json
+import math
+import os
+import re
+import zlib
+from collections import Counter
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: similar workflows and semantic search
+    np = None
+
+# Words are hashed into this many TF-IDF features, so there is no vocabulary
+# to store and query words never seen while indexing still embed
+HASH_FEATURES = 1 << 15
+EMBEDDING_DIMS = 128
+# Randomized SVD settings (Halko et al.): extra sketch columns and power
+# iterations trade build time for accuracy of the top singular vectors
+SVD_OVERSAMPLES = 16
+SVD_POWER_ITERATIONS = 2
+SVD_SEED = 0
+# Nonzero entries multiplied per chunk in sparse products, bounding memory
+SPARSE_CHUNK = 1 << 16
+# Keyword and semantic results each contribute this many candidates to
+# hybrid search, merged with reciprocal rank fusion
+SEMANTIC_CANDIDATES = 200
+RRF_K = 60
+
+FILE_MAGIC = b"WFVEC1\n"
+# Arrays start on cache-line boundaries so memory-mapped rows stay aligned
+FILE_ALIGNMENT = 64
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def embeddings_available() -> bool:
+    return np is not None
+
+
+def vectors_path(db_path: str) -> str:
+    """Where the embeddings for the database at db_path are stored."""
+    return db_path + ".vectors"
+
+
+def tokenize(text: str) -> List[str]:
+    return [word.lower() for word in _WORD_RE.findall(text)]
+
+
+def node_type_tokens(node_type: str) -> List[str]:
+    """Words of a node type, e.g. googlesheets, google, sheets, trigger."""
+    name = node_type.rsplit(".", 1)[-1]
+    words = [word.lower() for word in _CAMEL_RE.findall(name)]
+    return [name.lower(), *words] if len(words) > 1 else words
+
+
+def document_tokens(
+    name: str, description: str, integrations: Iterable[str], node_types: Iterable[str]
+) -> List[str]:
+    """Words embedded for a workflow; name words count twice."""
+    tokens = tokenize(name) * 2 + tokenize(description)
+    for integration in integrations:
+        tokens += tokenize(integration)
+    for node_type in node_types:
+        tokens += node_type_tokens(node_type)
+    return tokens
+
+
+def hashed_features(tokens: Iterable[str]) -> Dict[int, float]:
+    """Sublinear term frequencies by feature, signed so collisions cancel out."""
+    features: Dict[int, float] = {}
+    for token, count in Counter(tokens).items():
+        digest = zlib.crc32(token.encode("utf-8"))
+        feature = digest % HASH_FEATURES
+        sign = -1.0 if digest & 0x80000000 else 1.0
+        features[feature] = features.get(feature, 0.0) + sign * (1 + math.log(count))
+    return features
+
+
+def fuse_rankings(*rankings: Sequence[int], k: int = RRF_K) -> List[int]:
+    """Ids from several best-first rankings, ordered by reciprocal rank fusion."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda item: (-scores[item], item))
+
+
+def _sparse_dot(indptr, indices, values, dense):
+    """Rows of a CSR matrix times a dense matrix, a chunk of entries at a time."""
+    rows = len(indptr) - 1
+    out = np.zeros((rows, dense.shape[1]), dtype=np.float32)
+    row = 0
+    while row < rows:
+        end = int(np.searchsorted(indptr, indptr[row] + SPARSE_CHUNK, "right")) - 1
+        end = min(max(end, row + 1), rows)
+        first, last = indptr[row], indptr[end]
+        if first < last:
+            starts = indptr[row:end]
+            filled = starts < indptr[row + 1:end + 1]
+            products = values[first:last, None] * dense[indices[first:last]]
+            out[row:end][filled] = np.add.reduceat(products, starts[filled] - first)
+        row = end
+    return out
+
+
+def _orthonormalize(matrix):
+    """Orthonormal basis for matrix's columns, largest directions first.
+
+    Uses the eigenvectors of the small Gram matrix, which on tall matrices is
+    far cheaper than QR; directions with negligible weight are dropped.
+    """
+    wide = matrix.astype(np.float64)
+    gram = wide.T @ wide
+    weights, directions = np.linalg.eigh(gram)
+    keep = weights > max(weights[-1], 0) * 1e-8
+    weights, directions = weights[keep][::-1], directions[:, keep][:, ::-1]
+    return matrix @ (directions / np.sqrt(weights)).astype(np.float32)
+
+
+class VectorIndex:
+    """Unit-length workflow vectors with the projection to embed queries.
+
+    Loaded indexes are memory-mapped, so every worker process shares one copy
+    of the matrix through the page cache.
+    """
+
+    def __init__(self, generation: int, ids, vectors, idf, components):
+        self.generation = generation
+        self.ids = ids
+        self.vectors = vectors
+        self.idf = idf
+        self.components = components
+        self._positions = {int(workflow_id): i for i, workflow_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls, documents: Sequence[Tuple[int, List[str]]], generation: int = 0
+    ) -> "VectorIndex":
+        """Embed (workflow id, tokens) documents with TF-IDF and truncated SVD."""
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        for _, tokens in documents:
+            features = hashed_features(tokens)
+            indices += features
+            values += features.values()
+            indptr.append(len(indices))
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int64)
+        values = np.array(values, dtype=np.float32)
+        rows = len(documents)
+
+        document_frequency = np.bincount(indices, minlength=HASH_FEATURES)
+        idf = (np.log((1 + rows) / (1 + document_frequency)) + 1).astype(np.float32)
+        values *= idf[indices]
+        row_of = np.repeat(np.arange(rows), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_of, values * values, minlength=rows))
+        values /= np.maximum(norms, 1e-12)[row_of].astype(np.float32)
+
+        # The transpose, for products with the feature side
+        order = np.argsort(indices, kind="stable")
+        t_indptr = np.concatenate(([0], np.cumsum(document_frequency)))
+        t_indices, t_values = row_of[order], values[order]
+
+        # Randomized SVD: sketch the documents' row space from random mixes of
+        # documents, sharpen it with power iterations, then the top right
+        # singular vectors of the documents projected onto it are the
+        # embedding directions
+        rng = np.random.default_rng(SVD_SEED)
+        sketch = rng.standard_normal(
+            (rows, EMBEDDING_DIMS + SVD_OVERSAMPLES), dtype=np.float32
+        )
+        documents_dot = partial(_sparse_dot, indptr, indices, values)
+        features_dot = partial(_sparse_dot, t_indptr, t_indices, t_values)
+        features = _orthonormalize(features_dot(sketch))
+        for _ in range(SVD_POWER_ITERATIONS):
+            basis = _orthonormalize(documents_dot(features))
+            features = _orthonormalize(features_dot(basis))
+        basis = _orthonormalize(documents_dot(features))
+        components = _orthonormalize(features_dot(basis))
+        components = np.ascontiguousarray(components[:, :EMBEDDING_DIMS])
+
+        vectors = documents_dot(components)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        ids = np.array([workflow_id for workflow_id, _ in documents], dtype=np.int64)
+        return cls(generation, ids, vectors, idf, components)
+
+    def save(self, path: str):
+        """Write the index to path atomically, in the format load() maps."""
+        arrays = {
+            "ids": self.ids,
+            "vectors": self.vectors,
+            "idf": self.idf,
+            "components": self.components,
+        }
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            layout[name] = [offset, array.dtype.str, list(array.shape)]
+            offset += -(-array.nbytes // FILE_ALIGNMENT) * FILE_ALIGNMENT
+        header = json.dumps({"generation": self.generation, "arrays": layout}).encode()
+        data_start = len(FILE_MAGIC) + 4 + len(header)
+        data_start += -data_start % FILE_ALIGNMENT
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(FILE_MAGIC)
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name][0])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """Memory-map an index written by save()."""
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"Not a workflow vectors file: {path}")
+            header = json.loads(f.read(int.from_bytes(f.read(4), "little")))
+            data_start = f.tell()
+        data_start += -data_start % FILE_ALIGNMENT
+
+        arrays = {}
+        for name, (offset, dtype, shape) in header["arrays"].items():
+            if 0 in shape:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=data_start + offset,
+                    shape=tuple(shape),
+                )
+        return cls(header["generation"], **arrays)
+
+    def embed(self, tokens: Iterable[str]):
+        """Unit vector for tokens, in the same space as the workflow vectors."""
+        features = hashed_features(tokens)
+        vector = np.zeros(self.components.shape[1], dtype=np.float32)
+        if features:
+            positions = np.fromiter(features, dtype=np.int64, count=len(features))
+            weights = np.fromiter(features.values(), np.float32, len(features))
+            vector = (weights * self.idf[positions]) @ self.components[positions]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _top(self, vector, limit: int, positions=None) -> List[Tuple[int, float]]:
+        """Best cosine matches for vector among positions (all rows by default)."""
+        vectors = self.vectors if positions is None else self.vectors[positions]
+        if limit <= 0 or not len(vectors) or not vector.any():
+            return []
+        scores = vectors @ vector
+        if limit < len(scores):
+            best = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.lexsort((best, -scores[best]))]
+        ids = self.ids if positions is None else self.ids[positions]
+        return [(int(ids[i]), float(scores[i])) for i in best if scores[i] > 0]
+
+    def search(
+        self, text: str, limit: int, workflow_ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """(workflow id, cosine) of the workflows closest to text, best first.
+
+        workflow_ids limits the search to those workflows.
+        """
+        positions = None
+        if workflow_ids is not None:
+            positions = np.fromiter(
+                (self._positions[i] for i in workflow_ids if i in self._positions),
+                dtype=np.int64,
+            )
+        return self._top(self.embed(tokenize(text)), limit, positions)
+
+    def similar(self, workflow_id: int, limit: int) -> List[Tuple[int, float]]:
+        """(workflow id, cosine) of the workflows closest to one, best first."""
+        position = self._positions.get(workflow_id)
+        if position is None:
+            return []
+        matches = self._top(np.asarray(self.vectors[position]), limit + 1)
+        return [match for match in matches if match[0] != workflow_id][:limit]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Workflow Directory Watcher
+Keeps the workflow index fresh by reindexing only the files that change.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from workflow_db import WorkflowDatabase
+
+# inotify event masks from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_ATTRIB
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over the workflows tree, via libc through ctypes."""
+
+    def __init__(self, root: str):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, directory: str):
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory: str):
+        # inotify is not recursive, so every subdirectory needs its own watch
+        self._add_watch(directory)
+        for subdir in Path(directory).rglob("*"):
+            if subdir.is_dir():
+                self._add_watch(str(subdir))
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Block up to timeout seconds and return the paths that changed."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; ask for a full sweep
+                changed.add(self.root)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            changed.add(path)
+
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._add_tree(path)
+                except OSError as e:
+                    print(f"Warning: could not watch {path}: {e}")
+
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Portable fallback that diffs stat snapshots of the workflows tree."""
+
+    def __init__(self, root: str, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        snapshot = {}
+        for path in Path(self.root).rglob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Sleep up to timeout seconds, then return the paths that changed."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        previous, self._snapshot = self._snapshot, current
+        return {
+            path
+            for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+
+    def close(self):
+        pass
+
+
+def create_watcher(root: str, poll: bool = False, interval: float = 1.0):
+    """Use inotify where available, falling back to polling."""
+    if not poll:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, interval)
+
+
+def watch_workflows(
+    db: WorkflowDatabase,
+    debounce: float = 0.3,
+    max_delay: float = 1.0,
+    poll: bool = False,
+    stop_event: Optional[threading.Event] = None,
+):
+    """Apply workflow file changes to the index until stop_event is set.
+
+    Events are collected until the tree has been quiet for `debounce` seconds,
+    or `max_delay` seconds have passed since the first pending event, and are
+    then applied as one batch.
+    """
+    stop_event = stop_event or threading.Event()
+
+    # Catch up on anything that changed while we weren't watching
+    db.index_all_workflows()
+
+    watcher = create_watcher(db.workflows_dir, poll=poll, interval=debounce)
+    print(f"👀 Watching {db.workflows_dir} for changes ({type(watcher).__name__})")
+
+    pending: Set[str] = set()
+    first_event = last_event = 0.0
+    try:
+        while not stop_event.is_set():
+            changed = watcher.wait(debounce)
+            now = time.monotonic()
+            if changed:
+                if not pending:
+                    first_event = now
+                pending |= changed
+                last_event = now
+
+            if not pending:
+                continue
+            if now - last_event < debounce and now - first_event < max_delay:
+                continue
+
+            batch, pending = pending, set()
+            try:
+                if db.workflows_dir in batch:
+                    stats = db.index_all_workflows()
+                else:
+                    stats = db.sync_paths(batch)
+                print(
+                    f"🔄 Synced {len(batch)} changed paths: {stats['processed']} updated, "
+                    f"{stats['deleted']} deleted, {stats['errors']} errors"
+                )
+            except Exception as e:
+                print(f"Error syncing workflow changes: {e}")
+    finally:
+        watcher.close()
+
+
+def start_watch_thread(db: WorkflowDatabase, poll: bool = False) -> threading.Event:
+    """Run watch_workflows in a daemon thread; set the returned event to stop it."""
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=watch_workflows,
+        kwargs={"db": db, "poll": poll, "stop_event": stop_event},
+        name="workflow-watcher",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event